@@ -11,12 +11,16 @@ from universal.processing_utils import generate_partitioned_s3_key
 # Import the S3 utility function.
 try:
     from universal.s3_utils import get_s3_parquet_to_df_if_exists
+    from universal.bronze_deltas import read_bronze_partition
+    from universal.compacted_files import SILVER_ROW_KEY, read_with_compacted
 except ImportError:
     print(
         "CRITICAL WARNING: Could not import 'get_s3_parquet_to_df_if_exists' from 'universal.s3_utils'."
     )
     print("Data retrieval service functions will not function correctly.")
     get_s3_parquet_to_df_if_exists = None
+    read_bronze_partition = None
+    read_with_compacted = None
 
 logger = logging.getLogger(__name__)
 
@@ -46,11 +50,11 @@ def get_weather_data_for_period(
 ) -> List[Dict[str, Any]]:
     """
     Fetches weather data for a specified location, crop, and date range from the bronze layer.
+    In 'delta' write mode, each day's partition file is merged with its delta files.
+    Days of closed months are also read from the monthly compacted files.
     """
-    if get_s3_parquet_to_df_if_exists is None:
-        raise RuntimeError(
-            "S3 utility (get_s3_parquet_to_df_if_exists) is not available."
-        )
+    if read_bronze_partition is None:
+        raise RuntimeError("S3 utility (read_bronze_partition) is not available.")
 
     try:
         bucket_name = _get_bucket_name()
@@ -63,6 +67,8 @@ def get_weather_data_for_period(
         dates_to_fetch.append(current_processing_date)
 
     all_records: List[Dict[str, Any]] = []
+    # Each compacted month file is read once for all days of the window.
+    compacted_cache: Dict[str, Any] = {}
 
     try:
         for dt_obj in dates_to_fetch:
@@ -74,9 +80,13 @@ def get_weather_data_for_period(
                 crop_id=crop_id,
                 location_id=location_id,
             )
-            df = get_s3_parquet_to_df_if_exists(s3_client, bucket_name, s3_key)
+            df = read_bronze_partition(
+                s3_client, bucket_name, s3_key, compacted_cache=compacted_cache
+            )
 
             if df is not None and not df.empty:
+                # Optional forecast variables may be missing (NaN), which is not valid JSON.
+                df = df.astype(object).where(df.notna(), None)
                 all_records.extend(df.to_dict(orient="records"))
 
     except ClientError as e:
@@ -103,8 +113,9 @@ def get_gdd_data_for_period(
     """
     Fetches GDD data for a specified location, crop, and date range from the silver layer.
     Can fetch for an exact date or a window ending on the date.
+    Days of closed months are also read from the monthly compacted files.
     """
-    if get_s3_parquet_to_df_if_exists is None:
+    if get_s3_parquet_to_df_if_exists is None or read_with_compacted is None:
         raise RuntimeError(
             "S3 utility (get_s3_parquet_to_df_if_exists) is not available."
         )
@@ -123,6 +134,8 @@ def get_gdd_data_for_period(
             dates_to_fetch.append(current_processing_date)
 
     all_records: List[Dict[str, Any]] = []
+    # Each compacted month file is read once for all days of the window.
+    compacted_cache: Dict[str, Any] = {}
 
     try:
         for dt_obj in dates_to_fetch:
@@ -134,7 +147,15 @@ def get_gdd_data_for_period(
                 crop_id=crop_id,
                 location_id=location_id,
             )
-            df = get_s3_parquet_to_df_if_exists(s3_client, bucket_name, s3_key)
+            df = read_with_compacted(
+                s3_client,
+                bucket_name,
+                s3_key,
+                get_s3_parquet_to_df_if_exists,
+                SILVER_ROW_KEY,
+                "date",
+                compacted_cache=compacted_cache,
+            )
 
             if df is not None and not df.empty:
                 all_records.extend(df.to_dict(orient="records"))
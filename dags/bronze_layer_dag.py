@@ -1,6 +1,6 @@
 from airflow import DAG
 from airflow.operators.python import PythonOperator
-from datetime import datetime
+from datetime import datetime, timedelta
 import subprocess
 import os
 
@@ -37,6 +37,37 @@ def run_data_fetcher_module(**kwargs):
         print("STDERR:", process.stderr)
 
 
+def run_bronze_compaction_module(**kwargs):
+    """
+    Runs data_fetcher.compaction using Poetry for the execution date and the day before,
+    the partitions the data fetcher writes to. Without delta files (BRONZE_WRITE_MODE=rewrite)
+    it only lists the month and exits.
+    """
+    execution_date_str = kwargs["ds"]
+    previous_date_str = (
+        datetime.strptime(execution_date_str, "%Y-%m-%d") - timedelta(days=1)
+    ).strftime("%Y-%m-%d")
+    project_root = os.getenv("AIRFLOW_HOME", "/opt/airflow")
+
+    poetry_command = [
+        "poetry", "run", "python", "-m", "data_fetcher.compaction",
+        "--start", previous_date_str, "--end", execution_date_str,
+    ]
+
+    print(f"Attempting to execute command: {' '.join(poetry_command)} in working directory: {project_root}")
+    process = subprocess.run(
+        poetry_command,
+        check=True,
+        cwd=project_root,
+        capture_output=True,
+        text=True
+    )
+    print(f"Bronze compaction for {previous_date_str}..{execution_date_str} completed successfully.")
+    print("STDOUT:", process.stdout)
+    if process.stderr:
+        print("STDERR:", process.stderr)
+
+
 with DAG(
     dag_id="bronze_data_fetcher_dag",
     schedule_interval="27 3 * * *",  # 03:17 UTC daily
@@ -49,3 +80,12 @@ with DAG(
         task_id="run_data_fetcher_module_task",
         python_callable=run_data_fetcher_module,
     )
+    # The fetcher fails its task when any partition fails; compaction only folds in
+    # deltas that already exist, so it still runs after a partial fetch.
+    compact_bronze_deltas_task = PythonOperator(
+        task_id="compact_bronze_deltas_task",
+        python_callable=run_bronze_compaction_module,
+        trigger_rule="all_done",
+    )
+
+    run_data_fetcher_task >> compact_bronze_deltas_task
@@ -0,0 +1,264 @@
+"""
+Folds append-only bronze delta files into the canonical partition files.
+
+In BRONZE_WRITE_MODE='delta', the data fetcher writes new rows as delta files
+next to each partition's 'data_<date>.parquet' (see universal.bronze_deltas).
+This job merges the canonical file and its deltas with last-write-wins per
+timestamp, replaces the canonical file, and only then deletes the merged
+deltas. Readers see the same rows before, during and after compaction, and a
+delta written while a partition is being compacted is left for the next run.
+The bronze manifests (universal.manifest) are updated once per month at the end.
+
+Usage:
+    python -m data_fetcher.compaction --start 2025-05-01 --end 2025-05-31
+"""
+
+from .config import FETCH_CONCURRENCY
+from .saver import CONTENT_HASH_METADATA_KEY
+
+try:
+    from universal import config as app_config
+    from universal.s3_utils import get_s3_client
+    from universal.bronze_deltas import read_partition_with_deltas
+    from universal.manifest import (
+        ManifestEntry,
+        build_manifest_entry,
+        update_manifests,
+    )
+    from universal.parquet_profile import get_parquet_profile, parquet_bytes
+    from universal.processing_utils import (
+        compute_content_hash,
+        determine_fetcher_date_range,
+        parse_partitioned_s3_key,
+    )
+except ImportError:
+    exit(
+        "CRITICAL ERROR: Could not import shared configuration or S3 utils from 'universal' package. "
+        "Please ensure 'gdd-app' is in PYTHONPATH."
+    )
+
+import argparse
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+# Delta keys, as generated by universal.bronze_deltas.generate_delta_s3_key.
+_DELTA_KEY_PATTERN = re.compile(
+    r"^(?P<directory>.+/crop_id=[^/]+/location_id=[^/]+)/delta_(?P<day>\d{4}-\d{2}-\d{2})_[^/]+\.parquet$"
+)
+
+# Maximum number of keys accepted by one DeleteObjects request.
+_DELETE_BATCH_SIZE = 1000
+
+
+def list_delta_partitions(
+    s3_client, bucket_name: str, bronze_prefix: str, days: set[str]
+) -> dict[str, int]:
+    """
+    Finds the partitions of the given days that have delta files.
+
+    Args:
+        s3_client: Initialized Boto3 S3 client.
+        bucket_name (str): Name of the bucket holding the bronze layer.
+        bronze_prefix (str): Base S3 prefix of the bronze layer.
+        days (set[str]): Dates to look at, in 'YYYY-MM-DD' format.
+
+    Returns:
+        dict[str, int]: Number of delta files per canonical partition key.
+    """
+    deltas_by_base_key: dict[str, int] = {}
+    months = sorted({day[:7] for day in days})
+    for month in months:
+        year, month_number = month.split("-")
+        request = {
+            "Bucket": bucket_name,
+            "Prefix": f"{bronze_prefix}/year={year}/month={month_number}/",
+        }
+        while True:
+            response = s3_client.list_objects_v2(**request)
+            for obj in response.get("Contents", []):
+                match = _DELTA_KEY_PATTERN.match(obj["Key"])
+                if match is None or match["day"] not in days:
+                    continue
+                base_key = f"{match['directory']}/data_{match['day']}.parquet"
+                deltas_by_base_key[base_key] = deltas_by_base_key.get(base_key, 0) + 1
+            if not response.get("IsTruncated"):
+                break
+            request["ContinuationToken"] = response["NextContinuationToken"]
+    return deltas_by_base_key
+
+
+def compact_partition(
+    s3_client, bucket_name: str, base_key: str
+) -> tuple[list[str], ManifestEntry | None]:
+    """
+    Merges one partition's delta files into its canonical file and deletes them.
+
+    Args:
+        s3_client: Initialized Boto3 S3 client, shared between workers.
+        bucket_name (str): Name of the bucket holding the bronze layer.
+        base_key (str): Key of the canonical partition file.
+
+    Returns:
+        tuple[list[str], ManifestEntry | None]: The delta keys folded in and deleted, and
+                                                the manifest entry of the canonical file
+                                                (None if there was nothing to fold in).
+    """
+    df_merged, delta_keys = read_partition_with_deltas(s3_client, bucket_name, base_key)
+    if not delta_keys:
+        return [], None
+    date_str, crop_id, location_id = parse_partitioned_s3_key(base_key)
+    profile = get_parquet_profile()
+    # Hashed as the saver hashes the partition files it writes (without all-null
+    # columns), so the next fetcher run can still skip the unchanged partition.
+    content_hash = compute_content_hash(
+        df_merged.dropna(axis="columns", how="all"), profile
+    )
+    entry = build_manifest_entry(
+        date_str,
+        crop_id,
+        location_id,
+        base_key,
+        df_merged,
+        "timestamp",
+        content_hash,
+    )
+    s3_client.put_object(
+        Bucket=bucket_name,
+        Key=base_key,
+        Body=parquet_bytes(df_merged, profile),
+        Metadata={CONTENT_HASH_METADATA_KEY: content_hash},
+    )
+    # Deltas are deleted only after the canonical file contains their rows.
+    for start in range(0, len(delta_keys), _DELETE_BATCH_SIZE):
+        s3_client.delete_objects(
+            Bucket=bucket_name,
+            Delete={
+                "Objects": [
+                    {"Key": key}
+                    for key in delta_keys[start : start + _DELETE_BATCH_SIZE]
+                ],
+                "Quiet": True,
+            },
+        )
+    logging.info(
+        f"    Compacted {len(delta_keys)} deltas into s3://{bucket_name}/{base_key}"
+    )
+    return delta_keys, entry
+
+
+def compact_bronze_deltas(
+    start_date_str: str,
+    end_date_str: str,
+    concurrency: int = FETCH_CONCURRENCY,
+    s3_client=None,
+) -> dict:
+    """
+    Compacts the bronze delta files of a date range.
+
+    Args:
+        start_date_str (str): First date to compact in 'YYYY-MM-DD' format.
+        end_date_str (str): Last date to compact in 'YYYY-MM-DD' format (inclusive).
+        concurrency (int): Maximum number of partitions compacted in parallel.
+        s3_client: Optional S3 client to use instead of the shared one.
+
+    Returns:
+        dict: Number of partitions compacted, delta files folded in and partitions that failed.
+
+    Raises:
+        ValueError: If the storage configuration or the date range is invalid.
+    """
+    if app_config.STORAGE_BACKEND == "minio":
+        bucket_name = app_config.MINIO_DATA_BUCKET_NAME
+    elif app_config.STORAGE_BACKEND == "s3":
+        bucket_name = app_config.AWS_S3_DATA_BUCKET_NAME
+    else:
+        raise ValueError(
+            f"Invalid STORAGE_BACKEND '{app_config.STORAGE_BACKEND}' defined in shared config."
+        )
+    if not bucket_name:
+        raise ValueError(
+            f"Target bucket name could not be determined for backend '{app_config.STORAGE_BACKEND}'."
+        )
+    s3_client = s3_client if s3_client is not None else get_s3_client()
+
+    days = {
+        day.strftime("%Y-%m-%d")
+        for day in determine_fetcher_date_range(start_date_str, end_date_str)
+    }
+    deltas_by_base_key = list_delta_partitions(
+        s3_client, bucket_name, app_config.BRONZE_PREFIX, days
+    )
+    logging.info(
+        f"Compacting {sum(deltas_by_base_key.values())} deltas of {len(deltas_by_base_key)} partitions "
+        f"for {start_date_str}..{end_date_str} with concurrency {concurrency}."
+    )
+
+    compacted, num_deltas, failed = 0, 0, 0
+    manifest_entries, removed_keys = [], {}
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        futures = {
+            executor.submit(compact_partition, s3_client, bucket_name, base_key): (
+                base_key
+            )
+            for base_key in deltas_by_base_key
+        }
+        for future in as_completed(futures):
+            try:
+                delta_keys, entry = future.result()
+                num_deltas += len(delta_keys)
+                compacted += 1
+                if entry is not None:
+                    manifest_entries.append(entry)
+                    removed_keys.setdefault(entry.date[:7], set()).update(delta_keys)
+            except Exception as e:
+                logging.error(f"    ERROR compacting {futures[future]}: {e}")
+                failed += 1
+
+    update_manifests(
+        s3_client,
+        bucket_name,
+        app_config.BRONZE_PREFIX,
+        manifest_entries,
+        removed_keys,
+    )
+    logging.info(
+        f"Compaction finished: {compacted} partitions compacted ({num_deltas} deltas), {failed} failed."
+    )
+    return {"partitions": compacted, "deltas": num_deltas, "failed": failed}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Folds append-only bronze delta files of a date range into the partition files."
+    )
+    parser.add_argument(
+        "--start", type=str, required=True, help="First date in YYYY-MM-DD format."
+    )
+    parser.add_argument(
+        "--end",
+        type=str,
+        required=True,
+        help="Last date in YYYY-MM-DD format (inclusive).",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=FETCH_CONCURRENCY,
+        help=f"Optional: Number of partitions compacted in parallel (default: {FETCH_CONCURRENCY}).",
+    )
+    args = parser.parse_args()
+
+    try:
+        result = compact_bronze_deltas(
+            args.start, args.end, concurrency=args.concurrency
+        )
+    except (OSError, ValueError) as e:
+        logging.error(f"Fatal: {e}. Exiting.")
+        exit(1)
+    if result["failed"]:
+        exit(1)
@@ -5,6 +5,8 @@ This module contains constants used throughout the data fetching process,
 such as API headers and predefined geographical locations for weather data retrieval.
 """
 
+import os
+
 # Standard headers to be used for making HTTP requests to the weather API.
 HEADERS = {"User-Agent": "gdd-app/0.1 (eveliinahampus@gmail.com)"}
 
@@ -27,3 +29,66 @@ SORGHUM_KENYA_LOCATIONS = {
     "Tharaka_Nithi": (-0.30, 37.93),
     "Siaya": (0.06, 34.29),
 }
+
+# Locationforecast endpoint of the weather API. Can be pointed at a local stand-in
+# server (scripts/mock_met_server.py) for offline benchmarks.
+MET_API_URL = os.getenv(
+    "MET_API_URL", "https://api.met.no/weatherapi/locationforecast/2.0/compact"
+)
+# Timeout for a single request to the weather API (seconds).
+MET_API_TIMEOUT_SECONDS = float(os.getenv("MET_API_TIMEOUT_SECONDS", "10"))
+# Retries for '5xx' responses, timeouts and connection errors, with jittered exponential backoff.
+MET_API_MAX_RETRIES = int(os.getenv("MET_API_MAX_RETRIES", "3"))
+MET_API_BACKOFF_BASE_SECONDS = 1.0
+MET_API_BACKOFF_MAX_SECONDS = 30.0
+
+# Concurrency settings for fetching weather data.
+# Number of locations fetched and saved in parallel by the data fetcher.
+FETCH_CONCURRENCY = int(os.getenv("FETCH_CONCURRENCY", "8"))
+# Aggregate request rate towards api.met.no across all workers (requests per second).
+# The met.no terms of service cap traffic at 20 requests/second per application.
+MET_API_MAX_REQUESTS_PER_SECOND = float(
+    os.getenv("MET_API_MAX_REQUESTS_PER_SECOND", "10")
+)
+# Size of the pooled HTTP connection pool towards the weather API.
+HTTP_POOL_MAXSIZE = max(FETCH_CONCURRENCY, 10)
+# How many times a request answered with '429 Too Many Requests' is retried.
+MET_API_MAX_RATE_LIMIT_RETRIES = 3
+# Pause used when a '429' response carries no usable 'Retry-After' header (seconds).
+MET_API_DEFAULT_RETRY_AFTER_SECONDS = 10.0
+
+# Directory of the persistent forecast cache, honouring the API's 'Expires' and
+# 'Last-Modified' headers. Set to an empty string to disable caching.
+FORECAST_CACHE_DIR = os.getenv("FORECAST_CACHE_DIR", os.path.join(".cache", "forecast"))
+
+# CSV or Parquet file with 'crop_id', 'location_id', 'lat' and 'lon' columns. Defaults
+# to data/locations.csv of the repository; when that file is not present either (e.g. in
+# an image without the data directory), the location dictionaries above are used.
+DEFAULT_LOCATION_REGISTRY_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "locations.csv"
+)
+LOCATION_REGISTRY_PATH = os.getenv("LOCATION_REGISTRY_PATH") or (
+    DEFAULT_LOCATION_REGISTRY_PATH
+    if os.path.exists(DEFAULT_LOCATION_REGISTRY_PATH)
+    else None
+)
+
+# Directory holding backfill checkpoints, one file per --start/--end range, so an
+# interrupted backfill resumes with the partitions that were not finished yet.
+FETCHER_STATE_DIR = os.getenv("FETCHER_STATE_DIR", os.path.join(".cache", "state"))
+
+# Whether every downloaded forecast document is also stored, zstd-compressed, in the
+# raw layer (RAW_PREFIX), so bronze can be re-derived with data_fetcher.rederive.
+RAW_LAYER_ENABLED = os.getenv("RAW_LAYER_ENABLED", "false").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+# JSON-lines ledger of the partitions that failed in the last run, read by --retry-failed.
+FAILURE_LEDGER_PATH = os.getenv("FAILURE_LEDGER_PATH") or os.path.join(
+    FETCHER_STATE_DIR, "failed_partitions.jsonl"
+)
+
+# Engine used by validate_weather_data: 'pandas' or 'arrow' (pyarrow.compute kernels).
+VALIDATION_ENGINE = os.getenv("VALIDATION_ENGINE", "pandas")
@@ -3,42 +3,233 @@ Fetches weather data from an external API.
 
 This module is responsible for making HTTP requests to a weather API
 (api.met.no) to retrieve forecast data for specified geographical coordinates.
-It then processes the JSON response into a pandas DataFrame.
+It then parses the JSON response into a typed Arrow table and a pandas DataFrame.
+Responses can be served from a local ForecastCache, honouring the 'Expires' and
+'Last-Modified' headers sent by the API.
 """
 
+import random
+import orjson
 import requests
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import time
 import logging  # For more informative error messages.
-from .config import HEADERS
+from .config import (
+    MET_API_URL,
+    MET_API_TIMEOUT_SECONDS,
+    MET_API_MAX_RETRIES,
+    MET_API_BACKOFF_BASE_SECONDS,
+    MET_API_BACKOFF_MAX_SECONDS,
+    MET_API_MAX_RATE_LIMIT_RETRIES,
+    MET_API_DEFAULT_RETRY_AFTER_SECONDS,
+)
+from .http_client import get_http_session, fetch_stats
+from .rate_limiter import TokenBucketRateLimiter, parse_retry_after
+from .forecast_cache import ForecastCache
 
 # Initialize logger for this module.
 logger = logging.getLogger(__name__)
 
 
-def fetch_weather_data(lat, lon, location_id):
+def _backoff_delay(attempt: int) -> float:
+    """Returns a jittered exponential backoff delay in seconds for the given retry attempt."""
+    ceiling = min(
+        MET_API_BACKOFF_MAX_SECONDS, MET_API_BACKOFF_BASE_SECONDS * (2**attempt)
+    )
+    # "Full jitter": spreads retries of concurrent workers over the whole interval.
+    return random.uniform(0, ceiling)
+
+
+def _request_forecast(
+    url: str,
+    request_headers: dict,
+    location_id: str,
+    rate_limiter: TokenBucketRateLimiter | None = None,
+) -> requests.Response:
+    """
+    Sends a GET request to the weather API through the shared session, retrying transient failures.
+
+    '429 Too Many Requests' responses are retried after the 'Retry-After' delay, up to
+    MET_API_MAX_RATE_LIMIT_RETRIES times. '5xx' responses, timeouts and connection errors
+    are retried with jittered exponential backoff, up to MET_API_MAX_RETRIES times.
+
+    Args:
+        url (str): The locationforecast URL to request.
+        request_headers (dict): Extra headers to send with the request.
+        location_id (str): Identifier of the location, used for logging.
+        rate_limiter (TokenBucketRateLimiter | None): Optional limiter shared between workers.
+
+    Returns:
+        requests.Response: The final response.
+
+    Raises:
+        requests.exceptions.RequestException: If the request still fails with a network error
+                                              or timeout after all retries.
+    """
+    session = get_http_session()
+    rate_limit_retries = 0
+    transient_retries = 0
+    while True:
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        start = time.perf_counter()
+        try:
+            response = session.get(
+                url, headers=request_headers, timeout=MET_API_TIMEOUT_SECONDS
+            )
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+            fetch_stats.record_request(time.perf_counter() - start)
+            if transient_retries >= MET_API_MAX_RETRIES:
+                raise
+            delay = _backoff_delay(transient_retries)
+            transient_retries += 1
+            fetch_stats.record_retry()
+            logger.warning(
+                f"Request for {location_id} failed ({e.__class__.__name__}). "
+                f"Retry {transient_retries}/{MET_API_MAX_RETRIES} in {delay:.1f}s."
+            )
+            time.sleep(delay)
+            continue
+        fetch_stats.record_request(time.perf_counter() - start, response.status_code)
+
+        if (
+            response.status_code == 429
+            and rate_limit_retries < MET_API_MAX_RATE_LIMIT_RETRIES
+        ):
+            # Honour the server-requested delay before retrying.
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is None:
+                retry_after = MET_API_DEFAULT_RETRY_AFTER_SECONDS
+            rate_limit_retries += 1
+            fetch_stats.record_retry()
+            logger.warning(
+                f"Rate limited by weather API for {location_id}. Retrying in {retry_after:.1f}s."
+            )
+            if rate_limiter is not None:
+                rate_limiter.pause_for(retry_after)
+            else:
+                time.sleep(retry_after)
+            continue
+
+        if response.status_code >= 500 and transient_retries < MET_API_MAX_RETRIES:
+            delay = _backoff_delay(transient_retries)
+            transient_retries += 1
+            fetch_stats.record_retry()
+            logger.warning(
+                f"Weather API answered {response.status_code} for {location_id}. "
+                f"Retry {transient_retries}/{MET_API_MAX_RETRIES} in {delay:.1f}s."
+            )
+            time.sleep(delay)
+            continue
+
+        return response
+
+
+def fetch_weather_data(
+    lat,
+    lon,
+    location_id,
+    rate_limiter: TokenBucketRateLimiter | None = None,
+    cache: ForecastCache | None = None,
+):
     """
     Fetches weather data for a given latitude, longitude, and location ID.
 
+    Requests use the shared pooled HTTP session (connection reuse and compressed transfer).
+    '429 Too Many Requests' is retried after the 'Retry-After' delay, and '5xx' responses,
+    timeouts and connection errors are retried with jittered exponential backoff.
+
+    When a cache is given, a document that has not yet expired is served locally
+    without any request. An expired document is revalidated with 'If-Modified-Since',
+    and a '304 Not Modified' answer is treated as a cache hit.
+
     Args:
         lat (float): The latitude of the location.
         lon (float): The longitude of the location.
         location_id (str): A unique identifier for the location.
+        rate_limiter (TokenBucketRateLimiter | None): Optional limiter shared between workers.
+                                                      A token is acquired before every request,
+                                                      and '429' pauses apply to all workers.
+        cache (ForecastCache | None): Optional cache of forecast documents keyed by coordinates.
 
     Returns:
-        pandas.DataFrame: A DataFrame containing 'timestamp', 'air_temperature', and 'location_id'.
+        pandas.DataFrame: A DataFrame containing 'timestamp', 'air_temperature', the other
+                          'instant.details' variables, and 'location_id'.
                           Timestamps are parsed and converted to UTC.
-                          Returns an empty DataFrame if no temperature data is found or if an error occurs.
+                          The DataFrame is empty if no entry has an air temperature.
 
     Raises:
         requests.exceptions.RequestException: If the API request fails for any reason (e.g., network issue, HTTP error).
     """
-    url = (
-        f"https://api.met.no/weatherapi/locationforecast/2.0/compact"
-        f"?lat={lat}&lon={lon}"
-    )
+    body, _ = fetch_forecast_body(lat, lon, location_id, rate_limiter, cache)
+    return parse_forecast_to_arrow(body, location_id).to_pandas()
+
+
+def fetch_forecast_body(
+    lat,
+    lon,
+    location_id: str,
+    rate_limiter: TokenBucketRateLimiter | None = None,
+    cache: ForecastCache | None = None,
+) -> tuple[bytes, bool]:
+    """
+    Fetches the raw locationforecast document for the coordinates, without parsing it.
+
+    Requests, retries and caching behave as in fetch_weather_data, and the fetch is
+    recorded in the weather API counters.
+
+    Args:
+        lat (float): The latitude of the location.
+        lon (float): The longitude of the location.
+        location_id (str): A unique identifier for the location, used in log messages.
+        rate_limiter (TokenBucketRateLimiter | None): Optional limiter shared between workers.
+        cache (ForecastCache | None): Optional cache of forecast documents keyed by coordinates.
+
+    Returns:
+        tuple[bytes, bool]: The response body and whether it was served from the cache
+                            (fresh entry or '304 Not Modified').
+
+    Raises:
+        requests.exceptions.RequestException: If the API request fails for any reason.
+    """
+    start = time.perf_counter()
+    cache_hit = False
+    try:
+        body, cache_hit = _get_forecast_body(lat, lon, location_id, rate_limiter, cache)
+    finally:
+        fetch_stats.record_fetch(time.perf_counter() - start, cache_hit=cache_hit)
+    return body, cache_hit
+
+
+def _get_forecast_body(
+    lat,
+    lon,
+    location_id: str,
+    rate_limiter: TokenBucketRateLimiter | None,
+    cache: ForecastCache | None,
+) -> tuple[bytes, bool]:
+    """
+    Returns the raw forecast document for the coordinates, from the cache or the API.
+
+    Returns:
+        tuple[bytes, bool]: The response body and whether it was served from the cache
+                            (fresh entry or '304 Not Modified').
+    """
+    url = f"{MET_API_URL}?lat={lat}&lon={lon}"
+    cached = cache.get(lat, lon) if cache is not None else None
+    if cached is not None and cached.is_fresh():
+        logger.info(
+            f"Serving weather data for {location_id} ({lat}, {lon}) from cache, valid until {cached.expires}."
+        )
+        return cached.body, True
+
+    request_headers = {}
+    if cached is not None and cached.last_modified:
+        request_headers["If-Modified-Since"] = cached.last_modified
     try:
-        # Timeout and specific exception handling.
-        response = requests.get(url, headers=HEADERS, timeout=10)
+        response = _request_forecast(url, request_headers, location_id, rate_limiter)
         response.raise_for_status()  # Raises an HTTPError for bad responses (4xx or 5xx).
     except requests.exceptions.RequestException as e:
         logger.error(
@@ -47,30 +238,84 @@ def fetch_weather_data(lat, lon, location_id):
         # Re-raise the exception so it can be handled by the caller.
         raise
 
+    if response.status_code == 304 and cached is not None:
+        # The cached document is still current; only its validators are refreshed.
+        logger.info(f"Weather data for {location_id} not modified since last fetch.")
+        cached = cache.refresh(lat, lon, cached, response.headers)
+        return cached.body, True
+
+    body = response.content
+    if cache is not None:
+        cache.put(lat, lon, body, response.headers)
+    return body, False
+
+
+def parse_forecast_to_arrow(body: bytes, location_id: str) -> pa.Table:
+    """
+    Parses a locationforecast JSON document into a typed Arrow table.
+
+    The body is decoded with orjson and the entries are converted to typed Arrow columns
+    in one pass with pa.Table.from_pylist. All numeric variables found under
+    'instant.details' are kept, not only 'air_temperature'. Entries without an air
+    temperature are dropped.
+
+    Args:
+        body (bytes): Raw JSON response body.
+        location_id (str): Identifier of the location, added as a column.
+
+    Returns:
+        pyarrow.Table: Columns 'timestamp' (timestamp[ns, UTC]), 'air_temperature',
+                       the other 'instant.details' variables (float64, sorted by name),
+                       and 'location_id'.
+    """
     # Parse the JSON response from the API.
-    data = response.json()
-
-    times = []
-    temps = []
-
-    for entry in data["properties"]["timeseries"]:
-        # Extract time and air temperature from each timeseries entry.
-        time = entry["time"]
-        temp = entry["data"]["instant"]["details"].get("air_temperature")
-        if temp is not None:
-            times.append(time)
-            temps.append(temp)
-
-    df = pd.DataFrame(
-        # Create a DataFrame from the collected times and temperatures.
-        {"timestamp": times, "air_temperature": temps, "location_id": location_id}
+    timeseries = orjson.loads(body)["properties"]["timeseries"]
+    rows = [
+        {"timestamp": entry["time"], **entry["data"]["instant"]["details"]}
+        for entry in timeseries
+    ]
+
+    # Collect every variable name present in any entry; air_temperature always comes first.
+    variable_names = set().union(*rows)
+    variable_names -= {"timestamp", "air_temperature"}
+    variables = ["air_temperature", *sorted(variable_names)]
+    schema = pa.schema(
+        [("timestamp", pa.string())]
+        + [(variable, pa.float64()) for variable in variables]
+    )
+    table = pa.Table.from_pylist(rows, schema=schema)
+    # ISO 8601 strings (e.g. '2025-05-26T13:00:00Z') are cast to UTC timestamps by Arrow.
+    table = table.set_column(
+        0,
+        "timestamp",
+        table["timestamp"].cast(pa.timestamp("ns", tz="UTC")),
+    )
+    # Keep only entries that carry an air temperature.
+    table = table.filter(pc.is_valid(table["air_temperature"]))
+    return table.append_column(
+        "location_id", pa.array([location_id] * table.num_rows, type=pa.string())
     )
-    if not df.empty:
-        # Parse the timestamp strings into datetime objects.
-        # Pandas will correctly interpret ISO 8601 with timezone offsets.
-        df["timestamp"] = pd.to_datetime(df["timestamp"])
 
-        # Convert the timestamp to UTC.
-        df["timestamp"] = df["timestamp"].dt.tz_convert("UTC")
 
-    return df
+def split_forecast_by_date(df: pd.DataFrame, target_dates) -> dict:
+    """
+    Splits a multi-day forecast DataFrame into one DataFrame per UTC date.
+
+    The split is a single groupby over the calendar date of the UTC timestamps,
+    so one API response can feed every processed date.
+
+    Args:
+        df (pd.DataFrame): Forecast data with a UTC-aware 'timestamp' column.
+        target_dates (Iterable[datetime.date]): Dates to keep. Other dates are discarded.
+
+    Returns:
+        dict: Mapping of datetime.date to the rows falling on that date.
+    """
+    if df.empty:
+        return {}
+    wanted_dates = set(target_dates)
+    return {
+        day: day_df
+        for day, day_df in df.groupby(df["timestamp"].dt.date, sort=False)
+        if day in wanted_dates
+    }
@@ -0,0 +1,173 @@
+"""
+Persistent cache for weather API responses.
+
+api.met.no returns 'Expires' and 'Last-Modified' headers with every
+locationforecast document and expects clients to respect them: a document is
+not re-downloaded before it expires, and later requests are made conditional
+with 'If-Modified-Since'. This module stores the raw response body together with
+those validators on the local filesystem, keyed by coordinates rounded to the
+4-decimal grid used by the API.
+"""
+
+import json
+import os
+import logging
+import tempfile
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Mapping, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+
+class CachedForecast(NamedTuple):
+    """A cached forecast document and the validators received with it."""
+
+    body: bytes
+    expires: datetime | None
+    last_modified: str | None
+
+    def is_fresh(self, now: datetime | None = None) -> bool:
+        """Returns True if the document has not yet expired."""
+        if self.expires is None:
+            return False
+        now = now or datetime.now(timezone.utc)
+        return now < self.expires
+
+
+def _parse_http_date(value: str | None) -> datetime | None:
+    """Parses an HTTP-date header value into a UTC-aware datetime, or None if invalid."""
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def _write_atomic(path: str, data: bytes):
+    """Writes data to path through a temporary file, so readers never see partial files."""
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            tmp_file.write(data)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class ForecastCache:
+    """
+    File-backed cache of forecast documents keyed by rounded (lat, lon).
+
+    Each entry consists of two files in `cache_dir`: '<key>.json' holding the raw
+    response body and '<key>.meta.json' holding the 'Expires' and 'Last-Modified'
+    validators. Writes are atomic, so the cache can be shared by concurrent workers.
+    """
+
+    def __init__(self, cache_dir: str):
+        """
+        Args:
+            cache_dir (str): Directory where cached documents are stored. Created if missing.
+        """
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def cache_key(lat: float, lon: float) -> str:
+        """Returns the cache key for coordinates rounded to 4 decimals, e.g. '15.8500_74.5000'."""
+        return f"{round(float(lat), 4):.4f}_{round(float(lon), 4):.4f}"
+
+    def _paths(self, lat: float, lon: float) -> tuple[str, str]:
+        key = self.cache_key(lat, lon)
+        return (
+            os.path.join(self.cache_dir, f"{key}.json"),
+            os.path.join(self.cache_dir, f"{key}.meta.json"),
+        )
+
+    def get(self, lat: float, lon: float) -> CachedForecast | None:
+        """
+        Returns the cached forecast for the coordinates, or None if nothing usable is cached.
+
+        Args:
+            lat (float): Latitude of the location.
+            lon (float): Longitude of the location.
+        """
+        body_path, meta_path = self._paths(lat, lon)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as meta_file:
+                meta = json.load(meta_file)
+            with open(body_path, "rb") as body_file:
+                body = body_file.read()
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable forecast cache entry {body_path}: {e}")
+            return None
+        return CachedForecast(
+            body=body,
+            expires=_parse_http_date(meta.get("expires")),
+            last_modified=meta.get("last_modified"),
+        )
+
+    def put(
+        self, lat: float, lon: float, body: bytes, headers: Mapping[str, str]
+    ) -> CachedForecast:
+        """
+        Stores a freshly downloaded forecast document and its validators.
+
+        Args:
+            lat (float): Latitude of the location.
+            lon (float): Longitude of the location.
+            body (bytes): Raw response body.
+            headers (Mapping[str, str]): Response headers ('Expires', 'Last-Modified').
+
+        Returns:
+            CachedForecast: The stored cache entry.
+        """
+        body_path, meta_path = self._paths(lat, lon)
+        _write_atomic(body_path, body)
+        self._write_meta(
+            meta_path, headers.get("Expires"), headers.get("Last-Modified")
+        )
+        return CachedForecast(
+            body=body,
+            expires=_parse_http_date(headers.get("Expires")),
+            last_modified=headers.get("Last-Modified"),
+        )
+
+    def refresh(
+        self, lat: float, lon: float, cached: CachedForecast, headers: Mapping[str, str]
+    ) -> CachedForecast:
+        """
+        Updates the validators of a cached entry after a '304 Not Modified' response.
+
+        Args:
+            lat (float): Latitude of the location.
+            lon (float): Longitude of the location.
+            cached (CachedForecast): The entry that was revalidated.
+            headers (Mapping[str, str]): Headers of the '304' response.
+
+        Returns:
+            CachedForecast: The entry with updated validators.
+        """
+        _, meta_path = self._paths(lat, lon)
+        expires = headers.get("Expires")
+        last_modified = headers.get("Last-Modified") or cached.last_modified
+        self._write_meta(meta_path, expires, last_modified)
+        return CachedForecast(
+            body=cached.body,
+            expires=_parse_http_date(expires),
+            last_modified=last_modified,
+        )
+
+    @staticmethod
+    def _write_meta(meta_path: str, expires: str | None, last_modified: str | None):
+        meta = {"expires": expires, "last_modified": last_modified}
+        _write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
@@ -0,0 +1,143 @@
+"""
+Shared HTTP client for the weather API.
+
+All requests to api.met.no go through one pooled requests.Session, so TCP and
+TLS connections are reused between locations and workers, and responses are
+transferred compressed. The module also keeps thread-safe timing counters for
+every request and every location fetch, which are logged at the end of a run.
+"""
+
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+from .config import HEADERS, HTTP_POOL_MAXSIZE
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """
+    Returns the process-wide HTTP session used for weather API requests.
+
+    The session is created on first use with a connection pool sized for the
+    configured fetch concurrency, the application's User-Agent, and
+    'Accept-Encoding: gzip, deflate'. requests.Session is safe to share between
+    threads for plain GET requests.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=HTTP_POOL_MAXSIZE, pool_maxsize=HTTP_POOL_MAXSIZE
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update(HEADERS)
+                session.headers["Accept-Encoding"] = "gzip, deflate"
+                _session = session
+    return _session
+
+
+def reset_http_session():
+    """Closes and discards the shared session. Intended for tests."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+
+
+def _percentile(values: list[float], percentile: float) -> float | None:
+    """Returns the nearest-rank percentile of the values, or None if there are none."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(percentile / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+class FetchStats:
+    """
+    Thread-safe counters describing weather API traffic.
+
+    Requests are individual HTTP calls (including retries); fetches are complete
+    per-location calls to fetch_weather_data, including cache hits and retries.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Clears all counters."""
+        with self._lock:
+            self.request_durations: list[float] = []
+            self.fetch_durations: list[float] = []
+            self.status_counts: dict[int, int] = {}
+            self.retries = 0
+            self.request_errors = 0
+            self.cache_hits = 0
+            self.not_modified = 0
+
+    def record_request(self, seconds: float, status_code: int | None = None):
+        """Records one HTTP request. A missing status code means a network error or timeout."""
+        with self._lock:
+            self.request_durations.append(seconds)
+            if status_code is None:
+                self.request_errors += 1
+            else:
+                self.status_counts[status_code] = (
+                    self.status_counts.get(status_code, 0) + 1
+                )
+                if status_code == 304:
+                    self.not_modified += 1
+
+    def record_retry(self):
+        """Records that a request is retried."""
+        with self._lock:
+            self.retries += 1
+
+    def record_fetch(self, seconds: float, cache_hit: bool = False):
+        """Records one complete per-location fetch."""
+        with self._lock:
+            self.fetch_durations.append(seconds)
+            if cache_hit:
+                self.cache_hits += 1
+
+    def snapshot(self) -> dict:
+        """
+        Returns the current counters and timing aggregates.
+
+        Returns:
+            dict: Request and fetch counts, total and percentile durations in seconds,
+                  status code counts, retries, errors, cache hits and '304' responses.
+        """
+        with self._lock:
+            return {
+                "requests": len(self.request_durations),
+                "request_seconds_total": sum(self.request_durations),
+                "request_seconds_p50": _percentile(self.request_durations, 50),
+                "request_seconds_p99": _percentile(self.request_durations, 99),
+                "fetches": len(self.fetch_durations),
+                "fetch_seconds_total": sum(self.fetch_durations),
+                "fetch_seconds_p50": _percentile(self.fetch_durations, 50),
+                "fetch_seconds_p99": _percentile(self.fetch_durations, 99),
+                "status_counts": dict(self.status_counts),
+                "retries": self.retries,
+                "request_errors": self.request_errors,
+                "cache_hits": self.cache_hits,
+                "not_modified": self.not_modified,
+            }
+
+
+# Process-wide counters for weather API traffic.
+fetch_stats = FetchStats()
+
+
+def get_fetch_stats() -> FetchStats:
+    """Returns the process-wide weather API counters."""
+    return fetch_stats
@@ -0,0 +1,140 @@
+"""
+Location registry for the data fetcher.
+
+The registry lists every (crop_id, location_id, lat, lon) combination to fetch
+weather data for. It can be loaded from a CSV or Parquet file, which scales to
+tens of thousands of rows, or falls back to the locations defined in
+data_fetcher.config. Coordinates are snapped to the 4-decimal grid used by
+api.met.no, so that a single request serves every crop and location mapping to
+the same grid point.
+"""
+
+import os
+import logging
+import pandas as pd
+
+from .config import MAIZE_INDIA_LOCATIONS, SORGHUM_KENYA_LOCATIONS
+
+logger = logging.getLogger(__name__)
+
+# Columns every registry file must provide.
+REGISTRY_COLUMNS = ["crop_id", "location_id", "lat", "lon"]
+
+# Number of decimals api.met.no uses for coordinates; finer precision is truncated by the API.
+GRID_DECIMALS = 4
+
+# Built-in locations used when no registry file is configured.
+DEFAULT_LOCATIONS_CONFIG = {
+    "maize": MAIZE_INDIA_LOCATIONS,
+    "sorghum": SORGHUM_KENYA_LOCATIONS,
+}
+
+
+def load_location_registry(path: str | None = None) -> pd.DataFrame:
+    """
+    Loads the location registry from a CSV or Parquet file, or from the built-in locations.
+
+    Args:
+        path (str | None): Path to a '.csv' or '.parquet' file with the columns
+                           'crop_id', 'location_id', 'lat' and 'lon'. If None, the
+                           locations defined in data_fetcher.config are used.
+
+    Returns:
+        pd.DataFrame: One row per unique (crop_id, location_id) with numeric coordinates.
+
+    Raises:
+        ValueError: If the file type is unsupported, columns are missing, or coordinates are invalid.
+    """
+    if path is None:
+        registry = pd.DataFrame(
+            [
+                (crop_id, location_id, lat, lon)
+                for crop_id, locations in DEFAULT_LOCATIONS_CONFIG.items()
+                for location_id, (lat, lon) in locations.items()
+            ],
+            columns=REGISTRY_COLUMNS,
+        )
+    else:
+        extension = os.path.splitext(path)[1].lower()
+        if extension == ".csv":
+            registry = pd.read_csv(path, dtype={"crop_id": str, "location_id": str})
+        elif extension == ".parquet":
+            registry = pd.read_parquet(path)
+        else:
+            raise ValueError(
+                f"Unsupported location registry format '{extension}'. Use .csv or .parquet."
+            )
+        missing_columns = [
+            col for col in REGISTRY_COLUMNS if col not in registry.columns
+        ]
+        if missing_columns:
+            raise ValueError(
+                f"Location registry {path} is missing columns: {missing_columns}."
+            )
+        registry = registry[REGISTRY_COLUMNS].copy()
+        registry["lat"] = pd.to_numeric(registry["lat"], errors="coerce")
+        registry["lon"] = pd.to_numeric(registry["lon"], errors="coerce")
+
+    invalid = (
+        registry[REGISTRY_COLUMNS].isnull().any(axis=1)
+        | ~registry["lat"].between(-90, 90)
+        | ~registry["lon"].between(-180, 180)
+    )
+    if invalid.any():
+        raise ValueError(
+            f"Location registry contains {int(invalid.sum())} rows with missing or invalid values."
+        )
+
+    duplicated = registry.duplicated(subset=["crop_id", "location_id"], keep="last")
+    if duplicated.any():
+        logger.warning(
+            f"Location registry has {int(duplicated.sum())} duplicate (crop_id, location_id) rows. Keeping the last."
+        )
+        registry = registry[~duplicated]
+    return registry.reset_index(drop=True)
+
+
+def registry_to_locations_config(
+    registry: pd.DataFrame,
+) -> dict[str, dict[str, tuple[float, float]]]:
+    """
+    Converts a registry into the {crop_id: {location_id: (lat, lon)}} mapping used by shared utilities.
+
+    Args:
+        registry (pd.DataFrame): Registry as returned by load_location_registry.
+
+    Returns:
+        dict[str, dict[str, tuple[float, float]]]: Locations per crop.
+    """
+    locations_config: dict[str, dict[str, tuple[float, float]]] = {}
+    for crop_id, location_id, lat, lon in registry[REGISTRY_COLUMNS].itertuples(
+        index=False
+    ):
+        locations_config.setdefault(crop_id, {})[location_id] = (lat, lon)
+    return locations_config
+
+
+def group_by_grid_point(
+    registry: pd.DataFrame,
+) -> dict[tuple[float, float], list[tuple[str, str]]]:
+    """
+    Groups registry rows by their coordinates snapped to the API's 4-decimal grid.
+
+    Args:
+        registry (pd.DataFrame): Registry as returned by load_location_registry.
+
+    Returns:
+        dict[tuple[float, float], list[tuple[str, str]]]: (crop_id, location_id) pairs per grid point.
+    """
+    grid = registry.assign(
+        grid_lat=registry["lat"].round(GRID_DECIMALS),
+        grid_lon=registry["lon"].round(GRID_DECIMALS),
+    )
+    return {
+        (float(grid_lat), float(grid_lon)): list(
+            zip(group["crop_id"], group["location_id"])
+        )
+        for (grid_lat, grid_lon), group in grid.groupby(
+            ["grid_lat", "grid_lon"], sort=False
+        )
+    }
@@ -5,18 +5,44 @@ This script orchestrates the process of fetching weather data from an external A
 validating it, and saving it to a specified S3-compatible storage backend
 (MinIO or AWS S3) in a partitioned Parquet format (bronze layer).
 
-It can be run to process data for specific dates or, by default, for
-today and yesterday, ensuring data completeness and handling potential
-API forecast updates.
+It can be run to process data for a specific date, for a date range
+(backfill), or, by default, for today and yesterday, ensuring data
+completeness and handling potential API forecast updates.
 """
 
 from .config import (
-    MAIZE_INDIA_LOCATIONS,
-    SORGHUM_KENYA_LOCATIONS,
-)  # Local configuration for specific crop locations.
-from .fetcher import fetch_weather_data
-from .validator import validate_weather_data
-from .saver import save_partitioned_parquet_s3
+    FETCH_CONCURRENCY,
+    MET_API_MAX_REQUESTS_PER_SECOND,
+    FORECAST_CACHE_DIR,
+    LOCATION_REGISTRY_PATH,
+    FETCHER_STATE_DIR,
+    RAW_LAYER_ENABLED,
+    FAILURE_LEDGER_PATH,
+)  # Local configuration for fetch concurrency, caching, the location registry, checkpoints and the raw layer.
+from .locations import load_location_registry, registry_to_locations_config
+from .partitions import (
+    FetchPartition,
+    PartitionCheckpoint,
+    FailureLedger,
+    group_failures_by_grid_point,
+    load_failures,
+    plan_partitions_by_grid_point,
+)
+from .fetcher import (
+    fetch_forecast_body,
+    parse_forecast_to_arrow,
+    split_forecast_by_date,
+)
+from .raw_store import save_raw_forecast
+from .rate_limiter import TokenBucketRateLimiter
+from .forecast_cache import ForecastCache
+from .http_client import get_fetch_stats
+from .validator import (
+    PARTITION_COLUMNS,
+    PARTITION_DATE_COLUMN,
+    validate_weather_batch,
+)
+from .saver import save_partitioned_dataset_s3
 
 try:
     from universal import config as app_config  # Shared application-wide configuration.
@@ -24,8 +50,12 @@ try:
         get_s3_client,
         get_s3_parquet_to_df_if_exists,
     )  # Utilities for S3 interaction.
+    from universal.bronze_deltas import BRONZE_WRITE_MODES
+    from universal.parquet_profile import get_parquet_profile
     from universal.processing_utils import (
+        compute_content_hash,
         determine_fetcher_processing_dates,
+        determine_fetcher_date_range,
         generate_partitioned_s3_key,
     )  # Utilities for data processing tasks like date determination and key generation.
 except ImportError:
@@ -36,9 +66,12 @@ except ImportError:
         "Please ensure 'gdd-app' is in PYTHONPATH and 'universal/config.py' and 'universal/s3_utils.py' exist."
     )
 
-import pandas as pd 
+import pandas as pd
 import argparse  # For command-line arguments.
 import logging  # For logging application events.
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
 
 # Configure basic logging for the application.
 logging.basicConfig(
@@ -46,16 +79,344 @@ logging.basicConfig(
 )
 
 
-def run_data_fetcher(target_date_str: str | None = None):
+def _merge_partition(
+    s3_client,
+    target_bucket_name: str,
+    base_s3_prefix: str,
+    process_dt: datetime,
+    crop_id: str,
+    location_id: str,
+    df_newly_fetched: pd.DataFrame,
+) -> tuple[pd.DataFrame, str | None]:
+    """
+    Merges newly fetched data for one (date, crop, location) partition with the data already saved.
+
+    The content hash of the saved rows is returned with the merged rows, so that the saver
+    can skip the upload when the merge changed nothing without reading the object again.
+
+    Args:
+        s3_client: Initialized Boto3 S3 client, shared between workers.
+        target_bucket_name (str): Name of the bucket holding the bronze layer.
+        base_s3_prefix (str): Base S3 prefix for the bronze data layer.
+        process_dt (datetime): The date being processed.
+        crop_id (str): Identifier of the crop.
+        location_id (str): Identifier of the location.
+        df_newly_fetched (pd.DataFrame): Newly fetched rows, already restricted to process_dt.
+
+    Returns:
+        tuple[pd.DataFrame, str | None]: The combined rows of the partition, sorted by
+                                         timestamp, and the content hash of the saved rows
+                                         (None if the partition did not exist).
+    """
+    # Prepare date components for path construction and logging.
+    current_day_str = process_dt.strftime("%Y-%m-%d")
+    logging.info(
+        f"  Processing: Date='{current_day_str}', Crop='{crop_id}', Location='{location_id}'"
+    )
+
+    # Construct the expected S3 key for the current processing date, crop, and location.
+    expected_bronze_key = generate_partitioned_s3_key(
+        layer_prefix=base_s3_prefix,
+        year=str(process_dt.year),
+        month=f"{process_dt.month:02d}",
+        day_str=current_day_str,
+        crop_id=crop_id,
+        location_id=location_id,
+    )
+
+    # Check if data already exists in S3 for this partition.
+    df_existing = get_s3_parquet_to_df_if_exists(
+        s3_client, target_bucket_name, expected_bronze_key
+    )
+    if df_existing is not None:
+        logging.info(
+            f"    Merging newly fetched data with existing data from s3://{target_bucket_name}/{expected_bronze_key}"
+        )
+        # Ensure existing timestamps are datetime objects and localized to UTC if naive, then converted to UTC.
+        df_existing["timestamp"] = pd.to_datetime(df_existing["timestamp"])
+        # If timestamps are naive, localize to UTC. If timezone-aware, convert to UTC.
+        df_existing["timestamp"] = (
+            df_existing["timestamp"].dt.tz_convert(None).dt.tz_localize("UTC")
+        )
+        # Hashed as the saver hashes the rows it writes: without all-null columns and
+        # as stored by the configured Parquet profile.
+        previous_hash = compute_content_hash(
+            df_existing.dropna(axis="columns", how="all"), get_parquet_profile()
+        )
+        # Combine, prioritize newly fetched data for duplicate timestamps within the same day.
+        df_combined = pd.concat([df_existing, df_newly_fetched], ignore_index=True)
+        # Sort by timestamp, then use a marker to keep 'new' over 'existing' if timestamps are identical
+        # This assumes newly_fetched is more up-to-date for a given hour.
+        # Drop duplicates, keeping the 'last' entry (from newly_fetched) for any identical timestamps.
+        # A stable sort keeps newly fetched rows after existing rows with the same timestamp.
+        df_processed = df_combined.sort_values(
+            by="timestamp", kind="stable"
+        ).drop_duplicates(subset=["timestamp", "location_id", "crop_id"], keep="last")
+        logging.info(
+            f"      Combined and de-duplicated data shape for {current_day_str}: {df_processed.shape}"
+        )
+    else:
+        logging.info(
+            f"    No existing data found for {current_day_str}. Using newly fetched data."
+        )
+        # Newly fetched data (already filtered for process_dt) is sorted by timestamp.
+        df_processed = df_newly_fetched.sort_values(by="timestamp")
+        previous_hash = None
+    return df_processed, previous_hash
+
+
+def _process_location(
+    s3_client,
+    target_bucket_name: str,
+    base_s3_prefix: str,
+    lat: float,
+    lon: float,
+    partitions: list[FetchPartition],
+    rate_limiter: TokenBucketRateLimiter | None = None,
+    forecast_cache: ForecastCache | None = None,
+    raw_prefix: str | None = None,
+    failure_ledger: FailureLedger | None = None,
+    merge_existing: bool = True,
+) -> list[tuple[FetchPartition, pd.DataFrame, str | None]]:
+    """
+    Fetches the forecast for one coordinate once and merges it into every partition it serves.
+
+    The forecast document covers several days, so a single response is split by UTC date
+    and fanned out to every planned (date, crop, location) partition sharing the coordinates.
+    Each partition is merged with its existing bronze data (unless merge_existing is False,
+    when only the new rows are kept for a delta write); validation and saving happen
+    afterwards for all partitions of the run at once. Errors are logged and recorded in the
+    failure ledger, so that one failing location does not stop the others and can be retried
+    on its own later.
+
+    Args:
+        s3_client: Initialized Boto3 S3 client, shared between workers.
+        target_bucket_name (str): Name of the bucket holding the bronze layer.
+        base_s3_prefix (str): Base S3 prefix for the bronze data layer.
+        lat (float): Latitude of the location.
+        lon (float): Longitude of the location.
+        partitions (list[FetchPartition]): Partitions located at these coordinates.
+        rate_limiter (TokenBucketRateLimiter | None): Limiter shared by all workers for API requests.
+        forecast_cache (ForecastCache | None): Cache of forecast documents shared by all workers.
+        raw_prefix (str | None): Base S3 prefix of the raw layer. If given, newly downloaded
+                                 documents are stored there before parsing.
+        failure_ledger (FailureLedger | None): Record of failed partitions shared by all workers.
+        merge_existing (bool): Whether to merge with the existing bronze partition files.
+
+    Returns:
+        list[tuple[FetchPartition, pd.DataFrame, str | None]]: The merged, not yet validated
+            rows of every partition that has data, with the content hash of its saved rows
+            (None if there were none or they were not read).
+    """
+
+    def record_failure(partition: FetchPartition, error: Exception):
+        if failure_ledger is not None:
+            failure_ledger.record(partition, lat, lon, error)
+
+    target_names = ", ".join(
+        dict.fromkeys(
+            f"{partition.crop_id}-{partition.location_id}" for partition in partitions
+        )
+    )
+    try:
+        logging.info(f"    Fetching weather data for ({lat}, {lon}): {target_names}...")
+        # Note: The API typically gives a forecast, so fetching for "yesterday" will still give current forecast.
+        # The key is that it is being *saved* it under yesterday's date partition.
+        body, cache_hit = fetch_forecast_body(
+            lat,
+            lon,
+            partitions[0].location_id,
+            rate_limiter=rate_limiter,
+            cache=forecast_cache,
+        )
+    except Exception as e:
+        logging.error(f"    ERROR fetching weather data for {target_names}: {e}")
+        for partition in partitions:
+            record_failure(partition, e)
+        return []
+
+    # Cached documents were already stored when they were downloaded.
+    if raw_prefix is not None and not cache_hit:
+        try:
+            save_raw_forecast(s3_client, target_bucket_name, raw_prefix, lat, lon, body)
+        except Exception as e:
+            # The raw layer is a convenience copy; bronze processing continues without it.
+            logging.warning(f"    Could not store raw forecast for ({lat}, {lon}): {e}")
+
+    try:
+        df_fetched = parse_forecast_to_arrow(
+            body, partitions[0].location_id
+        ).to_pandas()
+    except Exception as e:
+        logging.error(f"    ERROR parsing weather data for {target_names}: {e}")
+        for partition in partitions:
+            record_failure(partition, e)
+        return []
+
+    # Timestamps are already datetime objects and UTC-aware from fetcher.py.
+    # Only records on one of the planned dates are kept, split per date in one pass.
+    frames_by_date = split_forecast_by_date(
+        df_fetched, list({partition.process_dt.date() for partition in partitions})
+    )
+
+    merged = []
+    for partition in partitions:
+        process_dt, crop_id, location_id = partition
+        df_for_date = frames_by_date.get(process_dt.date())
+        if df_for_date is None or df_for_date.empty:
+            logging.info(
+                f"    No data fetched from API for {location_id} for {partition.date_str}. Skipping."
+            )
+            continue
+        df_newly_fetched = df_for_date.assign(location_id=location_id, crop_id=crop_id)
+        if not merge_existing:
+            # Delta writes only carry the new rows; readers merge them with the partition.
+            merged.append(
+                (partition, df_newly_fetched.sort_values(by="timestamp"), None)
+            )
+            continue
+        try:
+            df_processed, previous_hash = _merge_partition(
+                s3_client,
+                target_bucket_name,
+                base_s3_prefix,
+                process_dt,
+                crop_id,
+                location_id,
+                df_newly_fetched,
+            )
+        except Exception as e:
+            # Log errors encountered during processing for a specific location/date and continue to the next.
+            logging.error(
+                f"    ERROR processing {crop_id} - {location_id} for {partition.date_str}: {e}"
+            )
+            record_failure(partition, e)
+            continue
+        merged.append((partition, df_processed, previous_hash))
+    return merged
+
+
+def _validate_partitions(
+    merged: list[tuple[FetchPartition, pd.DataFrame, str | None]],
+) -> tuple[pd.DataFrame, dict[tuple[str, str, str], str]]:
+    """
+    Validates the merged rows of all partitions of a run in one batch.
+
+    Args:
+        merged (list[tuple[FetchPartition, pd.DataFrame, str | None]]): Merged rows per
+                                                                         partition.
+
+    Returns:
+        tuple[pd.DataFrame, dict[tuple[str, str, str], str]]: The rows of the partitions
+            that passed, with a 'partition_date' column, and the validation errors of the
+            failing partitions, keyed by (date, crop_id, location_id).
+    """
+    if not merged:
+        return pd.DataFrame(), {}
+    batch = pd.concat(
+        [
+            df_processed.assign(
+                **{PARTITION_DATE_COLUMN: pd.Timestamp(partition.date_str, tz="UTC")}
+            )
+            for partition, df_processed, _ in merged
+        ],
+        ignore_index=True,
+    )
+    report = validate_weather_batch(batch)
+    failed = report[~report["passed"]]
+    logging.info(
+        f"Validated {len(batch)} rows of {len(report)} partitions in one batch: {len(failed)} failed."
+    )
+    if failed.empty:
+        return batch, {}
+    failed_keys = pd.MultiIndex.from_frame(failed[PARTITION_COLUMNS])
+    passed_rows = ~pd.MultiIndex.from_frame(batch[PARTITION_COLUMNS]).isin(failed_keys)
+    validation_errors = {
+        (partition_date.strftime("%Y-%m-%d"), crop_id, location_id): errors
+        for partition_date, crop_id, location_id, errors in failed[
+            [*PARTITION_COLUMNS, "errors"]
+        ].itertuples(index=False)
+    }
+    return batch[passed_rows], validation_errors
+
+
+def _log_fetch_stats():
+    """Logs request and timing counters of the weather API traffic of this run."""
+    stats = get_fetch_stats().snapshot()
+    p50 = stats["fetch_seconds_p50"] or 0.0
+    p99 = stats["fetch_seconds_p99"] or 0.0
+    logging.info(
+        f"Weather API: {stats['fetches']} fetches ({stats['cache_hits']} served from cache), "
+        f"{stats['requests']} requests in {stats['request_seconds_total']:.2f}s, "
+        f"{stats['retries']} retries, {stats['request_errors']} network errors, "
+        f"status codes {stats['status_counts']}, per-location latency p50={p50:.3f}s p99={p99:.3f}s."
+    )
+
+
+def run_data_fetcher(
+    target_date_str: str | None = None,
+    concurrency: int = FETCH_CONCURRENCY,
+    use_cache: bool = True,
+    registry_path: str | None = LOCATION_REGISTRY_PATH,
+    start_date_str: str | None = None,
+    end_date_str: str | None = None,
+    restart: bool = False,
+    s3_client=None,
+    store_raw: bool = RAW_LAYER_ENABLED,
+    retry_failed: bool = False,
+    failure_ledger_path: str = FAILURE_LEDGER_PATH,
+    write_mode: str | None = None,
+) -> int:
     """
     Fetches, validates, and saves weather data to the bronze layer.
 
-    If target_date_str is None, processes data for today and yesterday.
-    Otherwise, processes for the specified date.
+    If retry_failed is set, processes only the partitions recorded as failed by the
+    previous run. If start_date_str and end_date_str are given, backfills every date of
+    that range. Otherwise, if target_date_str is None, processes data for today and
+    yesterday, or processes for the specified date.
+
+    All (date, crop, location) partitions are planned up front. In backfill mode,
+    finished partitions are recorded in a checkpoint file in FETCHER_STATE_DIR, one
+    file per date range, and skipped when the same range is run again, so an
+    interrupted backfill resumes with the remaining partitions. Partitions that fail
+    are written to the failure ledger (failure_ledger_path), which replaces the ledger
+    of the previous run.
+
+    In 'rewrite' mode, every partition is merged with its existing bronze file and the file
+    is replaced. In 'delta' mode, only the new rows are written, as an append-only delta
+    file per partition, without reading the existing data; readers merge deltas until
+    data_fetcher.compaction folds them into the partition files.
+
+    Each unique grid point is fetched once per run and its forecast is merged into every
+    processed date and every crop and location mapping to that point. The merged
+    partitions of the whole run are then validated in one batch, and those that pass
+    are saved. Grid points are processed concurrently by a bounded thread pool. All API
+    requests pass through one shared token-bucket rate limiter, so the request rate
+    towards api.met.no stays within MET_API_MAX_REQUESTS_PER_SECOND whatever the
+    concurrency.
 
     Args:
         target_date_str (str | None): Specific date in 'YYYY-MM-DD' format,
                                       or None to default to processing for today and yesterday.
+        concurrency (int): Maximum number of grid points processed in parallel.
+                           Use 1 for sequential processing.
+        use_cache (bool): Whether to use the persistent forecast cache in FORECAST_CACHE_DIR.
+        registry_path (str | None): CSV or Parquet location registry. If None, the locations
+                                    defined in data_fetcher.config are used.
+        start_date_str (str | None): First date of a backfill in 'YYYY-MM-DD' format.
+        end_date_str (str | None): Last date of a backfill in 'YYYY-MM-DD' format (inclusive).
+        restart (bool): Whether to discard the checkpoint of the backfill range and process
+                        every partition again.
+        s3_client: Optional S3 client to use instead of one created from the shared config,
+                   e.g. an in-memory client for benchmarks.
+        store_raw (bool): Whether to store downloaded forecast documents in the raw layer
+                          (RAW_PREFIX), so bronze can be re-derived later without the API.
+        retry_failed (bool): Whether to process only the partitions in the failure ledger.
+        failure_ledger_path (str): JSON-lines file listing the failed partitions of a run.
+        write_mode (str | None): 'rewrite' or 'delta'. Defaults to BRONZE_WRITE_MODE.
+
+    Returns:
+        int: Number of partitions that failed in this run.
     """
     # Determine target bucket name from shared app_config based on the storage backend.
     target_bucket_name = None
@@ -82,32 +443,74 @@ def run_data_fetcher(target_date_str: str | None = None):
         app_config.BRONZE_PREFIX
     )  # Base S3 prefix for the bronze data layer.
 
+    write_mode = write_mode or app_config.BRONZE_WRITE_MODE
+    if write_mode not in BRONZE_WRITE_MODES:
+        logging.error(
+            f"Error: Invalid BRONZE_WRITE_MODE '{write_mode}'. Expected one of {BRONZE_WRITE_MODES}."
+        )
+        exit(1)
+
     # Initialize S3 client once for reuse.
+    if s3_client is None:
+        try:
+            s3_client = get_s3_client()
+        except Exception as e:
+            logging.error(f"Fatal: Error initializing S3 client: {e}. Exiting.")
+            exit(1)
+
+    # Load locations to process. This needs to be done before the pre-check for yesterday.
     try:
-        s3_client = get_s3_client()
-    except Exception as e:
-        logging.error(f"Fatal: Error initializing S3 client: {e}. Exiting.")
+        location_registry = load_location_registry(registry_path)
+    except (OSError, ValueError) as e:
+        logging.error(f"Fatal: Error loading location registry: {e}. Exiting.")
         exit(1)
+    locations_to_process_config = registry_to_locations_config(location_registry)
 
-    # Define locations to process. This needs to be defined before the pre-check for yesterday.
-    locations_to_process_config = {
-        "maize": MAIZE_INDIA_LOCATIONS,
-        "sorghum": SORGHUM_KENYA_LOCATIONS,
-    }
+    # In retry mode, the partitions to process are read from the previous run's ledger.
+    failures = []
+    if retry_failed:
+        try:
+            failures = load_failures(failure_ledger_path)
+        except (OSError, ValueError) as e:
+            logging.error(
+                f"Fatal: Error reading failure ledger {failure_ledger_path}: {e}. Exiting."
+            )
+            exit(1)
+        if not failures:
+            logging.info(
+                f"No failed partitions recorded in {failure_ledger_path}. Nothing to retry."
+            )
+            return 0
 
     # Determine the specific dates for which data needs to be fetched and processed.
-    try:
-        dates_to_process = determine_fetcher_processing_dates(
-            target_date_str=target_date_str,
-            s3_client=s3_client,
-            bucket_name=target_bucket_name,
-            bronze_prefix=base_s3_prefix,
-            locations_config=locations_to_process_config,
-            expected_rows_per_day=24,  # Expected 24 hourly records per day.
+    backfill = not retry_failed and (
+        start_date_str is not None or end_date_str is not None
+    )
+    if backfill and (start_date_str is None or end_date_str is None):
+        logging.error(
+            "Fatal: A backfill requires both a start and an end date. Exiting."
         )
-    except (
-        ValueError
-    ):  # Raised by determine_fetcher_processing_dates for bad date format.
+        exit(1)
+    try:
+        if retry_failed:
+            dates_to_process = sorted(
+                {failure.partition.process_dt for failure in failures}
+            )
+        elif backfill:
+            dates_to_process = determine_fetcher_date_range(
+                start_date_str, end_date_str
+            )
+        else:
+            dates_to_process = determine_fetcher_processing_dates(
+                target_date_str=target_date_str,
+                s3_client=s3_client,
+                bucket_name=target_bucket_name,
+                bronze_prefix=base_s3_prefix,
+                locations_config=locations_to_process_config,
+                expected_rows_per_day=24,  # Expected 24 hourly records per day.
+                max_workers=concurrency,
+            )
+    except ValueError:  # Raised for bad date formats or an inverted date range.
         exit(1)
     except Exception as e:
         logging.error(f"Fatal: Error determining dates to process: {e}. Exiting.")
@@ -117,136 +520,154 @@ def run_data_fetcher(target_date_str: str | None = None):
         f"Starting data fetching. Storage Backend: {app_config.STORAGE_BACKEND}, Target Bucket: {target_bucket_name}, Base Prefix: {base_s3_prefix}"
     )
 
-    for process_dt in dates_to_process:
-        # Prepare date components for path construction and logging.
-        current_year_str = str(process_dt.year)
-        current_month_str = f"{process_dt.month:02d}"
-        current_day_str = process_dt.strftime("%Y-%m-%d")
-        logging.info(f"\n Processing data for date: {current_day_str}")
-
-        for crop_id, locations_map in locations_to_process_config.items():
-            for location_id, (lat, lon) in locations_map.items():
-                logging.info(
-                    f"  Processing: Date='{current_day_str}', Crop='{crop_id}', Location='{location_id}', Coords=({lat}, {lon})"
-                )
-
-                # Construct the expected S3 key for the current processing date, crop, and location.
-                expected_bronze_key = generate_partitioned_s3_key(
-                    layer_prefix=base_s3_prefix,
-                    year=current_year_str,
-                    month=current_month_str,
-                    day_str=current_day_str,
-                    crop_id=crop_id,
-                    location_id=location_id,
-                )
-
-                # Check if data already exists in S3 for this partition.
-                df_existing = get_s3_parquet_to_df_if_exists(
-                    s3_client, target_bucket_name, expected_bronze_key
-                )
-                try:
-                    logging.info(
-                        f"    Fetching weather data for {location_id} for {current_day_str}..."
-                    )
-                    # Note: The API typically gives a forecast, so fetching for "yesterday" will still give current forecast.
-                    # The key is that it is being *saved* it under yesterday's date partition.
-                    df_newly_fetched = fetch_weather_data(lat, lon, location_id)
-                    df_newly_fetched["crop_id"] = (
-                        crop_id  # Add crop_id early for context.
-                    )
-
-                    if df_newly_fetched.empty:
-                        logging.info(
-                            f"    No data fetched from API for {location_id} for {current_day_str}. Skipping."
-                        )
-                        continue
-
-                    # Timestamps in df_newly_fetched are already datetime objects and UTC-aware from fetcher.py.
-                    # CRUCIAL: Filter newly fetched data to ONLY include records for the target processing date (process_dt)
-                    # This ensures we only consider data relevant to the file are trying to be built/updated.
-                    df_newly_fetched = df_newly_fetched[
-                        df_newly_fetched["timestamp"].dt.date == process_dt.date()
-                    ]
-
-                    if df_existing is not None:
-                        logging.info(
-                            f"    Merging newly fetched data with existing data from s3://{target_bucket_name}/{expected_bronze_key}"
-                        )
-                        # Ensure existing timestamps are datetime objects and localized to UTC if naive, then converted to UTC.
-                        df_existing["timestamp"] = pd.to_datetime(
-                            df_existing["timestamp"]
-                        )
-                        # If timestamps are naive, localize to UTC. If timezone-aware, convert to UTC.
-                        df_existing["timestamp"] = (
-                            df_existing["timestamp"]
-                            .dt.tz_convert(None)
-                            .dt.tz_localize("UTC")
-                        )
-                        # Combine, prioritize newly fetched data for duplicate timestamps within the same day.
-                        df_combined = pd.concat(
-                            [df_existing, df_newly_fetched], ignore_index=True
-                        )
-                        # Sort by timestamp, then use a marker to keep 'new' over 'existing' if timestamps are identical
-                        # This assumes newly_fetched is more up-to-date for a given hour.
-                        # Drop duplicates, keeping the 'last' entry (from newly_fetched) for any identical timestamps.
-                        df_processed = df_combined.sort_values(
-                            by="timestamp"
-                        ).drop_duplicates(
-                            subset=["timestamp", "location_id", "crop_id"], keep="last"
-                        )
-                        logging.info(
-                            f"      Combined and de-duplicated data shape for {current_day_str}: {df_processed.shape}"
-                        )
-                    else:
-                        logging.info(
-                            f"    No existing data found for {current_day_str}. Using newly fetched data."
-                        )
-                        # Newly fetched data (already filtered for process_dt) is sorted by timestamp.
-                        df_processed = df_newly_fetched.sort_values(by="timestamp")
-
-                    # df_processed should ONLY contain unique hourly data for process_dt.
-                    if not df_processed.empty:
-                        logging.info(
-                            f"    Validating final weather data for {location_id} for {current_day_str}..."
-                        )
-                        # Convert process_dt (a datetime.datetime object) to a UTC-aware pandas Timestamp for the validator.
-                        # Create a pandas Timestamp from the datetime.datetime object.
-                        temp_timestamp = pd.Timestamp(process_dt)
-                        # Ensure it is UTC. If naive, localize to UTC. If already timezone-aware, convert to UTC.
-                        if temp_timestamp.tzinfo is None:
-                            target_pd_timestamp = temp_timestamp.tz_localize("UTC")
-                        else:
-                            target_pd_timestamp = temp_timestamp.tz_convert("UTC")
-                        df_validated = validate_weather_data(
-                            df_processed.copy(),  # Pass a copy to avoid unintended modifications.
-                            target_processing_date=target_pd_timestamp,
-                        )
-
-                        logging.info(
-                            f"    Saving data for {location_id} for {current_day_str} to {app_config.STORAGE_BACKEND} storage..."
-                        )
-                        saved_path = save_partitioned_parquet_s3(
-                            df_validated,  # Save the validated, hopefully complete-day data.
-                            bucket=target_bucket_name,
-                            base_prefix=base_s3_prefix,
-                            year_for_path=current_year_str,
-                            month_for_path=current_month_str,
-                            date_for_filename=current_day_str,
-                        )
-                        logging.info(
-                            f"    Data for {crop_id} - {location_id} for {current_day_str} saved to {saved_path}"
-                        )
-                    else:  # df_processed is empty after fetch/merge/filter.
-                        logging.warning(
-                            f"    No data to save for {crop_id} - {location_id} for {current_day_str} after fetch/merge/filter. Skipping save."
-                        )
-                except Exception as e:
-                    # Log errors encountered during processing for a specific location/date and continue to the next.
-                    logging.error(
-                        f"    ERROR processing {crop_id} - {location_id} for {current_day_str}: {e}"
-                    )
+    rate_limiter = TokenBucketRateLimiter(MET_API_MAX_REQUESTS_PER_SECOND)
+    get_fetch_stats().reset()
+    forecast_cache = None
+    if use_cache and FORECAST_CACHE_DIR:
+        try:
+            forecast_cache = ForecastCache(FORECAST_CACHE_DIR)
+        except OSError as e:
+            logging.warning(
+                f"Could not initialize forecast cache at '{FORECAST_CACHE_DIR}': {e}. Continuing without cache."
+            )
+    checkpoint = None
+    if backfill:
+        checkpoint_path = os.path.join(
+            FETCHER_STATE_DIR,
+            f"backfill_{dates_to_process[0].strftime('%Y-%m-%d')}_{dates_to_process[-1].strftime('%Y-%m-%d')}.jsonl",
+        )
+        if restart and os.path.exists(checkpoint_path):
+            logging.info(f"Discarding backfill checkpoint {checkpoint_path}.")
+            os.remove(checkpoint_path)
+        try:
+            checkpoint = PartitionCheckpoint(checkpoint_path)
+        except (OSError, UnicodeDecodeError) as e:
+            logging.error(
+                f"Fatal: Error reading backfill checkpoint {checkpoint_path}: {e}. Exiting."
+            )
+            exit(1)
+
+    # Plan every (date, crop, location) partition up front, grouped by the point on the API's
+    # 4-decimal grid serving it, so every grid point is fetched once per run and the response is
+    # fanned out to all its partitions. Partitions finished by an earlier run of the same backfill
+    # are skipped. Grid points are independent, so they are processed by a bounded pool of
+    # workers sharing the S3 client, rate limiter and checkpoint.
+    if retry_failed:
+        partitions_by_coords = group_failures_by_grid_point(failures)
+    else:
+        partitions_by_coords = plan_partitions_by_grid_point(
+            dates_to_process, location_registry
+        )
+    num_planned = sum(len(partitions) for partitions in partitions_by_coords.values())
+    if checkpoint is not None:
+        partitions_by_coords = {
+            coords: remaining
+            for coords, partitions in partitions_by_coords.items()
+            if (remaining := [p for p in partitions if not checkpoint.is_done(p)])
+        }
+    num_remaining = sum(len(partitions) for partitions in partitions_by_coords.values())
+    failure_ledger = FailureLedger(failure_ledger_path)
+    try:
+        failure_ledger.clear()
+    except OSError as e:
+        logging.error(
+            f"Fatal: Error clearing failure ledger {failure_ledger_path}: {e}. Exiting."
+        )
+        exit(1)
+    logging.info(
+        f"Planned {num_planned} partitions ({num_remaining} remaining) for {len(location_registry)} crop/location pairs "
+        f"at {len(partitions_by_coords)} unique grid points for dates "
+        f"{dates_to_process[0].strftime('%Y-%m-%d')}..{dates_to_process[-1].strftime('%Y-%m-%d')} with concurrency {concurrency}."
+    )
+    # Phase 1: fetch every grid point once and merge its partitions with existing bronze data
+    # (in delta mode, the new rows are kept as they are).
+    merged = []
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        futures = [
+            executor.submit(
+                _process_location,
+                s3_client,
+                target_bucket_name,
+                base_s3_prefix,
+                lat,
+                lon,
+                partitions,
+                rate_limiter,
+                forecast_cache,
+                app_config.RAW_PREFIX if store_raw else None,
+                failure_ledger,
+                write_mode != "delta",
+            )
+            for (lat, lon), partitions in partitions_by_coords.items()
+        ]
+        for future in as_completed(futures):
+            merged.extend(future.result())
+
+    # Phase 2: validate all merged partitions in a single batch. Failing partitions are
+    # recorded in the failure ledger and not saved.
+    df_passed, validation_errors = _validate_partitions(merged)
+    partitions_by_key = {
+        partition.key(): (partition, coords)
+        for coords, partitions in partitions_by_coords.items()
+        for partition in partitions
+    }
+    for key, errors in validation_errors.items():
+        partition, (lat, lon) = partitions_by_key[key]
+        logging.error(
+            f"    ERROR processing {partition.crop_id} - {partition.location_id} for {partition.date_str}: "
+            f"Data validation failed:\n{errors}"
+        )
+        failure_ledger.record(
+            partition, lat, lon, ValueError("Data validation failed:\n" + errors)
+        )
+
+    # Phase 3: save all partitions that passed validation in one multi-partition write,
+    # uploading them in parallel. In delta mode, all deltas of the run share a write time;
+    # otherwise partitions whose merged rows equal the saved rows are not uploaded again.
+    previous_hashes = {
+        partition.key(): previous_hash
+        for partition, _, previous_hash in merged
+        if previous_hash is not None
+    }
+    logging.info(
+        f"Saving {len(merged) - len(validation_errors)} partitions to {app_config.STORAGE_BACKEND} storage "
+        f"in '{write_mode}' mode..."
+    )
+    write_results = save_partitioned_dataset_s3(
+        df_passed,
+        bucket=target_bucket_name,
+        base_prefix=base_s3_prefix,
+        s3_client=s3_client,
+        max_workers=concurrency,
+        delta_written_at=datetime.now(timezone.utc) if write_mode == "delta" else None,
+        skip_unchanged=True,
+        previous_hashes=previous_hashes,
+    )
+    for result in write_results:
+        partition, (lat, lon) = partitions_by_key[
+            (result.date_str, result.crop_id, result.location_id)
+        ]
+        if result.error is not None:
+            logging.error(
+                f"    ERROR saving {result.crop_id} - {result.location_id} for {result.date_str}: {result.error}"
+            )
+            failure_ledger.record(partition, lat, lon, result.error)
+        elif checkpoint is not None:
+            checkpoint.mark_done(partition)
 
+    _log_fetch_stats()
+    if checkpoint is not None:
+        logging.info(
+            f"Backfill checkpoint {checkpoint.path}: {len(checkpoint)} of {num_planned} partitions finished."
+        )
+    num_failed = len(failure_ledger)
+    if num_failed:
+        logging.error(
+            f"{num_failed} partitions failed and were recorded in {failure_ledger_path}. "
+            "Run with --retry-failed to process only those partitions."
+        )
     logging.info("\nData fetching process finished.")
+    return num_failed
 
 
 if __name__ == "__main__":
@@ -254,14 +675,92 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(
         description="Fetches weather data and stores it in the bronze layer. Processes today and yesterday by default."
     )
-    parser.add_argument(
+    date_group = parser.add_mutually_exclusive_group()
+    date_group.add_argument(
         # Optional argument to specify a single date for processing.
         "--date",
         type=str,
         default=None,
         help="Optional: Specific date to process in YYYY-MM-DD format. ",
     )
+    date_group.add_argument(
+        # Optional first date of a backfill range.
+        "--start",
+        type=str,
+        default=None,
+        help="Optional: First date of a backfill in YYYY-MM-DD format. Requires --end.",
+    )
+    date_group.add_argument(
+        # Optional flag to process only the partitions that failed in the previous run.
+        "--retry-failed",
+        action="store_true",
+        help="Optional: Process only the partitions recorded in the failure ledger of the previous run.",
+    )
+    parser.add_argument(
+        # Optional last date of a backfill range.
+        "--end",
+        type=str,
+        default=None,
+        help="Optional: Last date of a backfill in YYYY-MM-DD format (inclusive). Requires --start.",
+    )
+    parser.add_argument(
+        # Optional flag to ignore the checkpoint of an earlier run of the same backfill.
+        "--restart",
+        action="store_true",
+        help="Optional: Process every partition of the backfill again instead of resuming from its checkpoint.",
+    )
+    parser.add_argument(
+        # Optional argument to control how many locations are processed in parallel.
+        "--concurrency",
+        type=int,
+        default=FETCH_CONCURRENCY,
+        help=f"Optional: Number of locations processed in parallel (default: {FETCH_CONCURRENCY}).",
+    )
+    parser.add_argument(
+        # Optional flag to bypass the local forecast cache.
+        "--no-cache",
+        action="store_true",
+        help="Optional: Always download forecasts instead of using the local forecast cache.",
+    )
+    parser.add_argument(
+        # Optional location registry file replacing the built-in locations.
+        "--locations",
+        type=str,
+        default=LOCATION_REGISTRY_PATH,
+        help="Optional: CSV or Parquet file with crop_id, location_id, lat and lon columns.",
+    )
+    parser.add_argument(
+        # Optional flag to keep the raw API responses for later re-derivation.
+        "--store-raw",
+        action="store_true",
+        default=RAW_LAYER_ENABLED,
+        help="Optional: Store downloaded forecast documents in the raw layer (default: RAW_LAYER_ENABLED).",
+    )
+    parser.add_argument(
+        # Optional override of how bronze partitions are updated.
+        "--write-mode",
+        type=str,
+        choices=BRONZE_WRITE_MODES,
+        default=None,
+        help="Optional: 'rewrite' partition files or write append-only 'delta' files (default: BRONZE_WRITE_MODE).",
+    )
     args = parser.parse_args()
+    if (args.start is None) != (args.end is None):
+        parser.error("--start and --end must be used together.")
 
     # Run the main data fetching logic with the provided or default date.
-    run_data_fetcher(target_date_str=args.date)
+    num_failed = run_data_fetcher(
+        target_date_str=args.date,
+        concurrency=args.concurrency,
+        use_cache=not args.no_cache,
+        registry_path=args.locations,
+        start_date_str=args.start,
+        end_date_str=args.end,
+        restart=args.restart,
+        store_raw=args.store_raw,
+        retry_failed=args.retry_failed,
+        write_mode=args.write_mode,
+    )
+    # Exit non-zero when partitions failed, so schedulers mark the run as failed.
+    if num_failed:
+        exit(1)
@@ -0,0 +1,91 @@
+"""
+Rolls the day partition files of a closed month of the bronze layer into monthly compacted files.
+
+The compaction itself is shared with the silver layer (see universal.monthly_compaction);
+this module runs it on the bronze layout, where rows are identified by crop, location
+and timestamp and delta files are folded in with the day files.
+
+Usage:
+    python -m data_fetcher.monthly_compaction --month 2025-05
+    python -m data_fetcher.monthly_compaction --month 2025-05 --granularity crop
+"""
+
+from .config import FETCH_CONCURRENCY
+
+try:
+    from universal import config as app_config
+    from universal.bronze_deltas import BRONZE_ROW_KEY
+    from universal.compacted_files import COMPACTION_GRANULARITIES
+    from universal.monthly_compaction import LayerLayout, compact_month, previous_month
+except ImportError:
+    exit(
+        "CRITICAL ERROR: Could not import shared configuration or S3 utils from 'universal' package. "
+        "Please ensure 'gdd-app' is in PYTHONPATH."
+    )
+
+import argparse
+import logging
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+
+def compact_bronze_month(
+    month_str: str,
+    granularity: str = "location",
+    concurrency: int = FETCH_CONCURRENCY,
+    s3_client=None,
+    today=None,
+) -> dict:
+    """
+    Compacts the day partition and delta files of one closed month of the bronze layer.
+
+    See universal.monthly_compaction.compact_month for the arguments and the result.
+    """
+    layout = LayerLayout(app_config.BRONZE_PREFIX, BRONZE_ROW_KEY, "timestamp")
+    return compact_month(
+        layout,
+        month_str,
+        granularity=granularity,
+        concurrency=concurrency,
+        s3_client=s3_client,
+        today=today,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Rolls the bronze day partition files of a closed month into monthly compacted files."
+    )
+    parser.add_argument(
+        "--month",
+        type=str,
+        default=None,
+        help="Optional: Month to compact in YYYY-MM format (default: the previous month).",
+    )
+    parser.add_argument(
+        "--granularity",
+        choices=COMPACTION_GRANULARITIES,
+        default="location",
+        help="Optional: One file per crop and location, or one file per crop (default: location).",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=FETCH_CONCURRENCY,
+        help=f"Optional: Number of files read in parallel (default: {FETCH_CONCURRENCY}).",
+    )
+    args = parser.parse_args()
+
+    try:
+        result = compact_bronze_month(
+            args.month or previous_month(),
+            granularity=args.granularity,
+            concurrency=args.concurrency,
+        )
+    except (OSError, ValueError) as e:
+        logging.error(f"Fatal: {e}. Exiting.")
+        exit(1)
+    if result["failed"]:
+        exit(1)
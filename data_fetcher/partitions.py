@@ -0,0 +1,258 @@
+"""
+Planning and bookkeeping of bronze partitions processed by the data fetcher.
+
+A partition is one (date, crop_id, location_id) combination, which maps to one
+bronze Parquet file. This module plans all partitions of a run up front, groups
+them by the API grid point that serves them, and records finished partitions in
+a checkpoint file so an interrupted backfill can resume without redoing work.
+Failed partitions are recorded in a ledger, so a later run can retry only those.
+"""
+
+import json
+import os
+import threading
+import logging
+from datetime import datetime, timezone
+from typing import NamedTuple
+
+import pandas as pd
+
+from .locations import GRID_DECIMALS, group_by_grid_point
+
+logger = logging.getLogger(__name__)
+
+
+class FetchPartition(NamedTuple):
+    """One bronze partition: a processing date and a (crop_id, location_id) pair."""
+
+    process_dt: datetime
+    crop_id: str
+    location_id: str
+
+    @property
+    def date_str(self) -> str:
+        return self.process_dt.strftime("%Y-%m-%d")
+
+    def key(self) -> tuple[str, str, str]:
+        """Returns the (date, crop_id, location_id) identity used in checkpoint files."""
+        return (self.date_str, self.crop_id, self.location_id)
+
+
+def plan_partitions_by_grid_point(
+    dates_to_process: list[datetime], registry: pd.DataFrame
+) -> dict[tuple[float, float], list[FetchPartition]]:
+    """
+    Plans every (date, crop, location) partition of a run, grouped by API grid point.
+
+    Args:
+        dates_to_process (list[datetime]): Dates to process.
+        registry (pd.DataFrame): Location registry as returned by load_location_registry.
+
+    Returns:
+        dict[tuple[float, float], list[FetchPartition]]: Partitions served by each grid point.
+    """
+    return {
+        grid_point: [
+            FetchPartition(process_dt, crop_id, location_id)
+            for process_dt in dates_to_process
+            for crop_id, location_id in targets
+        ]
+        for grid_point, targets in group_by_grid_point(registry).items()
+    }
+
+
+class PartitionCheckpoint:
+    """
+    Append-only record of finished partitions, stored as JSON lines.
+
+    Each line holds one finished partition ({"date", "crop_id", "location_id"}).
+    Appends are serialized with a lock and flushed immediately, so the file stays
+    valid if the process is interrupted.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): Checkpoint file. Existing entries are loaded; the file is created on first write.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._done: set[tuple[str, str, str]] = set()
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as checkpoint_file:
+                lines = checkpoint_file.readlines()
+            if lines and not lines[-1].endswith("\n"):
+                # Terminate a partially written last line from an interrupted run,
+                # so new entries start on a line of their own.
+                with open(path, "a", encoding="utf-8") as checkpoint_file:
+                    checkpoint_file.write("\n")
+            for line in lines:
+                try:
+                    entry = json.loads(line)
+                    self._done.add(
+                        (entry["date"], entry["crop_id"], entry["location_id"])
+                    )
+                except (ValueError, KeyError):
+                    # A partially written line from an interrupted run is ignored.
+                    continue
+            logger.info(
+                f"Loaded {len(self._done)} finished partitions from checkpoint {path}."
+            )
+
+    def __len__(self) -> int:
+        return len(self._done)
+
+    def is_done(self, partition: FetchPartition) -> bool:
+        """Returns True if the partition was recorded as finished."""
+        return partition.key() in self._done
+
+    def mark_done(self, partition: FetchPartition):
+        """Records the partition as finished."""
+        date_str, crop_id, location_id = partition.key()
+        line = json.dumps(
+            {"date": date_str, "crop_id": crop_id, "location_id": location_id}
+        )
+        with self._lock:
+            if partition.key() in self._done:
+                return
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as checkpoint_file:
+                checkpoint_file.write(line + "\n")
+                checkpoint_file.flush()
+            self._done.add(partition.key())
+
+
+class FailedPartition(NamedTuple):
+    """A partition that failed, with the grid point it is fetched from and the error."""
+
+    partition: FetchPartition
+    lat: float
+    lon: float
+    error_class: str
+    message: str
+
+
+class FailureLedger:
+    """
+    Machine-readable record of the partitions that failed in a run, stored as JSON lines.
+
+    Each line holds the date, crop_id, location_id, lat, lon, error class and error
+    message of one failed partition. A run clears the ledger of the previous run
+    before it starts, and load_failures reads it back for a targeted retry.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): Ledger file. Created when the first failure is recorded.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._failures: dict[tuple[str, str, str], FailedPartition] = {}
+
+    def __len__(self) -> int:
+        return len(self._failures)
+
+    def clear(self):
+        """Removes the ledger file of a previous run."""
+        with self._lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+    def record(
+        self, partition: FetchPartition, lat: float, lon: float, error: Exception
+    ):
+        """Records a failed partition together with the class and message of its error."""
+        date_str, crop_id, location_id = partition.key()
+        line = json.dumps(
+            {
+                "date": date_str,
+                "crop_id": crop_id,
+                "location_id": location_id,
+                "lat": lat,
+                "lon": lon,
+                "error_class": type(error).__name__,
+                "message": str(error),
+            }
+        )
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as ledger_file:
+                ledger_file.write(line + "\n")
+            self._failures[partition.key()] = FailedPartition(
+                partition, lat, lon, type(error).__name__, str(error)
+            )
+
+    def failures(self) -> list[FailedPartition]:
+        """Returns the failures recorded in this run."""
+        with self._lock:
+            return list(self._failures.values())
+
+
+def load_failures(path: str) -> list[FailedPartition]:
+    """
+    Reads the failed partitions recorded by a previous run.
+
+    Args:
+        path (str): Ledger file written by FailureLedger.
+
+    Returns:
+        list[FailedPartition]: One entry per failed partition; empty if the file does not exist.
+
+    Raises:
+        ValueError: If a line of the ledger is not a valid entry.
+    """
+    if not os.path.exists(path):
+        return []
+    failures: dict[tuple[str, str, str], FailedPartition] = {}
+    with open(path, "r", encoding="utf-8") as ledger_file:
+        for line_number, line in enumerate(ledger_file, start=1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+                partition = FetchPartition(
+                    datetime.strptime(entry["date"], "%Y-%m-%d").replace(
+                        tzinfo=timezone.utc
+                    ),
+                    entry["crop_id"],
+                    entry["location_id"],
+                )
+                failures[partition.key()] = FailedPartition(
+                    partition,
+                    float(entry["lat"]),
+                    float(entry["lon"]),
+                    entry.get("error_class", ""),
+                    entry.get("message", ""),
+                )
+            except (ValueError, KeyError, TypeError) as e:
+                raise ValueError(
+                    f"Invalid entry on line {line_number} of failure ledger {path}: {e}"
+                ) from e
+    return list(failures.values())
+
+
+def group_failures_by_grid_point(
+    failures: list[FailedPartition],
+) -> dict[tuple[float, float], list[FetchPartition]]:
+    """
+    Groups failed partitions by the API grid point they are fetched from.
+
+    Args:
+        failures (list[FailedPartition]): Failures as returned by load_failures.
+
+    Returns:
+        dict[tuple[float, float], list[FetchPartition]]: Partitions to retry per grid point.
+    """
+    partitions_by_coords: dict[tuple[float, float], list[FetchPartition]] = {}
+    for failure in failures:
+        coords = (
+            round(failure.lat, GRID_DECIMALS),
+            round(failure.lon, GRID_DECIMALS),
+        )
+        partitions_by_coords.setdefault(coords, []).append(failure.partition)
+    return partitions_by_coords
@@ -0,0 +1,98 @@
+"""
+Rate limiting for requests made to the weather API.
+
+api.met.no asks clients to keep their request rate modest and to back off when
+the service answers with '429 Too Many Requests'. This module provides a
+thread-safe token bucket shared by all fetch workers, so the aggregate request
+rate stays within the configured limit regardless of how many workers run.
+"""
+
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+
+class TokenBucketRateLimiter:
+    """
+    Thread-safe token bucket limiting the number of requests per second.
+
+    Tokens are refilled continuously at `rate` tokens per second, up to `capacity`.
+    Each request consumes one token and blocks until a token is available.
+    A server-requested pause (e.g. from a 'Retry-After' header) blocks all workers
+    until the pause has elapsed.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        """
+        Args:
+            rate (float): Number of requests allowed per second. Must be positive.
+            capacity (float | None): Maximum burst size. Defaults to `rate` (at least 1).
+        """
+        if rate <= 0:
+            raise ValueError(f"Rate limit must be positive, got {rate}.")
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity is not None else max(1.0, self.rate)
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        """Adds the tokens accumulated since the last refill. Caller must hold the lock."""
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._last_refill = now
+
+    def acquire(self):
+        """Blocks until a request may be sent, then consumes one token."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                else:
+                    self._refill(now)
+                    if self._tokens >= 1.0:
+                        self._tokens -= 1.0
+                        return
+                    wait = (1.0 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def pause_for(self, seconds: float):
+        """
+        Blocks all callers of `acquire` for the given number of seconds.
+
+        Used when the server answers with '429 Too Many Requests'. The bucket is
+        also drained, so requests resume gradually after the pause.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._paused_until = max(self._paused_until, now + max(0.0, seconds))
+            self._tokens = 0.0
+            self._last_refill = self._paused_until
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parses a 'Retry-After' header value into a number of seconds.
+
+    Args:
+        value (str | None): The header value, either delay-seconds or an HTTP-date.
+
+    Returns:
+        float | None: Seconds to wait, or None if the header is missing or unparsable.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,161 @@
+"""
+Raw landing zone for weather API responses.
+
+Every downloaded locationforecast document can be stored unchanged, compressed
+with zstd, under RAW_PREFIX, partitioned by fetch date and grid point. Bronze
+partitions can then be rebuilt from these documents (see data_fetcher.rederive)
+after a schema change or a bug fix, without calling the API again.
+"""
+
+import re
+import sys
+import logging
+from datetime import datetime, timezone
+from typing import NamedTuple
+
+import pyarrow as pa
+
+try:
+    from universal.processing_utils import generate_raw_s3_key
+except ImportError:
+    sys.exit(
+        "CRITICAL ERROR: Could not import 'generate_raw_s3_key' from 'universal.processing_utils'."
+    )
+
+logger = logging.getLogger(__name__)
+
+# Compression codec of raw documents; pyarrow writes standard zstd frames.
+RAW_COMPRESSION = "zstd"
+
+# Pattern of raw object keys, as generated by generate_raw_s3_key.
+_RAW_KEY_PATTERN = re.compile(
+    r"/grid=(?P<lat>-?\d+\.\d+)_(?P<lon>-?\d+\.\d+)/forecast_(?P<fetched_at>\d{8}T\d{6}Z)\.json\.zst$"
+)
+
+
+class RawForecastRef(NamedTuple):
+    """Location of one raw forecast document in the raw layer."""
+
+    key: str
+    lat: float
+    lon: float
+    fetched_at: datetime
+
+
+def compress_forecast_body(body: bytes) -> bytes:
+    """Compresses a raw response body with zstd."""
+    sink = pa.BufferOutputStream()
+    with pa.CompressedOutputStream(sink, RAW_COMPRESSION) as stream:
+        stream.write(body)
+    return sink.getvalue().to_pybytes()
+
+
+def decompress_forecast_body(data: bytes) -> bytes:
+    """Decompresses a zstd-compressed response body."""
+    with pa.CompressedInputStream(pa.BufferReader(data), RAW_COMPRESSION) as stream:
+        return stream.read()
+
+
+def parse_raw_key(key: str) -> RawForecastRef | None:
+    """
+    Parses grid point and fetch time from a raw object key.
+
+    Returns:
+        RawForecastRef | None: The parsed reference, or None if the key is not a raw document key.
+    """
+    match = _RAW_KEY_PATTERN.search(key)
+    if match is None:
+        return None
+    return RawForecastRef(
+        key=key,
+        lat=float(match["lat"]),
+        lon=float(match["lon"]),
+        fetched_at=datetime.strptime(match["fetched_at"], "%Y%m%dT%H%M%SZ").replace(
+            tzinfo=timezone.utc
+        ),
+    )
+
+
+def save_raw_forecast(
+    s3_client,
+    bucket: str,
+    raw_prefix: str,
+    lat: float,
+    lon: float,
+    body: bytes,
+    fetched_at: datetime | None = None,
+) -> str:
+    """
+    Stores a downloaded forecast document in the raw layer.
+
+    Args:
+        s3_client: Initialized Boto3 S3 client.
+        bucket (str): Name of the bucket holding the raw layer.
+        raw_prefix (str): Base S3 prefix of the raw layer.
+        lat (float): Latitude of the grid point the document was fetched for.
+        lon (float): Longitude of the grid point the document was fetched for.
+        body (bytes): Raw response body.
+        fetched_at (datetime | None): Time of the download. Defaults to now (UTC).
+
+    Returns:
+        str: The S3 key of the stored document.
+    """
+    fetched_at = fetched_at or datetime.now(timezone.utc)
+    key = generate_raw_s3_key(raw_prefix, fetched_at, lat, lon)
+    s3_client.put_object(
+        Bucket=bucket,
+        Key=key,
+        Body=compress_forecast_body(body),
+        ContentType="application/zstd",
+    )
+    logger.info(f"Stored raw forecast for ({lat}, {lon}) at s3://{bucket}/{key}")
+    return key
+
+
+def load_raw_forecast(s3_client, bucket: str, key: str) -> bytes:
+    """
+    Reads and decompresses one raw forecast document.
+
+    Args:
+        s3_client: Initialized Boto3 S3 client.
+        bucket (str): Name of the bucket holding the raw layer.
+        key (str): S3 key of the document.
+
+    Returns:
+        bytes: The original response body.
+    """
+    response = s3_client.get_object(Bucket=bucket, Key=key)
+    return decompress_forecast_body(response["Body"].read())
+
+
+def list_raw_forecasts(
+    s3_client, bucket: str, raw_prefix: str, fetch_day: datetime
+) -> list[RawForecastRef]:
+    """
+    Lists the raw documents fetched on one UTC day.
+
+    Args:
+        s3_client: Initialized Boto3 S3 client.
+        bucket (str): Name of the bucket holding the raw layer.
+        raw_prefix (str): Base S3 prefix of the raw layer.
+        fetch_day (datetime): Day the documents were fetched on.
+
+    Returns:
+        list[RawForecastRef]: Documents of that day, ordered by fetch time.
+    """
+    day_prefix = (
+        f"{raw_prefix}/year={fetch_day.year}/month={fetch_day.month:02d}"
+        f"/day={fetch_day.strftime('%Y-%m-%d')}/"
+    )
+    refs = []
+    request = {"Bucket": bucket, "Prefix": day_prefix}
+    while True:
+        response = s3_client.list_objects_v2(**request)
+        for obj in response.get("Contents", []):
+            ref = parse_raw_key(obj["Key"])
+            if ref is not None:
+                refs.append(ref)
+        if not response.get("IsTruncated"):
+            break
+        request["ContinuationToken"] = response["NextContinuationToken"]
+    return sorted(refs, key=lambda ref: ref.fetched_at)
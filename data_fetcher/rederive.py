@@ -0,0 +1,310 @@
+"""
+Rebuilds bronze partitions from the raw layer without calling the weather API.
+
+Raw forecast documents (see data_fetcher.raw_store) are read from RAW_PREFIX,
+parsed with the current parser and written to the bronze layer. The rows of a
+date are rebuilt like the fetcher builds them: from the documents fetched on that
+date and on the following day (when the fetcher re-processes "yesterday"), with
+later documents taking precedence for the same hour. The raw layer may not hold
+every document a partition was built from, so the rebuilt rows are merged into
+the existing partition like newly fetched rows: they win for the hours they cover
+and the other hours are kept. Grid points are processed in parallel and the
+rebuilt partitions are written in one multi-partition write. With
+BRONZE_WRITE_MODE='delta', only the rebuilt rows are written, as delta files that
+take precedence over existing deltas until the next compaction.
+
+Usage:
+    python -m data_fetcher.rederive --start 2025-05-01 --end 2025-05-31
+"""
+
+from .config import FETCH_CONCURRENCY, LOCATION_REGISTRY_PATH
+from .locations import GRID_DECIMALS, group_by_grid_point, load_location_registry
+from .fetcher import parse_forecast_to_arrow, split_forecast_by_date
+from .raw_store import RawForecastRef, list_raw_forecasts, load_raw_forecast
+from .validator import PARTITION_DATE_COLUMN, validate_weather_data
+from .saver import save_partitioned_dataset_s3
+
+try:
+    from universal import config as app_config
+    from universal.s3_utils import get_s3_client, get_s3_parquet_to_df_if_exists
+    from universal.bronze_deltas import merge_bronze_frames
+    from universal.processing_utils import (
+        determine_fetcher_date_range,
+        generate_partitioned_s3_key,
+    )
+except ImportError:
+    exit(
+        "CRITICAL ERROR: Could not import shared configuration or S3 utils from 'universal' package. "
+        "Please ensure 'gdd-app' is in PYTHONPATH."
+    )
+
+import argparse
+import logging
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta, timezone
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+
+def _merge_existing_partition(
+    s3_client, bucket_name: str, process_dt: datetime, df_rebuilt: pd.DataFrame
+) -> pd.DataFrame:
+    """
+    Merges the rebuilt rows of one partition into its existing canonical file.
+
+    Rebuilt rows take precedence for the same (crop_id, location_id, timestamp); hours
+    only found in the existing file are kept.
+
+    Args:
+        s3_client: Initialized Boto3 S3 client, shared between workers.
+        bucket_name (str): Name of the bucket holding the bronze layer.
+        process_dt (datetime): Date of the partition.
+        df_rebuilt (pd.DataFrame): Rebuilt rows of one crop and location.
+
+    Returns:
+        pd.DataFrame: The merged rows, sorted by timestamp.
+    """
+    key = generate_partitioned_s3_key(
+        layer_prefix=app_config.BRONZE_PREFIX,
+        year=str(process_dt.year),
+        month=f"{process_dt.month:02d}",
+        day_str=process_dt.strftime("%Y-%m-%d"),
+        crop_id=df_rebuilt["crop_id"].iloc[0],
+        location_id=df_rebuilt["location_id"].iloc[0],
+    )
+    df_existing = get_s3_parquet_to_df_if_exists(s3_client, bucket_name, key)
+    return merge_bronze_frames([df_existing, df_rebuilt])
+
+
+def _rederive_grid_point(
+    s3_client,
+    bucket_name: str,
+    refs: list[RawForecastRef],
+    targets: list[tuple[str, str]],
+    dates_to_process: list[datetime],
+    merge_existing: bool = True,
+) -> tuple[list[pd.DataFrame], int]:
+    """
+    Rebuilds the bronze partitions of one grid point from its raw documents.
+
+    Args:
+        s3_client: Initialized Boto3 S3 client, shared between workers.
+        bucket_name (str): Name of the bucket holding the raw and bronze layers.
+        refs (list[RawForecastRef]): Raw documents of the grid point, ordered by fetch time.
+        targets (list[tuple[str, str]]): (crop_id, location_id) pairs located at the grid point.
+        dates_to_process (list[datetime]): Dates whose partitions are rebuilt.
+        merge_existing (bool): Whether to merge the rebuilt rows into the existing
+                               canonical partition files.
+
+    Returns:
+        tuple[list[pd.DataFrame], int]: The validated rows of every rebuilt partition, with a
+                                        'partition_date' column, and the number of partitions
+                                        that failed validation.
+    """
+    dates_by_day = {process_dt.date(): process_dt for process_dt in dates_to_process}
+    frames_by_date: dict[date, list[pd.DataFrame]] = {}
+    for ref in refs:
+        fetch_day = ref.fetched_at.date()
+        # A document fetched on a day feeds that day's and the previous day's partitions.
+        target_days = [
+            day
+            for day in (fetch_day - timedelta(days=1), fetch_day)
+            if day in dates_by_day
+        ]
+        if not target_days:
+            continue
+        try:
+            body = load_raw_forecast(s3_client, bucket_name, ref.key)
+            df_document = parse_forecast_to_arrow(body, targets[0][1]).to_pandas()
+        except Exception as e:
+            logging.error(f"    ERROR reading raw forecast {ref.key}: {e}")
+            continue
+        for day, df_for_date in split_forecast_by_date(
+            df_document, target_days
+        ).items():
+            frames_by_date.setdefault(day, []).append(df_for_date)
+
+    rebuilt, failed = [], 0
+    for day, frames in frames_by_date.items():
+        process_dt = dates_by_day[day]
+        date_str = process_dt.strftime("%Y-%m-%d")
+        # Documents are ordered by fetch time; a stable sort keeps the latest value per hour last.
+        df_day = (
+            pd.concat(frames, ignore_index=True)
+            .sort_values(by="timestamp", kind="stable")
+            .drop_duplicates(subset=["timestamp"], keep="last")
+        )
+        for crop_id, location_id in targets:
+            try:
+                df_partition = df_day.assign(location_id=location_id, crop_id=crop_id)
+                if merge_existing:
+                    df_partition = _merge_existing_partition(
+                        s3_client, bucket_name, process_dt, df_partition
+                    )
+                df_validated = validate_weather_data(
+                    df_partition,
+                    target_processing_date=pd.Timestamp(process_dt).tz_convert("UTC"),
+                )
+            except Exception as e:
+                logging.error(
+                    f"    ERROR re-deriving {crop_id} - {location_id} for {date_str}: {e}"
+                )
+                failed += 1
+                continue
+            rebuilt.append(
+                df_validated.assign(
+                    **{PARTITION_DATE_COLUMN: pd.Timestamp(date_str, tz="UTC")}
+                )
+            )
+    return rebuilt, failed
+
+
+def rederive_bronze(
+    start_date_str: str,
+    end_date_str: str,
+    concurrency: int = FETCH_CONCURRENCY,
+    registry_path: str | None = LOCATION_REGISTRY_PATH,
+    s3_client=None,
+) -> dict:
+    """
+    Rebuilds the bronze partitions of a date range from the raw layer.
+
+    Args:
+        start_date_str (str): First date to rebuild in 'YYYY-MM-DD' format.
+        end_date_str (str): Last date to rebuild in 'YYYY-MM-DD' format (inclusive).
+        concurrency (int): Maximum number of grid points processed in parallel.
+        registry_path (str | None): CSV or Parquet location registry. If None, the locations
+                                    defined in data_fetcher.config are used.
+        s3_client: Optional S3 client to use instead of one created from the shared config.
+
+    Returns:
+        dict: Number of raw documents found, partitions saved and partitions that failed.
+
+    Raises:
+        ValueError: If the storage configuration or the date range is invalid.
+    """
+    if app_config.STORAGE_BACKEND == "minio":
+        bucket_name = app_config.MINIO_DATA_BUCKET_NAME
+    elif app_config.STORAGE_BACKEND == "s3":
+        bucket_name = app_config.AWS_S3_DATA_BUCKET_NAME
+    else:
+        raise ValueError(
+            f"Invalid STORAGE_BACKEND '{app_config.STORAGE_BACKEND}' defined in shared config."
+        )
+    if not bucket_name:
+        raise ValueError(
+            f"Target bucket name could not be determined for backend '{app_config.STORAGE_BACKEND}'."
+        )
+    s3_client = s3_client if s3_client is not None else get_s3_client()
+
+    dates_to_process = determine_fetcher_date_range(start_date_str, end_date_str)
+    targets_by_coords = group_by_grid_point(load_location_registry(registry_path))
+
+    # Documents fetched from the first date up to the day after the last date contribute.
+    refs_by_coords: dict[tuple[float, float], list[RawForecastRef]] = {}
+    num_refs = 0
+    for offset in range(len(dates_to_process) + 1):
+        fetch_day = dates_to_process[0] + timedelta(days=offset)
+        for ref in list_raw_forecasts(
+            s3_client, bucket_name, app_config.RAW_PREFIX, fetch_day
+        ):
+            coords = (round(ref.lat, GRID_DECIMALS), round(ref.lon, GRID_DECIMALS))
+            if coords in targets_by_coords:
+                refs_by_coords.setdefault(coords, []).append(ref)
+                num_refs += 1
+    logging.info(
+        f"Re-deriving bronze for {start_date_str}..{end_date_str} from {num_refs} raw documents "
+        f"at {len(refs_by_coords)} grid points with concurrency {concurrency}."
+    )
+
+    rebuilt, failed = [], 0
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        futures = [
+            executor.submit(
+                _rederive_grid_point,
+                s3_client,
+                bucket_name,
+                sorted(refs, key=lambda ref: ref.fetched_at),
+                targets_by_coords[coords],
+                dates_to_process,
+                # Delta files only carry the rebuilt rows; readers merge them with the partition.
+                app_config.BRONZE_WRITE_MODE != "delta",
+            )
+            for coords, refs in refs_by_coords.items()
+        ]
+        for future in as_completed(futures):
+            grid_rebuilt, grid_failed = future.result()
+            rebuilt.extend(grid_rebuilt)
+            failed += grid_failed
+
+    write_results = save_partitioned_dataset_s3(
+        pd.concat(rebuilt, ignore_index=True) if rebuilt else pd.DataFrame(),
+        bucket=bucket_name,
+        base_prefix=app_config.BRONZE_PREFIX,
+        s3_client=s3_client,
+        max_workers=concurrency,
+        delta_written_at=datetime.now(timezone.utc)
+        if app_config.BRONZE_WRITE_MODE == "delta"
+        else None,
+        # Partitions rebuilt from the same documents keep their objects and ETags.
+        skip_unchanged=True,
+    )
+    saved, unchanged = 0, 0
+    for result in write_results:
+        if result.error is not None:
+            logging.error(
+                f"    ERROR saving {result.crop_id} - {result.location_id} for {result.date_str}: {result.error}"
+            )
+            failed += 1
+        else:
+            saved += 1
+            unchanged += result.skipped
+
+    logging.info(
+        f"Re-derivation finished: {saved} partitions saved ({unchanged} unchanged), {failed} failed."
+    )
+    return {"raw_documents": num_refs, "saved": saved, "failed": failed}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Rebuilds bronze partitions of a date range from the raw layer, without calling the weather API."
+    )
+    parser.add_argument(
+        "--start", type=str, required=True, help="First date in YYYY-MM-DD format."
+    )
+    parser.add_argument(
+        "--end",
+        type=str,
+        required=True,
+        help="Last date in YYYY-MM-DD format (inclusive).",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=FETCH_CONCURRENCY,
+        help=f"Optional: Number of grid points processed in parallel (default: {FETCH_CONCURRENCY}).",
+    )
+    parser.add_argument(
+        "--locations",
+        type=str,
+        default=LOCATION_REGISTRY_PATH,
+        help="Optional: CSV or Parquet file with crop_id, location_id, lat and lon columns.",
+    )
+    args = parser.parse_args()
+
+    try:
+        result = rederive_bronze(
+            args.start,
+            args.end,
+            concurrency=args.concurrency,
+            registry_path=args.locations,
+        )
+    except (OSError, ValueError) as e:
+        logging.error(f"Fatal: {e}. Exiting.")
+        exit(1)
+    if result["failed"]:
+        exit(1)
@@ -8,8 +8,15 @@ initialization and key generation.
 """
 
 import pandas as pd
-import io
 import sys
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Mapping, NamedTuple
+
+from botocore.exceptions import ClientError
+
+from .validator import PARTITION_COLUMNS, PARTITION_DATE_COLUMN
 
 try:
     from universal.s3_utils import (
@@ -21,62 +28,219 @@ except ImportError:
         "Ensure the file exists and 'gdd-app' is in PYTHONPATH."
     )
 try:
-    from universal.processing_utils import generate_partitioned_s3_key
+    from universal.processing_utils import (
+        compute_content_hash,
+        generate_partitioned_s3_key,
+    )
 except ImportError:  # Utility to create structured S3 keys.
     sys.exit(
         "CRITICAL ERROR: Could not import 'generate_partitioned_s3_key' from 'universal.processing_utils'."
     )
+try:
+    from universal.parquet_profile import get_parquet_profile, parquet_bytes
+except ImportError:
+    sys.exit(
+        "CRITICAL ERROR: Could not import 'parquet_bytes' from 'universal.parquet_profile'."
+    )
+try:
+    from universal.bronze_deltas import generate_delta_s3_key
+except ImportError:
+    sys.exit(
+        "CRITICAL ERROR: Could not import 'generate_delta_s3_key' from 'universal.bronze_deltas'."
+    )
+try:
+    from universal.manifest import ManifestEntry, build_manifest_entry, update_manifests
+except ImportError:
+    sys.exit(
+        "CRITICAL ERROR: Could not import the manifest writer from 'universal.manifest'."
+    )
+
+logger = logging.getLogger(__name__)
+
+
+# Object metadata holding the content hash of a partition file (see compute_content_hash).
+CONTENT_HASH_METADATA_KEY = "content-sha256"
+
+
+class PartitionWriteResult(NamedTuple):
+    """Outcome of writing one (date, crop, location) partition of a bronze dataset."""
+
+    date_str: str
+    crop_id: str
+    location_id: str
+    path: str | None
+    error: Exception | None
+    # True if the upload was skipped because the stored file holds the same content.
+    skipped: bool = False
+
+
+def _stored_content_hash(s3, bucket: str, key: str) -> str | None:
+    """Returns the content hash recorded in an object's metadata, or None if there is none."""
+    try:
+        response = s3.head_object(Bucket=bucket, Key=key)
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+            return None
+        raise
+    return response.get("Metadata", {}).get(CONTENT_HASH_METADATA_KEY)
+
+
+def _write_partition_parquet(
+    s3,
+    bucket: str,
+    base_prefix: str,
+    partition_date: pd.Timestamp,
+    crop_id: str,
+    location_id: str,
+    df_partition: pd.DataFrame,
+    delta_written_at: datetime | None = None,
+    skip_unchanged: bool = False,
+    previous_hashes: Mapping[tuple[str, str, str], str] | None = None,
+) -> tuple[ManifestEntry, bool]:
+    """
+    Serializes one partition with the configured Parquet profile and uploads it with a single PUT.
+
+    Returns:
+        tuple[ManifestEntry, bool]: The manifest entry of the file, and whether the upload
+                                    was skipped as unchanged.
+    """
+    date_str = partition_date.strftime("%Y-%m-%d")
+    key = generate_partitioned_s3_key(
+        layer_prefix=base_prefix,
+        year=str(partition_date.year),
+        month=f"{partition_date.month:02d}",
+        day_str=date_str,
+        crop_id=crop_id,
+        location_id=location_id,
+    )
+    if delta_written_at is not None:
+        key = generate_delta_s3_key(key, delta_written_at)
+    # Columns that only exist in other partitions of the run are all-null here; they are
+    # dropped so every file keeps the schema of its own partition.
+    df_partition = df_partition.drop(columns=[PARTITION_DATE_COLUMN]).dropna(
+        axis="columns", how="all"
+    )
+    # Hashed as the profile stores the rows, so that reading the file back gives the same hash.
+    profile = get_parquet_profile()
+    content_hash = compute_content_hash(df_partition, profile)
+    entry = build_manifest_entry(
+        date_str, crop_id, location_id, key, df_partition, "timestamp", content_hash
+    )
+    if skip_unchanged and delta_written_at is None:
+        if previous_hashes is not None:
+            stored_hash = previous_hashes.get((date_str, crop_id, location_id))
+        else:
+            stored_hash = _stored_content_hash(s3, bucket, key)
+        if stored_hash == content_hash:
+            return entry, True
+    s3.put_object(
+        Bucket=bucket,
+        Key=key,
+        Body=parquet_bytes(df_partition, profile),
+        Metadata={CONTENT_HASH_METADATA_KEY: content_hash},
+    )
+    return entry, False
 
 
-def save_partitioned_parquet_s3(
+def save_partitioned_dataset_s3(
     df: pd.DataFrame,
     bucket: str,
     base_prefix: str,
-    year_for_path: str,
-    month_for_path: str,
-    date_for_filename: str,
-):
+    s3_client=None,
+    max_workers: int = 8,
+    delta_written_at: datetime | None = None,
+    skip_unchanged: bool = False,
+    previous_hashes: Mapping[tuple[str, str, str], str] | None = None,
+) -> list[PartitionWriteResult]:
     """
-    Saves a DataFrame to a Parquet file in S3, using a partitioned key structure.
+    Saves all partitions of a run to S3 in one call, uploading them in parallel.
+
+    The rows are split into (date, crop, location) partitions and every partition is
+    written to its partitioned key ('year=/month=/crop_id=/location_id=/data_<date>.parquet').
+    A failing upload does not stop the others; it is reported in the result of its
+    partition.
+
+    If delta_written_at is given, every partition is written as a new append-only delta
+    file next to its canonical file instead (see universal.bronze_deltas).
 
-    The S3 key is generated based on the base prefix, year, month, date,
-    crop ID, and location ID. The crop ID and location ID are extracted
-    from the DataFrame.
+    Every file is stored with the content hash of its rows in its metadata. With
+    skip_unchanged, a partition whose content hash equals the stored one is not uploaded
+    again, so the object and its ETag stay unchanged. The stored hash is taken from
+    previous_hashes if given (a partition missing from it has no stored file), otherwise
+    from the object's metadata with one HEAD request.
+
+    The files written are recorded in the manifests of their months (see
+    universal.manifest) with one update per month after all uploads.
 
     Args:
-        df (pd.DataFrame): The DataFrame to save. Expected to contain
-                           'location_id' and 'crop_id' columns.
+        df (pd.DataFrame): Validated rows of all partitions, with 'partition_date',
+                           'crop_id' and 'location_id' columns.
         bucket (str): The S3 bucket name.
-        base_prefix (str): The base prefix for the S3 key (e.g., 'bronze/weather/').
-        year_for_path (str): The year component for the S3 path (e.g., '2025').
-        month_for_path (str): The month component for the S3 path (e.g., '05').
-        date_for_filename (str): The date string used in constructing the S3 key,
-                                 typically in 'YYYY-MM-DD' format.
+        base_prefix (str): The base prefix for the S3 keys (e.g., 'bronze/weather/').
+        s3_client: Optional initialized Boto3 S3 client, shared by the upload threads.
+                   The shared process-wide client is used if not provided.
+        max_workers (int): Maximum number of partitions serialized and uploaded in parallel.
+        delta_written_at (datetime | None): Write time of the delta files, or None to
+                                            replace the canonical partition files.
+        skip_unchanged (bool): Whether to skip uploads that would not change a canonical file.
+        previous_hashes (Mapping[tuple[str, str, str], str] | None): Content hashes of the
+            stored files, keyed by (date, crop_id, location_id), e.g. computed while merging.
 
     Returns:
-        str: The full S3 path (s3://bucket/key) where the file was saved.
+        list[PartitionWriteResult]: One result per partition, with the S3 path it was
+                                    saved to (or that was left unchanged) or the error
+                                    that prevented it.
+
+    Raises:
+        ValueError: If a partition column is missing from a non-empty DataFrame.
     """
-    # The DataFrame `df` is expected to contain data primarily for the date_for_filename.
-    # Path components are now explicitly passed.
-    location = df["location_id"].iloc[0]  # Assumes all rows have the same location_id.
-    crop = df["crop_id"].iloc[0]  # Assumes all rows have the same crop_id.
-    key = generate_partitioned_s3_key(
-        layer_prefix=base_prefix,
-        year=year_for_path,
-        month=month_for_path,
-        day_str=date_for_filename,
-        crop_id=crop,
-        location_id=location,
+    if df.empty:
+        return []
+    missing = [column for column in PARTITION_COLUMNS if column not in df.columns]
+    if missing:
+        raise ValueError(f"Missing partition columns: {missing}")
+
+    s3 = s3_client if s3_client is not None else get_s3_client()
+    groups = df.groupby(PARTITION_COLUMNS, sort=False).indices
+
+    def write(
+        key: tuple, row_positions
+    ) -> tuple[PartitionWriteResult, ManifestEntry | None]:
+        partition_date, crop_id, location_id = key
+        date_str = partition_date.strftime("%Y-%m-%d")
+        try:
+            entry, skipped = _write_partition_parquet(
+                s3,
+                bucket,
+                base_prefix,
+                partition_date,
+                crop_id,
+                location_id,
+                df.iloc[row_positions],
+                delta_written_at,
+                skip_unchanged,
+                previous_hashes,
+            )
+        except Exception as e:
+            return PartitionWriteResult(date_str, crop_id, location_id, None, e), None
+        path = f"s3://{bucket}/{entry.key}"
+        result = PartitionWriteResult(
+            date_str, crop_id, location_id, path, None, skipped
+        )
+        # Unchanged files keep the entry of their last write.
+        return result, None if skipped else entry
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        written = list(executor.map(lambda item: write(*item), groups.items()))
+    results = [result for result, _ in written]
+    update_manifests(
+        s3, bucket, base_prefix, [entry for _, entry in written if entry is not None]
+    )
+
+    num_failed = sum(result.error is not None for result in results)
+    num_skipped = sum(result.skipped for result in results)
+    logger.info(
+        f"Saved {len(results) - num_failed - num_skipped} of {len(results)} partitions to "
+        f"s3://{bucket}/{base_prefix} ({num_skipped} unchanged, {num_failed} failed)"
     )
-    # Write Parquet to memory buffer.
-    buffer = io.BytesIO()  # Use an in-memory buffer to avoid writing to disk.
-    df.to_parquet(buffer, index=False)
-    buffer.seek(0)  # Reset buffer's position to the beginning for reading.
-
-    # Get S3 client and upload the file.
-    s3 = get_s3_client()
-    s3.upload_fileobj(buffer, bucket, key)
-
-    # Log and return the S3 path.
-    print(f"Saved data to s3://{bucket}/{key}")
-    return f"s3://{bucket}/{key}"
+    return results
@@ -5,26 +5,60 @@ This module provides functions to check the integrity and consistency of
 weather data before it is saved. Validation includes checking for required
 columns, correct data types, realistic data ranges, duplicates, and
 the expected number of data points for a given day.
+
+Two engines implement the same checks with identical error messages: 'pandas'
+validates a DataFrame, and 'arrow' validates a pyarrow Table or RecordBatch with
+pyarrow.compute kernels, without converting it to pandas. The engine is chosen
+per call or with the VALIDATION_ENGINE environment variable.
 """
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from .config import VALIDATION_ENGINE
+
+# Available validation engines.
+VALIDATION_ENGINES = ("pandas", "arrow")
+
+# Columns that must not contain missing values.
+REQUIRED_COLUMNS = ("timestamp", "air_temperature", "location_id", "crop_id")
 
 
-def validate_weather_data(df: pd.DataFrame, target_processing_date: pd.Timestamp):
+def validate_weather_data(
+    df: pd.DataFrame | pa.Table | pa.RecordBatch,
+    target_processing_date: pd.Timestamp,
+    engine: str | None = None,
+):
     """
     Validates a DataFrame containing hourly weather data for a specific processing date.
 
     Args:
-        df (pd.DataFrame): The DataFrame to validate.
+        df (pd.DataFrame | pa.Table | pa.RecordBatch): The data to validate.
         target_processing_date (pd.Timestamp): The specific date for which the data is being processed.
                                                All timestamps in the DataFrame should fall on this date.
+        engine (str | None): 'pandas' or 'arrow'. Defaults to VALIDATION_ENGINE. The 'arrow'
+                             engine validates Arrow data in place; the 'pandas' engine converts
+                             Arrow input to a DataFrame first.
 
     Returns:
-        pd.DataFrame: The validated DataFrame if all checks pass.
+        pd.DataFrame | pa.Table | pa.RecordBatch: The validated data if all checks pass.
+                                                  The 'arrow' engine returns its input unchanged.
 
     Raises:
-        ValueError: If any validation check fails, containing a message with all detected errors.
+        ValueError: If any validation check fails, containing a message with all detected errors,
+                    or if the engine is unknown.
     """
+    engine = engine or VALIDATION_ENGINE
+    if engine == "arrow":
+        return _validate_weather_data_arrow(df, target_processing_date)
+    if engine != "pandas":
+        raise ValueError(
+            f"Unknown validation engine '{engine}'. Use one of {VALIDATION_ENGINES}."
+        )
+    if isinstance(df, (pa.Table, pa.RecordBatch)):
+        df = df.to_pandas()
+
     errors = []
 
     if "timestamp" not in df.columns:
@@ -57,7 +91,10 @@ def validate_weather_data(df: pd.DataFrame, target_processing_date: pd.Timestamp
 
     # Check for duplicates based on timestamp, location_id, and crop_id.
     # Assuming location_id and crop_id are present before validation of the final daily set.
-    if "location_id" in df.columns and "crop_id" in df.columns:
+    # A missing 'timestamp' column is already reported above.
+    if "timestamp" not in df.columns:
+        pass
+    elif "location_id" in df.columns and "crop_id" in df.columns:
         if df.duplicated(subset=["timestamp", "location_id", "crop_id"]).any():
             errors.append(
                 "Duplicate rows detected based on timestamp, location, and crop."
@@ -66,8 +103,11 @@ def validate_weather_data(df: pd.DataFrame, target_processing_date: pd.Timestamp
         # Fallback check if crop_id or location_id are not present (less specific).
         errors.append("Duplicate rows detected.")
 
-    if df.isnull().any().any():
-        # Check for any missing values in the entire DataFrame.
+    # Check for missing values in the required columns. Additional forecast variables
+    # (e.g. 'wind_speed') may legitimately be missing, for example in rows saved before
+    # they were collected.
+    required_columns = [col for col in REQUIRED_COLUMNS if col in df.columns]
+    if df[required_columns].isnull().any().any():
         errors.append("Missing data found.")
 
     if errors:
@@ -75,3 +115,205 @@ def validate_weather_data(df: pd.DataFrame, target_processing_date: pd.Timestamp
         raise ValueError("Data validation failed:\n" + "\n".join(errors))
 
     return df
+
+
+def _validate_weather_data_arrow(
+    data: pd.DataFrame | pa.Table | pa.RecordBatch,
+    target_processing_date: pd.Timestamp,
+):
+    """
+    Arrow engine of validate_weather_data, using pyarrow.compute kernels.
+
+    Runs the same checks in the same order as the pandas engine and collects the same
+    messages. Null and NaN values both count as missing, as in pandas.
+    """
+    table = (
+        pa.Table.from_pandas(data, preserve_index=False)
+        if isinstance(data, pd.DataFrame)
+        else data
+    )
+    names = table.schema.names
+    errors = []
+
+    timestamps = None
+    if "timestamp" not in names:
+        errors.append("Missing 'timestamp' column.")
+    else:
+        timestamps = table.column("timestamp")
+        if not pa.types.is_timestamp(timestamps.type):
+            try:
+                # Attempt to convert to timestamps if not already.
+                timestamps = pc.cast(timestamps, pa.timestamp("ns", tz="UTC"))
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                timestamps = None
+                errors.append("Invalid datetime format in 'timestamp'.")
+            else:
+                # Check if all timestamps, once normalized to date, match the target processing date.
+                on_target_date = pc.equal(
+                    pc.cast(timestamps, pa.date32()),
+                    pa.scalar(target_processing_date.date(), pa.date32()),
+                )
+                if pc.all(pc.fill_null(on_target_date, False)).as_py() is False:
+                    errors.append(
+                        f"All timestamps must be on the target processing date: {target_processing_date.strftime('%Y-%m-%d')}."
+                    )
+
+    if "air_temperature" not in names:
+        errors.append("Missing 'air_temperature' column.")
+    else:
+        temperature = table.column("air_temperature")
+        if not (
+            pa.types.is_integer(temperature.type)
+            or pa.types.is_floating(temperature.type)
+            or pa.types.is_decimal(temperature.type)
+            or pa.types.is_boolean(temperature.type)
+        ):
+            errors.append("'air_temperature' must be numeric.")
+        else:
+            # Check for realistic temperature bounds (Celsius). Missing values are out of bounds.
+            in_bounds = pc.and_(
+                pc.greater_equal(temperature, -50), pc.less_equal(temperature, 60)
+            )
+            if pc.all(pc.fill_null(in_bounds, False)).as_py() is False:
+                errors.append("Temperature values out of realistic bounds.")
+
+    # Check for duplicates based on timestamp, location_id, and crop_id.
+    if "timestamp" in names:
+        key_columns = {
+            "timestamp": table.column("timestamp") if timestamps is None else timestamps
+        }
+        if "location_id" in names and "crop_id" in names:
+            key_columns["location_id"] = table.column("location_id")
+            key_columns["crop_id"] = table.column("crop_id")
+            message = "Duplicate rows detected based on timestamp, location, and crop."
+        else:
+            # Fallback check if crop_id or location_id are not present (less specific).
+            message = "Duplicate rows detected."
+        keys = pa.table(key_columns)
+        if keys.group_by(list(key_columns)).aggregate([]).num_rows < keys.num_rows:
+            errors.append(message)
+
+    # Check for missing values in the required columns.
+    for column_name in REQUIRED_COLUMNS:
+        if column_name not in names:
+            continue
+        column = table.column(column_name)
+        if column.null_count > 0 or (
+            pa.types.is_floating(column.type) and pc.any(pc.is_nan(column)).as_py()
+        ):
+            errors.append("Missing data found.")
+            break
+
+    if errors:
+        # If any errors were collected, raise a ValueError.
+        raise ValueError("Data validation failed:\n" + "\n".join(errors))
+
+    return data
+
+
+# Column of a batch frame holding the processing date of each row's partition.
+PARTITION_DATE_COLUMN = "partition_date"
+
+# Columns identifying a partition in a batch frame and in the validation report.
+PARTITION_COLUMNS = [PARTITION_DATE_COLUMN, "crop_id", "location_id"]
+
+
+def validate_weather_batch(df: pd.DataFrame | pa.Table) -> pd.DataFrame:
+    """
+    Validates the hourly weather data of many partitions in one pass.
+
+    The frame holds the rows of every (date, crop, location) partition of a run, with
+    the processing date of each row's partition in the 'partition_date' column. Each
+    check is evaluated once over all rows with vectorized operations, and the results
+    are aggregated per partition with a single groupby. Unlike validate_weather_data,
+    nothing is raised: a report lists every partition with its errors, using the same
+    messages. Timestamps are always checked against the partition date.
+
+    Args:
+        df (pd.DataFrame | pa.Table): Rows of all partitions, with 'partition_date',
+                                      'crop_id', 'location_id', 'timestamp' and
+                                      'air_temperature' columns.
+
+    Returns:
+        pd.DataFrame: One row per partition with the columns 'partition_date', 'crop_id',
+                      'location_id', 'rows', 'passed' (bool) and 'errors' (newline-separated
+                      messages, empty if the partition passed).
+
+    Raises:
+        ValueError: If a partition column is missing, so rows cannot be attributed to partitions.
+    """
+    if isinstance(df, pa.Table):
+        df = df.to_pandas()
+    missing_partition_columns = [col for col in PARTITION_COLUMNS if col not in df]
+    if missing_partition_columns:
+        raise ValueError(
+            f"Batch is missing partition columns: {missing_partition_columns}."
+        )
+
+    # Boolean flags per row, one column per check, in the order of the error messages.
+    # Checks on the whole batch, such as missing columns, flag every row.
+    flags = pd.DataFrame(index=df.index)
+    partition_dates = pd.to_datetime(df[PARTITION_DATE_COLUMN], utc=True).dt.normalize()
+
+    if "timestamp" not in df.columns:
+        flags["missing_timestamp"] = True
+    else:
+        timestamps = df["timestamp"]
+        if not pd.api.types.is_datetime64_any_dtype(timestamps):
+            timestamps = pd.to_datetime(timestamps, errors="coerce", utc=True)
+            flags["invalid_timestamp"] = timestamps.isna() & df["timestamp"].notna()
+        elif timestamps.dt.tz is None:
+            timestamps = timestamps.dt.tz_localize("UTC")
+        flags["wrong_date"] = timestamps.notna() & (
+            timestamps.dt.tz_convert("UTC").dt.normalize() != partition_dates
+        )
+
+    if "air_temperature" not in df.columns:
+        flags["missing_temperature"] = True
+    elif not pd.api.types.is_numeric_dtype(df["air_temperature"]):
+        flags["non_numeric_temperature"] = True
+    else:
+        # Realistic temperature bounds (Celsius).
+        flags["out_of_bounds"] = ~df["air_temperature"].between(-50, 60)
+
+    if "timestamp" in df.columns:
+        flags["duplicate"] = df.duplicated(
+            subset=[PARTITION_DATE_COLUMN, "timestamp", "location_id", "crop_id"]
+        )
+
+    required_columns = [col for col in REQUIRED_COLUMNS if col in df.columns]
+    flags["missing"] = df[required_columns].isnull().any(axis=1)
+
+    keys = [
+        partition_dates.rename(PARTITION_DATE_COLUMN),
+        df["crop_id"],
+        df["location_id"],
+    ]
+    report = flags.groupby(keys, dropna=False, sort=False).any()
+    report.insert(0, "rows", df.groupby(keys, dropna=False, sort=False).size())
+    report = report.reset_index()
+
+    messages = {
+        "missing_timestamp": lambda row: "Missing 'timestamp' column.",
+        "invalid_timestamp": lambda row: "Invalid datetime format in 'timestamp'.",
+        "wrong_date": lambda row: (
+            "All timestamps must be on the target processing date: "
+            f"{row[PARTITION_DATE_COLUMN].strftime('%Y-%m-%d')}."
+        ),
+        "missing_temperature": lambda row: "Missing 'air_temperature' column.",
+        "non_numeric_temperature": lambda row: "'air_temperature' must be numeric.",
+        "out_of_bounds": lambda row: "Temperature values out of realistic bounds.",
+        "duplicate": lambda row: (
+            "Duplicate rows detected based on timestamp, location, and crop."
+        ),
+        "missing": lambda row: "Missing data found.",
+    }
+    # Messages are only built for the partitions that failed at least one check.
+    failed_checks = [col for col in messages if col in report and report[col].any()]
+    report["passed"] = ~report[failed_checks].any(axis=1)
+    report["errors"] = ""
+    for index, row in report[~report["passed"]].iterrows():
+        report.at[index, "errors"] = "\n".join(
+            messages[check](row) for check in failed_checks if row[check]
+        )
+    return report[[*PARTITION_COLUMNS, "rows", "passed", "errors"]]
@@ -10,6 +10,10 @@ import sys
 
 try:
     from universal import config as app_config  # For T_BASE_MAP
+    from universal.bronze_deltas import delta_glob_for
+    from universal.compacted_files import compacted_globs_for
+    from universal.duckdb_utils import get_duckdb_connection
+    from .methods import compute_daily_gdd_column, crop_gdd_parameters, degree_hours_sql
 except ImportError:
     sys.exit(
         "CRITICAL ERROR: Could not import shared configuration from 'universal.config'. "
@@ -31,9 +35,14 @@ class GDCalculationError(Exception):
 def calculate_daily_gdd(bronze_data_glob_paths: list[str]) -> pd.DataFrame:
     """
     Calculates daily GDD from bronze layer data using DuckDB.
-    The function reads Parquet files specified by glob patterns, processes the data to find
-    daily minimum and maximum temperatures, and then computes GDD based on crop-specific
-    base temperatures.
+    The glob patterns are expanded into a list of Parquet files that a single query reads
+    and aggregates into daily minimum and maximum temperatures (and degree-hours); only
+    the daily results are returned to pandas, where the GDD method configured for each
+    crop (see gdd_counter.methods) computes the GDD from them and the crop's base and
+    upper temperatures. In 'delta' write mode, the delta files of the matched partitions are
+    read as well and merged with last-write-wins per timestamp. For days of closed months,
+    the rows of the day are also read from the monthly compacted files, with the day files
+    winning per timestamp.
 
     Args:
         bronze_data_glob_paths (list[str]): A list of S3 glob patterns pointing to the
@@ -42,7 +51,8 @@ def calculate_daily_gdd(bronze_data_glob_paths: list[str]) -> pd.DataFrame:
 
     Returns:
         pd.DataFrame: A Pandas DataFrame containing daily GDD data, including date, crop ID,
-                      location ID, min/max/avg temperatures, base temperature used, and the calculated GDD.
+                      location ID, min/max/avg temperatures, base and upper temperatures used,
+                      the GDD method, and the calculated GDD.
                       Returns an empty DataFrame if no data is found or processed.
 
     Raises:
@@ -52,119 +62,138 @@ def calculate_daily_gdd(bronze_data_glob_paths: list[str]) -> pd.DataFrame:
     logger.info(f"Calculating daily GDD from paths/globs: {bronze_data_glob_paths}")
     con = None
     try:
-        t_base_df = pd.DataFrame(
-            list(app_config.T_BASE_MAP.items()), columns=["crop_id_map", "t_base"]
-        )
-
-        # Initialize a DuckDB in-memory connection.
-        con = duckdb.connect()
+        t_base_df = crop_gdd_parameters().rename(columns={"crop_id": "crop_id_map"})
 
-        # Configure DuckDB's S3 credentials and endpoint. This is necessary for DuckDB to access S3-compatible storage.
-        if app_config.STORAGE_BACKEND == "minio":
-            if not all(
-                [
-                    app_config.MINIO_ENDPOINT_URL,
-                    app_config.MINIO_ACCESS_KEY,
-                    app_config.MINIO_SECRET_KEY,
-                ]
-            ):
-                raise GDCalculationError(
-                    "MinIO configuration is incomplete for DuckDB S3 access."
-                )  # Ensure all storage details are present.
+        # Connect to the shared DuckDB database, which holds the S3 secret, httpfs and the
+        # Parquet metadata caches (see universal/duckdb_utils.py).
+        con = get_duckdb_connection()
 
-            endpoint = app_config.MINIO_ENDPOINT_URL
-            # DuckDB expects the S3 endpoint without the scheme (http/https).
-            s3_endpoint_host_port = endpoint.replace("http://", "").replace(
-                "https://", ""
-            )
-            s3_use_ssl = (
-                "true" if endpoint.startswith("https://") else "false"
-            )  # Set SSL based on endpoint.
-
-            con.sql(f"SET s3_endpoint='{s3_endpoint_host_port}';")
-            con.sql(f"SET s3_access_key_id='{app_config.MINIO_ACCESS_KEY}';")
-            con.sql(f"SET s3_secret_access_key='{app_config.MINIO_SECRET_KEY}';")
-            con.sql(f"SET s3_use_ssl={s3_use_ssl};")
-            con.sql(
-                "SET s3_url_style='path';"
-            )  # MinIO uses path-style addressing for buckets.
-            logger.info("DuckDB S3 settings configured for MinIO.")
-        elif app_config.STORAGE_BACKEND == "s3":
-            # For AWS S3, DuckDB automatically uses default credential providers.
-            logger.info("DuckDB will use default AWS S3 credentials and settings.")
-
-        # Register the base temperature mapping DataFrame as a DuckDB table.
+        # Register the base temperature, cutoff and method of each crop as a DuckDB table.
         con.register("t_base_table", t_base_df)
 
-        # Read data for each provided glob pattern individually. By allowing graceful skipping of patterns that match no files,
-        # preventing the entire process from failing if one glob is empty.
-        all_bronze_dfs = []
-        for glob_pattern in bronze_data_glob_paths:
+        # Compacted month files hold every day of the month, so only the rows of the glob's day are kept.
+        # Each entry pairs a glob with the day to keep, or None to keep every row.
+        globs_to_read = [
+            (compacted_glob, day_str)
+            for base_glob in bronze_data_glob_paths
+            for compacted_glob, day_str in compacted_globs_for(base_glob)
+        ]
+        globs_to_read += [(base_glob, None) for base_glob in bronze_data_glob_paths]
+        delta_mode = app_config.BRONZE_WRITE_MODE == "delta"
+        if delta_mode:
+            globs_to_read += [
+                (delta_glob, None)
+                for delta_glob in map(delta_glob_for, bronze_data_glob_paths)
+                if delta_glob is not None
+            ]
+        # With deltas or compacted files, several files may hold a row and are merged by write order.
+        merge_by_file = delta_mode or len(globs_to_read) > len(bronze_data_glob_paths)
+
+        # Expand the globs into one list of files, so that a single query reads them all.
+        # Globs that match no files are skipped instead of failing the whole calculation.
+        files_to_read: dict[str, None] = {}
+        compacted_file_days = []
+        for glob_pattern, day_str in globs_to_read:
             try:
-                logger.info(f"Attempting to read bronze data from: {glob_pattern}")
-                # Execute a query to read Parquet files matching the current glob pattern.
-                # Hive partitioning is enabled to correctly interpret partitioned data.
-                # The filename column is not used downstream, so filename=1 is removed.
-                df_single_glob = con.execute(
-                    f"SELECT * FROM read_parquet('{glob_pattern}', hive_partitioning=1);"
-                ).fetchdf()
-                if not df_single_glob.empty:
-                    all_bronze_dfs.append(df_single_glob)
-                    logger.info(
-                        f"Successfully read {len(df_single_glob)} rows from {glob_pattern}"
-                    )
+                matched_files = [
+                    row[0]
+                    for row in con.execute(
+                        "SELECT file FROM glob(?);", [glob_pattern]
+                    ).fetchall()
+                ]
             except duckdb.IOException as e:
-                # Specifically handle "No files found" errors as warnings and continue.
-                if "No files found that match the pattern" in str(e):
-                    logger.warning(
-                        f"No files found for pattern: {glob_pattern}. Skipping this pattern."
-                    )
-                else:
-                    raise GDCalculationError(
-                        f"DuckDB IOException for {glob_pattern}: {e}"
-                    ) from e  # Re-raise other IOExceptions as GDCalculationError.
-
-        if not all_bronze_dfs:
+                raise GDCalculationError(
+                    f"DuckDB IOException for {glob_pattern}: {e}"
+                ) from e  # Re-raise IOExceptions as GDCalculationError.
+            if not matched_files:
+                logger.warning(
+                    f"No files found for pattern: {glob_pattern}. Skipping this pattern."
+                )
+                continue
+            logger.info(f"Found {len(matched_files)} files for {glob_pattern}")
+            files_to_read.update(dict.fromkeys(matched_files))
+            if day_str is not None:
+                compacted_file_days += [(file, day_str) for file in matched_files]
+
+        if not files_to_read:
             logger.warning(
                 "No bronze data found for any of the provided glob patterns. Returning empty DataFrame."
             )
             return pd.DataFrame()  # Return empty DataFrame if no data could be read.
 
-        # Concatenate all pandas DataFrames read from the individual globs.
-        # ASSUMPTION: Schemas of the Parquet files are compatible at this point.
-        combined_bronze_df = pd.concat(all_bronze_dfs, ignore_index=True)
-        # Register the combined DataFrame as a table in DuckDB for processing.
-        con.register("bronze_table_for_processing", combined_bronze_df)
+        # Register the days to keep from each compacted file as a DuckDB table.
+        con.register(
+            "compacted_file_days",
+            pd.DataFrame(compacted_file_days, columns=["filename", "day"], dtype=str),
+        )
 
         # Define Common Table Expressions (CTEs) for the GDD calculation.
-        data_processing_ctes = """
-        WITH DailyTemps AS (
+        # Only the needed columns are read, and the rows are aggregated inside DuckDB, so the raw
+        # hourly data never reaches pandas. Every writer stores crop_id and location_id in the
+        # rows, so hive partitioning is not needed (and per-crop compacted files, one directory
+        # level up, could not be read together with day files with it enabled).
+        # union_by_name tolerates files written with different sets of forecast variables.
+        # When several files may hold a row, the last written one is kept: canonical files,
+        # deltas and compacted files sort by write order by file name.
+        latest_row_filter = (
+            """
+            QUALIFY ROW_NUMBER() OVER (
+                PARTITION BY br.crop_id, br.location_id, br.timestamp
+                ORDER BY br.filename DESC, br.file_row_number DESC
+            ) = 1"""
+            if merge_by_file
+            else ""
+        )
+        data_processing_ctes = f"""
+        WITH BronzeRows AS (
+            -- This CTE reads the bronze rows of all files, keeping only the rows of the
+            -- requested day from compacted month files.
+            SELECT
+                br.timestamp,
+                br.crop_id,
+                br.location_id,
+                br.air_temperature
+            FROM read_parquet(
+                $files, hive_partitioning=0, union_by_name=1, filename=1, file_row_number=1
+            ) br
+            LEFT JOIN compacted_file_days cfd ON br.filename = cfd.filename
+            WHERE cfd.filename IS NULL
+                OR (
+                    br.timestamp >= CAST(cfd.day || ' 00:00:00+00' AS TIMESTAMPTZ)
+                    AND br.timestamp < CAST(cfd.day || ' 00:00:00+00' AS TIMESTAMPTZ) + INTERVAL 1 DAY
+                ){latest_row_filter}
+        ),
+        DailyTemps AS (
             -- This CTE calculates the daily minimum and maximum air temperatures
-            -- for each crop_id and location_id by grouping the raw bronze data.
+            -- for each crop_id and location_id by grouping the raw bronze data,
+            -- and the degree-hours above the crop's base temperature.
             SELECT
-                CAST(timestamp AS DATE) AS "date",
-                crop_id,
-                location_id,
-                MIN(air_temperature) AS t_min_daily,
-                MAX(air_temperature) AS t_max_daily
-            FROM bronze_table_for_processing
+                CAST(br.timestamp AS DATE) AS "date",
+                br.crop_id,
+                br.location_id,
+                MIN(br.air_temperature) AS t_min_daily,
+                MAX(br.air_temperature) AS t_max_daily,
+                {degree_hours_sql("br.air_temperature", "tb.t_base", "tb.t_upper")} AS degree_hours_gdd
+            FROM BronzeRows br
+            JOIN t_base_table tb ON br.crop_id = tb.crop_id_map
             GROUP BY 1, 2, 3
         )"""
 
         gdd_calculation_final_select = """
         SELECT
             dt."date",
-            -- Selects daily temperature aggregates and joins with base temperatures.
-            -- Calculates the average daily temperature (t_avg_daily)
-            -- and the Growing Degree Days (daily_gdd).
+            -- Selects daily temperature aggregates and joins with the crop thresholds.
+            -- Calculates the average daily temperature (t_avg_daily); the Growing
+            -- Degree Days (daily_gdd) are computed from these by the crop's method.
             dt.crop_id,
             dt.location_id,
             dt.t_min_daily,
             dt.t_max_daily,
             (dt.t_max_daily + dt.t_min_daily) / 2 AS t_avg_daily,
             tb.t_base AS t_base_used,
-            GREATEST(0.0, ((dt.t_max_daily + dt.t_min_daily) / 2) - tb.t_base) AS daily_gdd
-            -- daily_gdd is calculated as (t_avg_daily - t_base), but not less than 0.
+            tb.t_upper AS t_upper_used,
+            tb.gdd_method,
+            dt.degree_hours_gdd
         FROM DailyTemps dt
         JOIN t_base_table tb ON dt.crop_id = tb.crop_id_map;
         """
@@ -172,8 +201,16 @@ def calculate_daily_gdd(bronze_data_glob_paths: list[str]) -> pd.DataFrame:
 
         # Execute the full SQL query (CTEs + final SELECT) and fetch results as a pandas DataFrame.
         silver_df = con.execute(
-            f"{data_processing_ctes} {gdd_calculation_final_select}"
+            f"{data_processing_ctes} {gdd_calculation_final_select}",
+            {"files": list(files_to_read)},
         ).fetchdf()
+        # One vectorized call per method over all location-days using it.
+        silver_df.insert(
+            silver_df.columns.get_loc("t_base_used") + 1,
+            "daily_gdd",
+            compute_daily_gdd_column(silver_df),
+        )
+        silver_df = silver_df.drop(columns=["degree_hours_gdd"])
         logger.info(
             f"Successfully calculated GDD. Shape of resulting data: {silver_df.shape}"
         )
@@ -185,6 +222,7 @@ def calculate_daily_gdd(bronze_data_glob_paths: list[str]) -> pd.DataFrame:
         ) from e
     finally:
         # Ensure the DuckDB connection is closed in all cases (success or failure).
+        # The shared database stays open for the next calculation.
         if con:
             con.close()
             logger.info("DuckDB connection closed for GDD calculation.")
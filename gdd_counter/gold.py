@@ -0,0 +1,230 @@
+"""
+Gold layer: season-cumulative GDD per crop and location.
+
+After the silver layer is written, the daily GDD of the saved rows are folded into one
+small Parquet file per season, crop and location (see generate_gold_cumulative_s3_key):
+
+    gold/cumulative_gdd/season=2025/crop_id=maize/location_id=Belagavi/cumulative_gdd_2025.parquet
+
+holding the daily and running cumulative GDD of every day of the season, so that the
+accumulated GDD up to any day is read from a single object. Updates are incremental:
+the stored totals before the first changed day of a series are kept, and the running
+sum continues from the last of them with a window function, so earlier silver days
+are never read again.
+"""
+
+import io
+import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+try:
+    from universal import config as app_config
+    from universal.duckdb_utils import get_duckdb_connection
+    from universal.parquet_profile import parquet_bytes
+    from universal.processing_utils import generate_gold_cumulative_s3_key
+    from universal.s3_utils import get_s3_client, get_s3_parquet_to_df_if_exists
+except ImportError:
+    sys.exit(
+        "CRITICAL ERROR: Could not import shared modules from 'universal'. "
+        "Please ensure 'gdd-app' is in PYTHONPATH."
+    )
+
+logger = logging.getLogger(__name__)
+
+# Columns of the gold cumulative GDD files, and the columns identifying one series.
+GOLD_COLUMNS = [
+    "date",
+    "crop_id",
+    "location_id",
+    "season",
+    "daily_gdd",
+    "cumulative_gdd",
+]
+SERIES_KEY = ["season", "crop_id", "location_id"]
+
+# Merges the new daily GDD of some series into their stored rows. Rows before the first
+# changed day keep their stored total; from there the total continues from the last of
+# them. A new day replaces the stored row of the same day.
+_CUMULATIVE_GDD_QUERY = """
+WITH Changes AS (
+    SELECT season, crop_id, location_id, MIN("date") AS first_changed
+    FROM new_rows
+    GROUP BY ALL
+),
+StoredTotals AS (
+    -- Last stored total before the first changed day of each series.
+    SELECT s.season, s.crop_id, s.location_id, ARG_MAX(s.cumulative_gdd, s."date") AS base_total
+    FROM stored_rows s
+    JOIN Changes c USING (season, crop_id, location_id)
+    WHERE s."date" < c.first_changed
+    GROUP BY ALL
+),
+Series AS (
+    SELECT s."date", s.crop_id, s.location_id, s.season, s.daily_gdd, s.cumulative_gdd
+    FROM stored_rows s
+    ANTI JOIN new_rows n USING ("date", season, crop_id, location_id)
+    UNION ALL
+    SELECT "date", crop_id, location_id, season, daily_gdd, NULL AS cumulative_gdd
+    FROM new_rows
+)
+SELECT
+    s."date",
+    s.crop_id,
+    s.location_id,
+    s.season,
+    s.daily_gdd,
+    CASE
+        WHEN s."date" < c.first_changed THEN s.cumulative_gdd
+        ELSE COALESCE(t.base_total, 0.0) + SUM(
+            CASE WHEN s."date" >= c.first_changed THEN s.daily_gdd ELSE 0.0 END
+        ) OVER (
+            PARTITION BY s.season, s.crop_id, s.location_id
+            ORDER BY s."date"
+            ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW
+        )
+    END AS cumulative_gdd
+FROM Series s
+JOIN Changes c USING (season, crop_id, location_id)
+LEFT JOIN StoredTotals t USING (season, crop_id, location_id)
+ORDER BY s.season, s.crop_id, s.location_id, s."date";
+"""
+
+
+class GoldWriteError(Exception):
+    """
+    Custom exception raised for errors encountered while updating the gold layer.
+    """
+
+    pass
+
+
+def season_of(dates: pd.Series, start_month: int) -> pd.Series:
+    """
+    Returns the growing season of each date: the year its season starts in.
+
+    Args:
+        dates (pd.Series): Datetime-like dates.
+        start_month (int): First month of a season (1 for calendar years).
+
+    Returns:
+        pd.Series: The seasons, as integers.
+    """
+    dates = pd.to_datetime(dates)
+    return (dates.dt.year - (dates.dt.month < start_month)).astype("int64")
+
+
+def accumulate_gdd(df_stored: pd.DataFrame, df_new: pd.DataFrame) -> pd.DataFrame:
+    """
+    Folds new daily GDD into stored cumulative series.
+
+    Args:
+        df_stored (pd.DataFrame): Stored rows of the series being updated, with GOLD_COLUMNS.
+        df_new (pd.DataFrame): New daily GDD, with the columns of GOLD_COLUMNS except
+                               'cumulative_gdd'.
+
+    Returns:
+        pd.DataFrame: The complete updated series of every series with new rows, sorted by
+                      season, crop, location and date.
+    """
+    types = {
+        "date": "datetime64[us]",
+        "crop_id": str,
+        "location_id": str,
+        "season": "int64",
+        "daily_gdd": float,
+    }
+    con = get_duckdb_connection()
+    try:
+        con.register(
+            "stored_rows",
+            df_stored[GOLD_COLUMNS].astype({**types, "cumulative_gdd": float}),
+        )
+        con.register("new_rows", df_new[list(types)].astype(types))
+        return con.execute(_CUMULATIVE_GDD_QUERY).fetchdf()
+    finally:
+        con.close()
+
+
+def update_gold_cumulative_gdd(
+    silver_df: pd.DataFrame,
+    target_bucket: str,
+    gold_prefix: str,
+    s3_client=None,
+    max_workers: int = 8,
+) -> int:
+    """
+    Updates the gold season-cumulative GDD series with newly saved silver rows.
+
+    For every (season, crop, location) with new rows, the stored series is read, the new
+    days are folded in (see accumulate_gdd) and the series is written back as one Parquet
+    file with the configured PARQUET_PROFILE.
+
+    Args:
+        silver_df (pd.DataFrame): Saved silver rows, with 'date', 'crop_id', 'location_id'
+                                  and 'daily_gdd'.
+        target_bucket (str): Name of the S3 or MinIO bucket holding the gold layer.
+        gold_prefix (str): Base S3 prefix of the gold layer.
+        s3_client: Optional S3 client. Defaults to the shared client of the configured backend.
+        max_workers (int): Maximum number of series read and written in parallel.
+
+    Returns:
+        int: Number of series written.
+
+    Raises:
+        GoldWriteError: If a series cannot be read, computed or written.
+    """
+    if silver_df.empty:
+        logger.info("No new silver rows; the gold layer is up to date.")
+        return 0
+    s3_client = s3_client or get_s3_client()
+    df_new = silver_df[["date", "crop_id", "location_id", "daily_gdd"]].copy()
+    df_new["season"] = season_of(df_new["date"], app_config.GOLD_SEASON_START_MONTH)
+    series_keys = {
+        (season, crop_id, location_id): generate_gold_cumulative_s3_key(
+            gold_prefix, season, crop_id, location_id
+        )
+        for season, crop_id, location_id in df_new[SERIES_KEY]
+        .drop_duplicates()
+        .itertuples(index=False, name=None)
+    }
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            stored_frames = list(
+                executor.map(
+                    lambda key: get_s3_parquet_to_df_if_exists(
+                        s3_client, target_bucket, key
+                    ),
+                    series_keys.values(),
+                )
+            )
+        stored_frames = [df for df in stored_frames if df is not None and not df.empty]
+        df_stored = (
+            pd.concat(stored_frames, ignore_index=True)
+            if stored_frames
+            else pd.DataFrame(columns=GOLD_COLUMNS)
+        )
+        df_series = accumulate_gdd(df_stored, df_new)
+
+        def write_series(item):
+            (season, crop_id, location_id), df = item
+            key = series_keys[(season, crop_id, location_id)]
+            s3_client.put_object(
+                Bucket=target_bucket,
+                Key=key,
+                Body=io.BytesIO(parquet_bytes(df.reset_index(drop=True))),
+            )
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            list(executor.map(write_series, df_series.groupby(SERIES_KEY, sort=False)))
+    except Exception as e:
+        raise GoldWriteError(f"Failed to update the gold cumulative GDD: {e}") from e
+
+    logger.info(
+        f"Updated {len(series_keys)} cumulative GDD series in s3://{target_bucket}/{gold_prefix}/ "
+        f"with {len(df_new)} new days."
+    )
+    return len(series_keys)
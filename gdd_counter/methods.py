@@ -0,0 +1,284 @@
+"""
+Growing Degree Day (GDD) methods, as vectorized kernels over many location-days.
+
+Every method turns a day of temperatures into degree-days above a crop's base
+temperature, optionally capped by an upper cutoff (horizontal cutoff: temperatures
+above it count as the cutoff):
+
+    average          max(0, (t_max + t_min) / 2 - t_base), the classic method; ignores the cutoff.
+    capped           The average method on t_max capped at the cutoff and t_min raised to
+                     the base (the "modified average", e.g. 86/50 °F for maize).
+    single_sine      Baskerville-Emin: the day is a sine curve between t_min and t_max.
+    single_triangle  The day is a symmetric triangle between t_min and t_max.
+    degree_hours     Mean over the day's hourly readings of the degrees between base and
+                     cutoff, from the bronze data rather than its daily extremes.
+
+The daily kernels take NumPy arrays (or scalars) of one value per location-day and
+broadcast, so a single call computes millions of location-days. Degree-hours need the
+hourly readings, which are aggregated inside DuckDB with degree_hours_sql in the GDD
+calculation; degree_hours_gdd is the NumPy equivalent for data already in memory.
+The method and thresholds of each crop are configured in universal.config.
+"""
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+try:
+    from universal import config as app_config
+except ImportError:
+    sys.exit(
+        "CRITICAL ERROR: Could not import shared configuration from 'universal.config'. "
+        "Please ensure 'gdd-app' is in PYTHONPATH and 'universal/config.py' exists."
+    )
+
+GDD_METHODS = ("average", "capped", "single_sine", "single_triangle", "degree_hours")
+
+
+def _effective_cutoff(t_max, t_base, t_upper) -> np.ndarray:
+    """Replaces missing (NaN) cutoffs by one that never applies: max(t_max, t_base)."""
+    t_upper = np.asarray(t_upper, dtype=float)
+    return np.where(np.isnan(t_upper), np.maximum(t_max, t_base), t_upper)
+
+
+def _degrees_between(temperature, t_base, t_upper) -> np.ndarray:
+    """Degrees of a temperature above the base, counting temperatures above the cutoff as the cutoff."""
+    return np.clip(temperature, t_base, np.maximum(t_upper, t_base)) - t_base
+
+
+def average_gdd(t_min, t_max, t_base) -> np.ndarray:
+    """
+    Computes GDD with the average method: max(0, (t_max + t_min) / 2 - t_base).
+
+    Args:
+        t_min (array-like): Daily minimum temperatures.
+        t_max (array-like): Daily maximum temperatures.
+        t_base (array-like): Base temperatures.
+
+    Returns:
+        np.ndarray: Degree-days per location-day.
+    """
+    t_avg = (np.asarray(t_max, dtype=float) + np.asarray(t_min, dtype=float)) / 2
+    return np.maximum(0.0, t_avg - t_base)
+
+
+def capped_gdd(t_min, t_max, t_base, t_upper) -> np.ndarray:
+    """
+    Computes GDD with the modified average method.
+
+    t_max is capped at the cutoff and t_min is raised to the base (and capped at the
+    cutoff) before averaging.
+
+    Args:
+        t_min (array-like): Daily minimum temperatures.
+        t_max (array-like): Daily maximum temperatures.
+        t_base (array-like): Base temperatures.
+        t_upper (array-like): Upper cutoffs; NaN for no cutoff.
+
+    Returns:
+        np.ndarray: Degree-days per location-day.
+    """
+    t_min = np.asarray(t_min, dtype=float)
+    t_max = np.asarray(t_max, dtype=float)
+    t_upper = _effective_cutoff(t_max, t_base, t_upper)
+    capped_max = np.minimum(t_max, t_upper)
+    raised_min = np.minimum(np.maximum(t_min, t_base), t_upper)
+    return np.maximum(0.0, (capped_max + raised_min) / 2 - t_base)
+
+
+def single_sine_gdd(t_min, t_max, t_base, t_upper) -> np.ndarray:
+    """
+    Computes GDD with the single sine method (Baskerville & Emin, 1969) and a horizontal cutoff.
+
+    The day's temperature follows M + W * sin(x) with M = (t_max + t_min) / 2 and
+    W = (t_max - t_min) / 2. With x1 and x2 the phases where the curve crosses the base
+    and the cutoff (clamped to [-pi/2, pi/2]), the degree-days are
+
+        ((M - t_base) * (x2 - x1) + W * (cos x1 - cos x2) + (t_upper - t_base) * (pi/2 - x2)) / pi
+
+    which covers the days entirely below the base, between the thresholds or above the
+    cutoff as well as those crossing one or both thresholds.
+
+    Args:
+        t_min (array-like): Daily minimum temperatures.
+        t_max (array-like): Daily maximum temperatures.
+        t_base (array-like): Base temperatures.
+        t_upper (array-like): Upper cutoffs; NaN for no cutoff.
+
+    Returns:
+        np.ndarray: Degree-days per location-day.
+    """
+    t_min = np.asarray(t_min, dtype=float)
+    t_max = np.asarray(t_max, dtype=float)
+    t_upper = _effective_cutoff(t_max, t_base, t_upper)
+    mean = (t_max + t_min) / 2
+    amplitude = (t_max - t_min) / 2
+    # Days without amplitude are constant at their mean; the division is guarded for them.
+    safe_amplitude = np.where(amplitude > 0, amplitude, 1.0)
+    x1 = np.arcsin(np.clip((t_base - mean) / safe_amplitude, -1.0, 1.0))
+    x2 = np.arcsin(np.clip((t_upper - mean) / safe_amplitude, -1.0, 1.0))
+    sine_gdd = (
+        (mean - t_base) * (x2 - x1)
+        + amplitude * (np.cos(x1) - np.cos(x2))
+        + (t_upper - t_base) * (np.pi / 2 - x2)
+    ) / np.pi
+    return np.where(
+        amplitude > 0,
+        np.maximum(0.0, sine_gdd),
+        _degrees_between(mean, t_base, t_upper),
+    )
+
+
+def _triangle_integral(temperature, t_base, t_upper) -> np.ndarray:
+    """Integral of _degrees_between from the base up to a temperature."""
+    below_cutoff = np.clip(temperature, t_base, t_upper) - t_base
+    return below_cutoff**2 / 2 + (t_upper - t_base) * np.maximum(
+        0.0, temperature - t_upper
+    )
+
+
+def single_triangle_gdd(t_min, t_max, t_base, t_upper) -> np.ndarray:
+    """
+    Computes GDD with the single triangle method and a horizontal cutoff.
+
+    A symmetric triangle between t_min and t_max spends equal time at every temperature
+    in between, so the degree-days are the mean of the degrees between base and cutoff
+    over [t_min, t_max]: the difference of their integral at both ends over t_max - t_min.
+
+    Args:
+        t_min (array-like): Daily minimum temperatures.
+        t_max (array-like): Daily maximum temperatures.
+        t_base (array-like): Base temperatures.
+        t_upper (array-like): Upper cutoffs; NaN for no cutoff.
+
+    Returns:
+        np.ndarray: Degree-days per location-day.
+    """
+    t_min = np.asarray(t_min, dtype=float)
+    t_max = np.asarray(t_max, dtype=float)
+    t_base = np.asarray(t_base, dtype=float)
+    t_upper = np.maximum(_effective_cutoff(t_max, t_base, t_upper), t_base)
+    span = t_max - t_min
+    # Days without a span are constant; the division is guarded for them.
+    safe_span = np.where(span > 0, span, 1.0)
+    triangle_gdd = (
+        _triangle_integral(t_max, t_base, t_upper)
+        - _triangle_integral(t_min, t_base, t_upper)
+    ) / safe_span
+    return np.where(span > 0, triangle_gdd, _degrees_between(t_min, t_base, t_upper))
+
+
+def degree_hours_gdd(temperatures, day_index, t_base, t_upper) -> np.ndarray:
+    """
+    Computes GDD from hourly readings: the mean degrees between base and cutoff per day.
+
+    A day with missing hours is averaged over the hours it has.
+
+    Args:
+        temperatures (array-like): Hourly temperatures.
+        day_index (array-like): Location-day (0..n-1) of each reading.
+        t_base (array-like): Base temperature of each reading.
+        t_upper (array-like): Upper cutoff of each reading; NaN for no cutoff.
+
+    Returns:
+        np.ndarray: Degree-days per location-day.
+    """
+    temperatures = np.asarray(temperatures, dtype=float)
+    t_upper = np.asarray(t_upper, dtype=float)
+    t_upper = np.where(np.isnan(t_upper), np.inf, t_upper)
+    degrees = _degrees_between(temperatures, t_base, t_upper)
+    return np.bincount(day_index, weights=degrees) / np.bincount(day_index)
+
+
+def degree_hours_sql(
+    temperature_column: str, t_base_column: str, t_upper_column: str
+) -> str:
+    """
+    Returns the DuckDB aggregate computing degree_hours_gdd over grouped hourly rows.
+
+    Example: AVG(GREATEST(0.0, LEAST(t - b, COALESCE(u - b, CAST('inf' AS DOUBLE)))))
+    for columns t, b and u.
+    """
+    return (
+        f"AVG(GREATEST(0.0, LEAST({temperature_column} - {t_base_column}, "
+        f"COALESCE({t_upper_column} - {t_base_column}, CAST('inf' AS DOUBLE)))))"
+    )
+
+
+def crop_gdd_parameters() -> pd.DataFrame:
+    """
+    Returns the GDD method and thresholds of each crop with a base temperature.
+
+    Methods come from GDD_METHOD_MAP, falling back to GDD_DEFAULT_METHOD, and cutoffs
+    from T_UPPER_MAP (NaN when a crop has none).
+
+    Returns:
+        pd.DataFrame: Columns 'crop_id', 't_base', 't_upper' and 'gdd_method'.
+
+    Raises:
+        ValueError: If a configured method is unknown.
+    """
+    rows = [
+        (
+            crop_id,
+            t_base,
+            app_config.T_UPPER_MAP.get(crop_id, np.nan),
+            app_config.GDD_METHOD_MAP.get(crop_id, app_config.GDD_DEFAULT_METHOD),
+        )
+        for crop_id, t_base in app_config.T_BASE_MAP.items()
+    ]
+    df = pd.DataFrame(rows, columns=["crop_id", "t_base", "t_upper", "gdd_method"])
+    unknown_methods = set(df["gdd_method"]) - set(GDD_METHODS)
+    if unknown_methods:
+        raise ValueError(
+            f"Unknown GDD methods {sorted(unknown_methods)}. Supported methods are {GDD_METHODS}."
+        )
+    return df.astype({"t_base": float, "t_upper": float})
+
+
+def compute_daily_gdd_column(df: pd.DataFrame) -> np.ndarray:
+    """
+    Computes the GDD of each row of daily data with its own method.
+
+    Args:
+        df (pd.DataFrame): Daily rows with 'gdd_method', 't_min_daily', 't_max_daily',
+                           't_base_used', 't_upper_used' and, for rows using
+                           'degree_hours', 'degree_hours_gdd'.
+
+    Returns:
+        np.ndarray: Degree-days per row.
+
+    Raises:
+        ValueError: If a row's method is unknown.
+    """
+    t_min = df["t_min_daily"].to_numpy(dtype=float)
+    t_max = df["t_max_daily"].to_numpy(dtype=float)
+    t_base = df["t_base_used"].to_numpy(dtype=float)
+    t_upper = df["t_upper_used"].to_numpy(dtype=float)
+    methods = df["gdd_method"].to_numpy()
+    gdd = np.full(len(df), np.nan)
+    # Each method runs once, over all rows using it.
+    for method in pd.unique(methods):
+        rows = methods == method
+        if method == "average":
+            gdd[rows] = average_gdd(t_min[rows], t_max[rows], t_base[rows])
+        elif method == "capped":
+            gdd[rows] = capped_gdd(
+                t_min[rows], t_max[rows], t_base[rows], t_upper[rows]
+            )
+        elif method == "single_sine":
+            gdd[rows] = single_sine_gdd(
+                t_min[rows], t_max[rows], t_base[rows], t_upper[rows]
+            )
+        elif method == "single_triangle":
+            gdd[rows] = single_triangle_gdd(
+                t_min[rows], t_max[rows], t_base[rows], t_upper[rows]
+            )
+        elif method == "degree_hours":
+            gdd[rows] = df["degree_hours_gdd"].to_numpy(dtype=float)[rows]
+        else:
+            raise ValueError(
+                f"Unknown GDD method '{method}'. Supported methods are {GDD_METHODS}."
+            )
+    return gdd
@@ -0,0 +1,92 @@
+"""
+Rolls the daily GDD files of a closed month of the silver layer into monthly compacted files.
+
+The compaction itself is shared with the bronze layer (see universal.monthly_compaction);
+this module runs it on the silver layout, where rows are identified by date, crop and
+location.
+
+Usage:
+    python -m gdd_counter.monthly_compaction --month 2025-05
+    python -m gdd_counter.monthly_compaction --month 2025-05 --granularity crop
+"""
+
+import argparse
+import logging
+import sys
+
+try:
+    from universal import config as app_config
+    from universal.compacted_files import COMPACTION_GRANULARITIES, SILVER_ROW_KEY
+    from universal.monthly_compaction import LayerLayout, compact_month, previous_month
+except ImportError:
+    sys.exit(
+        "CRITICAL ERROR: Could not import the monthly compaction from 'universal.monthly_compaction'. "
+        "Please ensure 'gdd-app' is in PYTHONPATH."
+    )
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+# Default number of files read in parallel.
+DEFAULT_CONCURRENCY = 8
+
+
+def compact_silver_month(
+    month_str: str,
+    granularity: str = "location",
+    concurrency: int = DEFAULT_CONCURRENCY,
+    s3_client=None,
+    today=None,
+) -> dict:
+    """
+    Compacts the daily GDD files of one closed month of the silver layer.
+
+    See universal.monthly_compaction.compact_month for the arguments and the result.
+    """
+    layout = LayerLayout(app_config.SILVER_PREFIX, SILVER_ROW_KEY, "date")
+    return compact_month(
+        layout,
+        month_str,
+        granularity=granularity,
+        concurrency=concurrency,
+        s3_client=s3_client,
+        today=today,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Rolls the silver daily GDD files of a closed month into monthly compacted files."
+    )
+    parser.add_argument(
+        "--month",
+        type=str,
+        default=None,
+        help="Optional: Month to compact in YYYY-MM format (default: the previous month).",
+    )
+    parser.add_argument(
+        "--granularity",
+        choices=COMPACTION_GRANULARITIES,
+        default="location",
+        help="Optional: One file per crop and location, or one file per crop (default: location).",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Optional: Number of files read in parallel (default: {DEFAULT_CONCURRENCY}).",
+    )
+    args = parser.parse_args()
+
+    try:
+        result = compact_silver_month(
+            args.month or previous_month(),
+            granularity=args.granularity,
+            concurrency=args.concurrency,
+        )
+    except (OSError, ValueError) as e:
+        logging.error(f"Fatal: {e}. Exiting.")
+        sys.exit(1)
+    if result["failed"]:
+        sys.exit(1)
@@ -7,6 +7,8 @@ import sys
 from datetime import datetime, timedelta, timezone
 import logging
 
+import pandas as pd
+
 try:
     from universal import config as app_config
 except ImportError:
@@ -18,6 +20,7 @@ except ImportError:
 try:
     from .calculator import calculate_daily_gdd, GDCalculationError
     from .writer import save_gdd_silver_data, GDDWriteError
+    from .gold import update_gold_cumulative_gdd, GoldWriteError
 except ImportError as e:
     sys.exit(
         f"CRITICAL ERROR: Could not import modules from 'gdd_counter.calculator' or 'gdd_counter.writer'. "
@@ -29,6 +32,19 @@ except ImportError as e:
     sys.exit(
         f"CRITICAL ERROR: Could not import 'generate_daily_s3_glob_uri' from 'universal.processing_utils'. Original error: {e}"
     )
+try:
+    from universal.s3_utils import get_s3_client
+    from .watermark import (
+        bronze_month_prefixes,
+        find_changed_partitions,
+        list_bronze_files,
+        read_watermark,
+        write_watermark,
+    )
+except ImportError as e:
+    sys.exit(
+        f"CRITICAL ERROR: Could not import the bronze watermark from 'gdd_counter.watermark'. Original error: {e}"
+    )
 
 # Logging configuration.
 logging.basicConfig(
@@ -51,6 +67,33 @@ class GDDProcessingError(Exception):
     pass
 
 
+def _get_data_bucket_name() -> str:
+    """
+    Determines the data bucket name based on the configured storage backend.
+
+    Raises:
+        GDDProcessingError: If the backend is unsupported or its bucket name is not set.
+    """
+    # Determine current data bucket name based on storage backend.
+    current_data_bucket_name = None
+    if app_config.STORAGE_BACKEND == "minio":
+        current_data_bucket_name = app_config.MINIO_DATA_BUCKET_NAME
+    elif app_config.STORAGE_BACKEND == "s3":
+        current_data_bucket_name = app_config.AWS_S3_DATA_BUCKET_NAME
+    else:
+        raise GDDProcessingError(
+            f"Unknown or unsupported STORAGE_BACKEND '{app_config.STORAGE_BACKEND}'. Supported options are 'minio' or 's3'."
+        )  # Ensure the configured backend is valid.
+
+    if not current_data_bucket_name:
+        # This check is important if the config might have a valid backend string
+        # but is missing the corresponding bucket name.
+        raise GDDProcessingError(
+            f"Data bucket name could not be determined for backend '{app_config.STORAGE_BACKEND}'. Ensure it is set in the shared configuration."
+        )
+    return current_data_bucket_name
+
+
 def process_gdd_for_silver_layer(bronze_data_glob_input: str | None = None):
     """
     Processes bronze layer data to calculate GDD and stores it in the silver layer.
@@ -63,6 +106,8 @@ def process_gdd_for_silver_layer(bronze_data_glob_input: str | None = None):
     After identifying the input paths, it calls the `calculate_daily_gdd` function
     to perform the GDD calculations. The resulting DataFrame is then validated before
     being passed to `save_gdd_silver_data` for storage in the silver layer of the data lake.
+    The rows saved to silver are then folded into the season-cumulative GDD series of the
+    gold layer with `update_gold_cumulative_gdd`.
 
     Args:
         bronze_data_glob_input (str | None, optional): A specific S3 glob pattern for bronze
@@ -72,23 +117,7 @@ def process_gdd_for_silver_layer(bronze_data_glob_input: str | None = None):
     bronze_paths_to_process: list[str]
     base_bronze_prefix = app_config.BRONZE_PREFIX
 
-    # Determine current data bucket name based on storage backend.
-    current_data_bucket_name = None
-    if app_config.STORAGE_BACKEND == "minio":
-        current_data_bucket_name = app_config.MINIO_DATA_BUCKET_NAME
-    elif app_config.STORAGE_BACKEND == "s3":
-        current_data_bucket_name = app_config.AWS_S3_DATA_BUCKET_NAME
-    else:
-        raise GDDProcessingError(
-            f"Unknown or unsupported STORAGE_BACKEND '{app_config.STORAGE_BACKEND}'. Supported options are 'minio' or 's3'."
-        )  # Ensure the configured backend is valid.
-
-    if not current_data_bucket_name:
-        # This check is important if the config might have a valid backend string
-        # but is missing the corresponding bucket name.
-        raise GDDProcessingError(
-            f"Data bucket name could not be determined for backend '{app_config.STORAGE_BACKEND}'. Ensure it is set in the shared configuration."
-        )
+    current_data_bucket_name = _get_data_bucket_name()
 
     if bronze_data_glob_input:
         logging.info(
@@ -156,19 +185,134 @@ def process_gdd_for_silver_layer(bronze_data_glob_input: str | None = None):
         # bucket as the bronze layer, but under a different prefix (e.g., "silver/").
         target_bucket_for_silver = current_data_bucket_name
         target_base_prefix = app_config.SILVER_PREFIX
-        save_gdd_silver_data(silver_df, target_bucket_for_silver, target_base_prefix)
+        saved_df = save_gdd_silver_data(
+            silver_df, target_bucket_for_silver, target_base_prefix
+        )
 
         logging.info("Silver layer GDD data processing complete.")
 
+        # Accumulate the newly saved days into the gold layer.
+        update_gold_cumulative_gdd(
+            saved_df, target_bucket_for_silver, app_config.GOLD_PREFIX
+        )
+
     except (
         GDCalculationError,
         GDDWriteError,
+        GoldWriteError,
     ) as e:  # Catch specific custom exceptions.
         # Re-raise caught calculation or write errors as a general processing error,
         # preserving the original exception for context.
         raise GDDProcessingError(f"A step in GDD processing failed: {e}") from e
 
 
+def process_gdd_incrementally(
+    start_date_str: str | None = None,
+    end_date_str: str | None = None,
+    s3_client=None,
+) -> dict[str, int]:
+    """
+    Recomputes the silver partitions whose bronze inputs changed since they were last consumed.
+
+    The bronze files of the date range are listed with their ETags and compared with the
+    watermark of consumed files (see gdd_counter.watermark). GDD is calculated for the dates
+    with changed partitions in a single pass, and exactly the changed (date, crop, location)
+    partitions are overwritten in the silver layer, so a day first computed from a partial
+    forecast is corrected once its bronze data is complete. The rewritten days are folded
+    into the gold cumulative GDD series. The watermark is only advanced after the silver
+    and gold files are written, so a failed run is retried by the next one.
+
+    Args:
+        start_date_str (str | None): First date ('YYYY-MM-DD') to consider, or None for the
+                                     whole history.
+        end_date_str (str | None): Last date ('YYYY-MM-DD') to consider, or None for the
+                                   whole history.
+        s3_client: Optional S3 client. Defaults to the shared client of the configured backend.
+
+    Returns:
+        dict[str, int]: Counts of the changed partitions and of the silver files saved.
+
+    Raises:
+        GDDProcessingError: If the GDD calculation or the silver write fails.
+    """
+    current_data_bucket_name = _get_data_bucket_name()
+    s3_client = s3_client or get_s3_client()
+    listed_prefixes = bronze_month_prefixes(
+        app_config.BRONZE_PREFIX, start_date_str, end_date_str
+    )
+    df_bronze_files = list_bronze_files(
+        s3_client, current_data_bucket_name, listed_prefixes
+    )
+    df_watermark = read_watermark(
+        s3_client, current_data_bucket_name, app_config.SILVER_PREFIX
+    )
+    df_changed = find_changed_partitions(
+        df_bronze_files, df_watermark, start_date_str, end_date_str
+    )
+    logging.info(
+        f"Incremental GDD processing: {len(df_changed)} of "
+        f"{len(df_bronze_files[['date', 'crop_id', 'location_id']].drop_duplicates())} "
+        "bronze partitions changed since the last run."
+    )
+    if df_changed.empty:
+        return {"partitions": 0, "saved": 0}
+
+    changed_dates = sorted(df_changed["date"].unique())
+    bronze_paths_to_process = [
+        generate_daily_s3_glob_uri(
+            bucket_name=current_data_bucket_name,
+            layer_prefix=app_config.BRONZE_PREFIX,
+            target_date=datetime.strptime(date_str, "%Y-%m-%d"),
+        )
+        for date_str in changed_dates
+    ]
+    try:
+        silver_df = calculate_daily_gdd(bronze_paths_to_process)
+        if not silver_df.empty:
+            # Unchanged partitions of the same dates are read along, but not rewritten.
+            partitions = pd.MultiIndex.from_arrays(
+                [
+                    silver_df["date"].dt.strftime("%Y-%m-%d"),
+                    silver_df["crop_id"],
+                    silver_df["location_id"],
+                ]
+            )
+            silver_df = silver_df[
+                partitions.isin(pd.MultiIndex.from_frame(df_changed))
+            ].reset_index(drop=True)
+        if silver_df.empty:
+            logging.warning(
+                "No GDD data calculated for the changed bronze partitions. Nothing to save."
+            )
+        else:
+            saved_df = save_gdd_silver_data(
+                silver_df,
+                current_data_bucket_name,
+                app_config.SILVER_PREFIX,
+                overwrite=True,
+                s3_client=s3_client,
+            )
+            update_gold_cumulative_gdd(
+                saved_df,
+                current_data_bucket_name,
+                app_config.GOLD_PREFIX,
+                s3_client=s3_client,
+            )
+    except (GDCalculationError, GDDWriteError, GoldWriteError) as e:
+        raise GDDProcessingError(f"A step in GDD processing failed: {e}") from e
+
+    write_watermark(
+        s3_client,
+        current_data_bucket_name,
+        app_config.SILVER_PREFIX,
+        df_watermark,
+        df_bronze_files,
+        start_date_str,
+        end_date_str,
+    )
+    return {"partitions": len(df_changed), "saved": len(silver_df)}
+
+
 # The `if __name__ == "__main__":` block allows this script to be run directly.
 
 if __name__ == "__main__":
@@ -185,10 +329,34 @@ if __name__ == "__main__":
         help="Optional: Glob pattern for bronze layer Parquet files (e.g., 'bronze/weather_data/year=2025/*/*/*.parquet'). "
         "If not provided, processes data for the last 2 days, starting from today.",
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Recompute only the silver partitions whose bronze files changed since the last incremental run.",
+    )
+    parser.add_argument(
+        "--start-date",
+        type=str,
+        default=None,
+        help="With --incremental: first date (YYYY-MM-DD) to consider. Defaults to the whole history.",
+    )
+    parser.add_argument(
+        "--end-date",
+        type=str,
+        default=None,
+        help="With --incremental: last date (YYYY-MM-DD) to consider. Defaults to the whole history.",
+    )
     args = parser.parse_args()
+    if args.incremental and args.bronze_data_glob_input:
+        parser.error("A bronze glob cannot be combined with --incremental.")
+    if (args.start_date or args.end_date) and not args.incremental:
+        parser.error("--start-date and --end-date require --incremental.")
 
     try:
-        process_gdd_for_silver_layer(args.bronze_data_glob_input)
+        if args.incremental:
+            process_gdd_incrementally(args.start_date, args.end_date)
+        else:
+            process_gdd_for_silver_layer(args.bronze_data_glob_input)
         logging.info("GDD Counter script finished successfully.")
     except GDDProcessingError as e:
         logging.error(f"ERROR in GDD Counter script: {e}")
@@ -0,0 +1,232 @@
+"""
+Bronze change detection for incremental processing of the silver layer.
+
+The watermark records the bronze files already consumed by the silver layer, with
+the ETag and last-modified time they had when they were read:
+
+    silver/_watermarks/bronze_consumed.parquet
+
+Comparing a listing of bronze against it finds the (date, crop, location)
+partitions whose inputs were written or rewritten since, so that only those are
+recomputed. Bronze files that disappeared are not changes: compaction deletes day
+files and deltas after copying their rows, and silver is never computed from the
+absence of data. Compacted month files are skipped for the same reason; rows
+written after a compaction land in new day or delta files.
+"""
+
+import io
+import logging
+import re
+import sys
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+try:
+    from universal.s3_utils import get_s3_parquet_to_df_if_exists
+except ImportError:
+    sys.exit(
+        "CRITICAL ERROR: Could not import 'get_s3_parquet_to_df_if_exists' from 'universal.s3_utils'."
+    )
+
+logger = logging.getLogger(__name__)
+
+WATERMARK_SCHEMA = pa.schema(
+    [
+        ("key", pa.string()),
+        ("etag", pa.string()),
+        ("last_modified", pa.timestamp("us", tz="UTC")),
+    ]
+)
+
+# Day partitions and their deltas ('data_<date>.parquet', 'delta_<date>_<suffix>.parquet').
+_BRONZE_FILE_PATTERN = re.compile(
+    r"/crop_id=(?P<crop_id>[^/]+)/location_id=(?P<location_id>[^/]+)"
+    r"/(?:data|delta)_(?P<day>\d{4}-\d{2}-\d{2})(?:_[^/]*)?\.parquet$"
+)
+
+
+def generate_watermark_s3_key(silver_prefix: str) -> str:
+    """
+    Generates the S3 key of the watermark of the bronze files consumed by the silver layer.
+    Example: silver/_watermarks/bronze_consumed.parquet
+    """
+    return f"{silver_prefix}/_watermarks/bronze_consumed.parquet"
+
+
+def bronze_month_prefixes(
+    bronze_prefix: str, start_date_str: str | None, end_date_str: str | None
+) -> list[str]:
+    """
+    Returns the bronze prefixes to list for a date range.
+
+    Args:
+        bronze_prefix (str): Base S3 prefix of the bronze layer.
+        start_date_str (str | None): First date ('YYYY-MM-DD'), or None for no lower bound.
+        end_date_str (str | None): Last date ('YYYY-MM-DD'), or None for no upper bound.
+
+    Returns:
+        list[str]: One prefix per month of a bounded range, or the whole layer otherwise.
+    """
+    if start_date_str is None or end_date_str is None:
+        return [f"{bronze_prefix}/year="]
+    return [
+        f"{bronze_prefix}/year={month.year}/month={month.month:02d}/"
+        for month in pd.period_range(start_date_str, end_date_str, freq="M")
+    ]
+
+
+def list_bronze_files(s3_client, bucket_name: str, prefixes: list[str]) -> pd.DataFrame:
+    """
+    Lists the bronze day partition and delta files under some prefixes with their versions.
+
+    Args:
+        s3_client: Initialized Boto3 S3 client.
+        bucket_name (str): Name of the S3 bucket.
+        prefixes (list[str]): Prefixes to list (see bronze_month_prefixes).
+
+    Returns:
+        pd.DataFrame: One row per file, with the columns of WATERMARK_SCHEMA and the
+                      'date', 'crop_id' and 'location_id' of its partition.
+    """
+    rows = []
+    for prefix in prefixes:
+        request = {"Bucket": bucket_name, "Prefix": prefix}
+        while True:
+            response = s3_client.list_objects_v2(**request)
+            for obj in response.get("Contents", []):
+                match = _BRONZE_FILE_PATTERN.search(obj["Key"])
+                if match is not None:
+                    rows.append(
+                        (
+                            obj["Key"],
+                            obj.get("ETag"),
+                            obj.get("LastModified"),
+                            match["day"],
+                            match["crop_id"],
+                            match["location_id"],
+                        )
+                    )
+            if not response.get("IsTruncated"):
+                break
+            request["ContinuationToken"] = response["NextContinuationToken"]
+    df = pd.DataFrame(
+        rows, columns=WATERMARK_SCHEMA.names + ["date", "crop_id", "location_id"]
+    )
+    df["last_modified"] = pd.to_datetime(df["last_modified"], utc=True)
+    return df
+
+
+def read_watermark(s3_client, bucket_name: str, silver_prefix: str) -> pd.DataFrame:
+    """
+    Reads the watermark of the bronze files consumed by the silver layer.
+
+    Returns:
+        pd.DataFrame: One row per consumed file, with the columns of WATERMARK_SCHEMA.
+                      Empty if no watermark was written yet.
+    """
+    df = get_s3_parquet_to_df_if_exists(
+        s3_client, bucket_name, generate_watermark_s3_key(silver_prefix)
+    )
+    if df is None:
+        return WATERMARK_SCHEMA.empty_table().to_pandas()
+    return df
+
+
+def _in_date_range(
+    dates: pd.Series, start_date_str: str | None, end_date_str: str | None
+) -> pd.Series:
+    """Flags the 'YYYY-MM-DD' dates within a range whose missing bounds are open."""
+    in_range = pd.Series(True, index=dates.index)
+    if start_date_str is not None:
+        in_range &= dates >= start_date_str
+    if end_date_str is not None:
+        in_range &= dates <= end_date_str
+    return in_range
+
+
+def find_changed_partitions(
+    df_bronze_files: pd.DataFrame,
+    df_watermark: pd.DataFrame,
+    start_date_str: str | None = None,
+    end_date_str: str | None = None,
+) -> pd.DataFrame:
+    """
+    Finds the partitions with bronze files that are new or changed since the watermark.
+
+    Args:
+        df_bronze_files (pd.DataFrame): Current bronze files (see list_bronze_files).
+        df_watermark (pd.DataFrame): Consumed bronze files (see read_watermark).
+
+        start_date_str (str | None): First date to consider, or None for no lower bound.
+        end_date_str (str | None): Last date to consider, or None for no upper bound.
+
+    Returns:
+        pd.DataFrame: The distinct 'date', 'crop_id' and 'location_id' of the changed
+                      partitions, sorted.
+    """
+    consumed_etags = df_watermark.set_index("key")["etag"]
+    is_changed = df_bronze_files["etag"].ne(df_bronze_files["key"].map(consumed_etags))
+    is_changed &= _in_date_range(df_bronze_files["date"], start_date_str, end_date_str)
+    return (
+        df_bronze_files.loc[is_changed, ["date", "crop_id", "location_id"]]
+        .drop_duplicates()
+        .sort_values(by=["date", "crop_id", "location_id"])
+        .reset_index(drop=True)
+    )
+
+
+def write_watermark(
+    s3_client,
+    bucket_name: str,
+    silver_prefix: str,
+    df_watermark: pd.DataFrame,
+    df_bronze_files: pd.DataFrame,
+    start_date_str: str | None = None,
+    end_date_str: str | None = None,
+):
+    """
+    Records the listed bronze files of a date range as consumed.
+
+    Entries of the range are replaced by the listing, so files deleted since the
+    previous run drop out; entries of other dates are kept.
+
+    Args:
+        s3_client: Initialized Boto3 S3 client.
+        bucket_name (str): Name of the S3 bucket.
+        silver_prefix (str): Base S3 prefix of the silver layer.
+        df_watermark (pd.DataFrame): Watermark read before the run.
+        df_bronze_files (pd.DataFrame): Bronze files listed by the run.
+        start_date_str (str | None): First date processed, or None for no lower bound.
+        end_date_str (str | None): Last date processed, or None for no upper bound.
+    """
+    watermark_dates = df_watermark["key"].str.extract(_BRONZE_FILE_PATTERN)["day"]
+    frames = [
+        df[WATERMARK_SCHEMA.names]
+        for df in (
+            df_watermark[
+                ~_in_date_range(watermark_dates, start_date_str, end_date_str)
+            ],
+            df_bronze_files[
+                _in_date_range(df_bronze_files["date"], start_date_str, end_date_str)
+            ],
+        )
+        if not df.empty
+    ]
+    df_updated = (
+        pd.concat(frames, ignore_index=True)
+        if frames
+        else WATERMARK_SCHEMA.empty_table().to_pandas()
+    ).sort_values(by="key")
+    buffer = io.BytesIO()
+    pq.write_table(
+        pa.Table.from_pandas(df_updated, schema=WATERMARK_SCHEMA, preserve_index=False),
+        buffer,
+        compression="zstd",
+    )
+    watermark_key = generate_watermark_s3_key(silver_prefix)
+    s3_client.put_object(Bucket=bucket_name, Key=watermark_key, Body=buffer.getvalue())
+    logger.info(
+        f"Recorded {len(df_updated)} consumed bronze files in s3://{bucket_name}/{watermark_key}."
+    )
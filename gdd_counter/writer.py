@@ -25,11 +25,26 @@ except ImportError:
         "Ensure the file exists and 'gdd-app' is in PYTHONPATH."
     )
 try:
-    from universal.processing_utils import generate_partitioned_s3_key
+    from universal.processing_utils import (
+        compute_content_hash,
+        generate_partitioned_s3_key,
+    )
 except ImportError:
     sys.exit(
         "CRITICAL ERROR: Could not import 'generate_partitioned_s3_key' from 'universal.processing_utils'."
     )
+try:
+    from universal.parquet_profile import get_parquet_profile, parquet_bytes
+except ImportError:
+    sys.exit(
+        "CRITICAL ERROR: Could not import 'parquet_bytes' from 'universal.parquet_profile'."
+    )
+try:
+    from universal.manifest import build_manifest_entry, update_manifests
+except ImportError:
+    sys.exit(
+        "CRITICAL ERROR: Could not import the manifest writer from 'universal.manifest'."
+    )
 
 logger = logging.getLogger(__name__)
 
@@ -44,8 +59,12 @@ class GDDWriteError(Exception):
 
 
 def save_gdd_silver_data(
-    silver_df: pd.DataFrame, target_bucket: str, target_base_prefix: str
-):
+    silver_df: pd.DataFrame,
+    target_bucket: str,
+    target_base_prefix: str,
+    overwrite: bool = False,
+    s3_client=None,
+) -> pd.DataFrame:
     """
     Saves the processed GDD DataFrame to the silver layer in S3/MinIO,
     partitioning by year, month, crop_id, and location_id. Each unique combination
@@ -53,8 +72,9 @@ def save_gdd_silver_data(
 
     The function iterates through each row of the input DataFrame, constructs a
     partitioned S3 key, and saves the individual record as a Parquet file.
-    It checks if an object with the same key already exists to prevent overwriting,
-    logging a skip message if it does.
+    Unless overwrite is set, it checks if an object with the same key already exists to
+    prevent overwriting, logging a skip message if it does. The files written are recorded in the silver
+    manifests of their months (see universal.manifest).
 
     Args:
         silver_df (pd.DataFrame): The DataFrame containing the calculated GDD data.
@@ -64,6 +84,12 @@ def save_gdd_silver_data(
         target_bucket (str): The name of the S3 or MinIO bucket where data will be saved.
         target_base_prefix (str): The base prefix within the target bucket under which
                                     the partitioned data will be stored.
+        overwrite (bool): Replace existing files instead of skipping them, e.g. when their
+                          bronze inputs changed.
+        s3_client: Optional S3 client. Defaults to the shared client of the configured backend.
+
+    Returns:
+        pd.DataFrame: The rows that were saved, without the ones skipped.
 
     Raises:
         GDDWriteError: If any error occurs during the S3 upload process for any record.
@@ -82,14 +108,17 @@ def save_gdd_silver_data(
     )  # Format date as YYYY-MM-DD string for filename.
 
     s3_client = (
-        get_s3_client()
+        s3_client or get_s3_client()
     )  # Obtain an S3 client configured for the target storage backend.
     successful_saves = 0
+    saved_index = []
     skipped_saves = 0
+    manifest_entries = []
+    profile = get_parquet_profile()
 
     # Iterate over each row in the DataFrame to save it as an individual Parquet file.
     # This approach creates one file per (date, crop_id, location_id) combination.
-    for _, row_data in silver_df.iterrows():
+    for index, row_data in silver_df.iterrows():
         # Extract values needed for constructing the S3 key and partitioning.
         year_val = row_data["year_for_path"]
         month_val = row_data["month_for_path"]
@@ -113,31 +142,48 @@ def save_gdd_silver_data(
             crop_id=crop_val,
             location_id=loc_val,
         )
-        if s3_object_exists(s3_client, target_bucket, s3_key):
+        if not overwrite and s3_object_exists(s3_client, target_bucket, s3_key):
             logger.debug(
                 f"Skipping save: Silver data file s3://{target_bucket}/{s3_key} already exists."
             )
             skipped_saves += 1
             continue
 
-        # Serialize the single-record DataFrame to a Parquet format in an in-memory buffer.
-        parquet_buffer = io.BytesIO()
-        record_to_save_df.to_parquet(parquet_buffer, index=False, engine="pyarrow")
-        parquet_buffer.seek(
-            0
-        )  # Reset buffer's position to the beginning for reading by put_object.
+        # Serialize the single-record DataFrame to Parquet with the configured PARQUET_PROFILE
+        # in an in-memory buffer.
+        parquet_buffer = io.BytesIO(parquet_bytes(record_to_save_df, profile))
 
         try:
             # Upload the Parquet data from the buffer to S3/MinIO.
             s3_client.put_object(Bucket=target_bucket, Key=s3_key, Body=parquet_buffer)
             successful_saves += 1
         except Exception as e:
-            # If any S3 upload fails, wrap the error in GDDWriteError and re-raise.
+            # If any S3 upload fails, record the files already saved, then wrap the error
+            # in GDDWriteError and re-raise.
+            update_manifests(
+                s3_client, target_bucket, target_base_prefix, manifest_entries
+            )
             raise GDDWriteError(
                 f"Failed to upload {s3_key} to {target_bucket}: {e}"
             ) from e  # Preserve the original exception.
+        saved_index.append(index)
+        manifest_entries.append(
+            build_manifest_entry(
+                date_str_val,
+                crop_val,
+                loc_val,
+                s3_key,
+                record_to_save_df,
+                "date",
+                compute_content_hash(record_to_save_df, profile),
+            )
+        )
 
+    update_manifests(s3_client, target_bucket, target_base_prefix, manifest_entries)
     logger.info(
         f"Successfully saved {successful_saves} GDD files to {app_config.STORAGE_BACKEND}. "
         f"Skipped {skipped_saves} files that already existed."
     )
+    return silver_df.loc[saved_index].drop(
+        columns=["year_for_path", "month_for_path", "date_for_filename"]
+    )
@@ -0,0 +1,242 @@
+"""
+Offline throughput benchmark for the data fetcher.
+
+Starts the local mock met.no server (scripts/mock_met_server.py), generates a
+location registry with N distinct grid points, and runs run_data_fetcher
+against an in-memory S3 client. Reports wall time, throughput, per-location
+latency percentiles, API status codes and the number of S3 calls per operation.
+
+Usage:
+    python -m scripts.benchmark_fetcher --locations 500 --concurrency 16 --latency-ms 80
+"""
+
+import argparse
+import io
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+from botocore.exceptions import ClientError
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.mock_met_server import MockMetServer  # noqa: E402
+
+
+class InMemoryS3Client:
+    """
+    Minimal thread-safe stand-in for the boto3 S3 client operations used by the fetcher.
+
+    Objects are kept in a dict and every call is counted per operation.
+    """
+
+    def __init__(self):
+        self.objects: dict[tuple[str, str], bytes] = {}
+        self.calls: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def _count(self, operation: str):
+        with self._lock:
+            self.calls[operation] += 1
+
+    @staticmethod
+    def _not_found(operation: str, code: str = "404") -> ClientError:
+        return ClientError(
+            {
+                "Error": {"Code": code, "Message": "Not Found"},
+                "ResponseMetadata": {"HTTPStatusCode": 404},
+            },
+            operation,
+        )
+
+    def head_object(self, Bucket: str, Key: str, **kwargs) -> dict:
+        self._count("head_object")
+        body = self.objects.get((Bucket, Key))
+        if body is None:
+            raise self._not_found("HeadObject")
+        return {"ContentLength": len(body)}
+
+    def get_object(self, Bucket: str, Key: str, **kwargs) -> dict:
+        self._count("get_object")
+        body = self.objects.get((Bucket, Key))
+        if body is None:
+            raise self._not_found("GetObject", "NoSuchKey")
+        return {"Body": io.BytesIO(body), "ContentLength": len(body)}
+
+    def put_object(self, Bucket: str, Key: str, Body, **kwargs) -> dict:
+        self._count("put_object")
+        data = Body if isinstance(Body, bytes) else Body.read()
+        with self._lock:
+            self.objects[(Bucket, Key)] = data
+        return {}
+
+    def upload_fileobj(self, Fileobj, Bucket: str, Key: str, **kwargs):
+        self._count("upload_fileobj")
+        data = Fileobj.read()
+        with self._lock:
+            self.objects[(Bucket, Key)] = data
+
+    def list_objects_v2(self, Bucket: str, Prefix: str = "", **kwargs) -> dict:
+        self._count("list_objects_v2")
+        keys = sorted(
+            key
+            for bucket, key in self.objects
+            if bucket == Bucket and key.startswith(Prefix)
+        )
+        return {
+            "Contents": [
+                {"Key": key, "Size": len(self.objects[(Bucket, key)])} for key in keys
+            ],
+            "KeyCount": len(keys),
+            "IsTruncated": False,
+        }
+
+
+def write_registry(path: str, num_locations: int):
+    """Writes a registry with num_locations distinct grid points, alternating crops."""
+    with open(path, "w", encoding="utf-8") as registry_file:
+        registry_file.write("crop_id,location_id,lat,lon\n")
+        for i in range(num_locations):
+            crop_id = "maize" if i % 2 == 0 else "sorghum"
+            lat = -30.0 + (i // 100) * 0.25
+            lon = 10.0 + (i % 100) * 0.25
+            registry_file.write(f"{crop_id},loc{i:05d},{lat:.4f},{lon:.4f}\n")
+
+
+def run_benchmark(args) -> dict:
+    """
+    Runs the fetcher against the mock server args.runs times and returns the measurements.
+
+    Configuration is passed through environment variables, so it is set before the
+    fetcher modules are imported.
+    """
+    mock_server = MockMetServer(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        expires_seconds=args.expires_seconds,
+        payload_path=args.payload,
+    ).start()
+    work_dir = tempfile.mkdtemp(prefix="fetcher-benchmark-")
+    registry_path = os.path.join(work_dir, "locations.csv")
+    write_registry(registry_path, args.locations)
+
+    os.environ["MET_API_URL"] = mock_server.url
+    os.environ["MET_API_MAX_REQUESTS_PER_SECOND"] = str(args.rate)
+    os.environ["FETCH_CONCURRENCY"] = str(args.concurrency)
+    os.environ["FORECAST_CACHE_DIR"] = (
+        os.path.join(work_dir, "forecast") if args.use_cache else ""
+    )
+    os.environ["FETCHER_STATE_DIR"] = os.path.join(work_dir, "state")
+    # Storage is replaced by the in-memory client; the bucket name only appears in keys and logs.
+    os.environ["STORAGE_BACKEND"] = "minio"
+    os.environ["MINIO_DATA_BUCKET_NAME"] = "benchmark"
+
+    from data_fetcher.main import run_data_fetcher
+    from data_fetcher.http_client import get_fetch_stats
+
+    logging.getLogger().setLevel(logging.INFO if args.verbose else logging.WARNING)
+
+    s3_client = InMemoryS3Client()
+    started = time.perf_counter()
+    try:
+        for _ in range(args.runs):
+            run_data_fetcher(
+                target_date_str=args.date,
+                concurrency=args.concurrency,
+                use_cache=args.use_cache,
+                registry_path=registry_path,
+                s3_client=s3_client,
+            )
+    finally:
+        mock_server.stop()
+    wall_seconds = time.perf_counter() - started
+
+    # Fetch counters are reset by every run, so they describe the last run.
+    stats = get_fetch_stats().snapshot()
+    return {
+        "wall_seconds": wall_seconds,
+        "stats": stats,
+        "server_status_counts": dict(mock_server.request_counts),
+        "s3_calls": dict(s3_client.calls),
+        "objects": len(s3_client.objects),
+    }
+
+
+def print_report(args, result: dict):
+    """Prints the benchmark measurements."""
+    stats = result["stats"]
+    wall_seconds = result["wall_seconds"]
+    total_fetches = args.locations * args.runs
+    s3_calls = result["s3_calls"]
+    print(
+        f"Locations: {args.locations}, runs: {args.runs}, concurrency: {args.concurrency}, "
+        f"rate limit: {args.rate}/s, latency: {args.latency_ms}+{args.jitter_ms}ms, "
+        f"error rate: {args.error_rate}"
+    )
+    print(f"Wall time: {wall_seconds:.2f}s")
+    print(f"Throughput: {total_fetches / wall_seconds:.1f} locations/s")
+    print(
+        f"Per-location latency (last run): p50={(stats['fetch_seconds_p50'] or 0) * 1000:.1f}ms "
+        f"p99={(stats['fetch_seconds_p99'] or 0) * 1000:.1f}ms"
+    )
+    print(
+        f"API requests (last run): {stats['requests']}, retries: {stats['retries']}, "
+        f"cache hits: {stats['cache_hits']}, status codes: {stats['status_counts']}"
+    )
+    print(f"Mock server responses (all runs): {result['server_status_counts']}")
+    print(
+        f"S3 calls (all runs): {sum(s3_calls.values())} {dict(sorted(s3_calls.items()))}"
+    )
+    print(f"S3 objects written: {result['objects']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmarks run_data_fetcher offline against a mock met.no server and in-memory S3."
+    )
+    parser.add_argument(
+        "--locations", type=int, default=100, help="Number of distinct grid points."
+    )
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=1000.0,
+        help="API request rate limit per second used by the fetcher.",
+    )
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--expires-seconds", type=int, default=1800)
+    parser.add_argument(
+        "--payload",
+        type=str,
+        default=None,
+        help="Recorded locationforecast JSON to replay instead of synthetic documents.",
+    )
+    parser.add_argument(
+        "--date",
+        type=str,
+        default=None,
+        help="Date to process (YYYY-MM-DD). Defaults to today and, if incomplete, yesterday.",
+    )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=1,
+        help="Number of consecutive runs against the same storage and cache.",
+    )
+    parser.add_argument(
+        "--use-cache",
+        action="store_true",
+        help="Use a fresh forecast cache directory shared by the runs.",
+    )
+    parser.add_argument("--verbose", action="store_true", help="Log fetcher output.")
+    cli_args = parser.parse_args()
+
+    print_report(cli_args, run_benchmark(cli_args))
@@ -0,0 +1,115 @@
+"""
+Benchmark of the GDD methods.
+
+Computes the GDD of N synthetic location-days with every method of
+gdd_counter.methods in one batched call: the daily methods on arrays of daily
+minimum and maximum temperatures, and degree-hours on 24 hourly readings per
+location-day, both with the NumPy kernel and with the DuckDB aggregate used by the
+GDD calculation. Reports time and throughput per method.
+
+Usage:
+    python -m scripts.benchmark_gdd_methods --location-days 1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gdd_counter.methods import (  # noqa: E402
+    average_gdd,
+    capped_gdd,
+    degree_hours_gdd,
+    degree_hours_sql,
+    single_sine_gdd,
+    single_triangle_gdd,
+)
+
+T_BASE = 10.0
+T_UPPER = 30.0
+
+
+def make_hourly_readings(num_location_days: int) -> pd.DataFrame:
+    """Builds 24 hourly readings per location-day following a noisy daily cycle."""
+    rng = np.random.default_rng(0)
+    daily_mean = rng.uniform(5, 30, num_location_days)
+    daily_amplitude = rng.uniform(2, 10, num_location_days)
+    hours = np.arange(24)
+    temperatures = (
+        daily_mean[:, None]
+        + daily_amplitude[:, None] * np.sin(2 * np.pi * (hours - 9) / 24)
+        + rng.normal(0, 0.5, (num_location_days, 24))
+    )
+    return pd.DataFrame(
+        {
+            "day_index": np.repeat(np.arange(num_location_days), 24),
+            "air_temperature": temperatures.ravel(),
+            "t_base": T_BASE,
+            "t_upper": T_UPPER,
+        }
+    )
+
+
+def timed(label: str, num_location_days: int, function):
+    started = time.perf_counter()
+    function()
+    seconds = time.perf_counter() - started
+    print(
+        f"{label:<34} {seconds * 1000:9.1f}ms  "
+        f"{num_location_days / seconds / 1e6:8.2f}M location-days/s"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks the GDD methods.")
+    parser.add_argument("--location-days", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    readings = make_hourly_readings(args.location_days)
+    daily = readings.groupby("day_index")["air_temperature"].agg(["min", "max"])
+    t_min = daily["min"].to_numpy()
+    t_max = daily["max"].to_numpy()
+
+    print(f"Computing GDD for {args.location_days} location-days:")
+    timed("average", args.location_days, lambda: average_gdd(t_min, t_max, T_BASE))
+    timed(
+        "capped",
+        args.location_days,
+        lambda: capped_gdd(t_min, t_max, T_BASE, T_UPPER),
+    )
+    timed(
+        "single_sine",
+        args.location_days,
+        lambda: single_sine_gdd(t_min, t_max, T_BASE, T_UPPER),
+    )
+    timed(
+        "single_triangle",
+        args.location_days,
+        lambda: single_triangle_gdd(t_min, t_max, T_BASE, T_UPPER),
+    )
+    timed(
+        "degree_hours (NumPy, 24 h/day)",
+        args.location_days,
+        lambda: degree_hours_gdd(
+            readings["air_temperature"].to_numpy(),
+            readings["day_index"].to_numpy(),
+            T_BASE,
+            T_UPPER,
+        ),
+    )
+    con = duckdb.connect()
+    con.register("readings", readings)
+    timed(
+        "degree_hours (DuckDB, 24 h/day)",
+        args.location_days,
+        lambda: con.execute(
+            f"SELECT day_index, {degree_hours_sql('air_temperature', 't_base', 't_upper')} "
+            "FROM readings GROUP BY day_index;"
+        ).fetchnumpy(),
+    )
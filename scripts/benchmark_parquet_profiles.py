@@ -0,0 +1,156 @@
+"""
+Benchmark of the Parquet write profiles (universal/parquet_profile.py).
+
+Writes the same realistic data with every profile and reports file size, write
+time, full read time and the time of a read filtered on one location (which
+benefits from sorted data and row-group statistics). Three datasets are used:
+a single bronze partition (24 hourly rows), a month of bronze data for N
+locations in one file, as the monthly compaction produces, and a month of
+silver GDD rows.
+
+Usage:
+    python -m scripts.benchmark_parquet_profiles --locations 200 --repeat 5
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from universal.parquet_profile import PARQUET_PROFILES, parquet_bytes  # noqa: E402
+
+MONTH_START = pd.Timestamp("2025-05-01", tz="UTC")
+
+
+def bronze_rows(num_locations: int, num_days: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Builds hourly forecast rows shaped like the bronze layer, in fetch order.
+
+    Values have one decimal, like api.met.no, with a daily temperature cycle.
+    """
+    rng = np.random.default_rng(seed)
+    timestamps = pd.date_range(MONTH_START, periods=num_days * 24, freq="h")
+    hours = timestamps.hour.to_numpy()
+    frames = []
+    for location in range(num_locations):
+        base = rng.uniform(15.0, 30.0)
+        n = len(timestamps)
+        frames.append(
+            pd.DataFrame(
+                {
+                    "timestamp": timestamps,
+                    "air_pressure_at_sea_level": np.round(
+                        rng.uniform(1000.0, 1020.0, n), 1
+                    ),
+                    "air_temperature": np.round(
+                        base
+                        + 6.0 * (1 - np.abs(hours - 14) / 12)
+                        + rng.uniform(-1, 1, n),
+                        1,
+                    ),
+                    "cloud_area_fraction": np.round(rng.uniform(0.0, 100.0, n), 1),
+                    "relative_humidity": np.round(rng.uniform(30.0, 90.0, n), 1),
+                    "wind_from_direction": np.round(rng.uniform(0.0, 360.0, n), 1),
+                    "wind_speed": np.round(rng.uniform(0.0, 8.0, n), 1),
+                    "location_id": f"loc{location:05d}",
+                    "crop_id": "maize" if location % 2 == 0 else "sorghum",
+                }
+            )
+        )
+    # Rows arrive grouped by fetch, not by location; shuffle days to mimic appended deltas.
+    combined = pd.concat(frames, ignore_index=True)
+    return combined.sample(frac=1.0, random_state=seed).reset_index(drop=True)
+
+
+def silver_rows(bronze: pd.DataFrame) -> pd.DataFrame:
+    """Aggregates bronze rows into daily GDD rows shaped like the silver layer."""
+    daily = (
+        bronze.assign(date=bronze["timestamp"].dt.date)
+        .groupby(["date", "crop_id", "location_id"], as_index=False)["air_temperature"]
+        .agg(t_min_daily="min", t_max_daily="max")
+    )
+    daily["t_avg_daily"] = (daily["t_min_daily"] + daily["t_max_daily"]) / 2
+    daily["t_base_used"] = 10.0
+    daily["daily_gdd"] = (daily["t_avg_daily"] - 10.0).clip(lower=0.0)
+    return daily
+
+
+def measure(df: pd.DataFrame, profile, repeat: int, filter_location: str) -> dict:
+    """Writes and reads df repeat times with a profile and returns the median timings."""
+    write_times, read_times, filtered_times = [], [], []
+    data = b""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        data = parquet_bytes(df, profile)
+        write_times.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        pq.read_table(pa.BufferReader(data)).to_pandas()
+        read_times.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        pq.read_table(
+            pa.BufferReader(data), filters=[("location_id", "=", filter_location)]
+        ).to_pandas()
+        filtered_times.append(time.perf_counter() - started)
+    metadata = pq.ParquetFile(pa.BufferReader(data)).metadata
+    return {
+        "bytes": len(data),
+        "row_groups": metadata.num_row_groups,
+        "write_ms": float(np.median(write_times)) * 1000,
+        "read_ms": float(np.median(read_times)) * 1000,
+        "filtered_read_ms": float(np.median(filtered_times)) * 1000,
+    }
+
+
+def print_results(label: str, df: pd.DataFrame, repeat: int):
+    print(
+        f"\n{label}: {len(df)} rows, {df.memory_usage(deep=True).sum() / 1e6:.1f} MB in memory"
+    )
+    print(
+        f"  {'profile':<10} {'size':>10} {'vs default':>11} {'row groups':>11} "
+        f"{'write':>10} {'read':>10} {'read 1 loc':>11}"
+    )
+    filter_location = df["location_id"].iloc[0]
+    baseline = None
+    for name, profile in PARQUET_PROFILES.items():
+        result = measure(df, profile, repeat, filter_location)
+        baseline = baseline or result["bytes"]
+        print(
+            f"  {name:<10} {result['bytes'] / 1024:>8.1f}KB {result['bytes'] / baseline:>10.2f}x "
+            f"{result['row_groups']:>11} {result['write_ms']:>8.2f}ms {result['read_ms']:>8.2f}ms "
+            f"{result['filtered_read_ms']:>9.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compares file size, write time and read time of the Parquet write profiles."
+    )
+    parser.add_argument(
+        "--locations", type=int, default=200, help="Locations in the monthly files."
+    )
+    parser.add_argument(
+        "--days", type=int, default=31, help="Days in the monthly files."
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Repetitions; medians are reported."
+    )
+    args = parser.parse_args()
+
+    month = bronze_rows(args.locations, args.days)
+    partition = bronze_rows(1, 1, seed=1).sort_values("timestamp")
+    print_results("Bronze partition (1 location, 1 day)", partition, args.repeat)
+    print_results(
+        f"Bronze month ({args.locations} locations, {args.days} days)",
+        month,
+        args.repeat,
+    )
+    print_results("Silver month", silver_rows(month), args.repeat)
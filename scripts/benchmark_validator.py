@@ -0,0 +1,128 @@
+"""
+Benchmark of the weather data validation engines.
+
+Validates N synthetic partitions of 24 hourly rows with the 'pandas' engine
+(on DataFrames, copied first as the fetcher used to), the 'arrow' engine (on
+Arrow tables, as produced by the parser) and the batch validator (one
+concatenated frame), and checks that both engines report identical messages
+for a set of invalid partitions.
+
+Usage:
+    python -m scripts.benchmark_validator --partitions 2000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_fetcher.validator import (  # noqa: E402
+    PARTITION_DATE_COLUMN,
+    validate_weather_batch,
+    validate_weather_data,
+)
+
+TARGET_DATE = pd.Timestamp("2025-05-01", tz="UTC")
+
+
+def make_partition(index: int) -> pd.DataFrame:
+    """Builds one valid partition with 24 hourly rows and a few forecast variables."""
+    rng = np.random.default_rng(index)
+    return pd.DataFrame(
+        {
+            "timestamp": pd.date_range(TARGET_DATE, periods=24, freq="h"),
+            "air_temperature": rng.uniform(10, 35, 24),
+            "relative_humidity": rng.uniform(30, 90, 24),
+            "wind_speed": rng.uniform(0, 8, 24),
+            "location_id": f"loc{index:05d}",
+            "crop_id": "maize" if index % 2 == 0 else "sorghum",
+        }
+    )
+
+
+def invalid_partitions() -> dict[str, pd.DataFrame]:
+    """Builds partitions that fail one or more checks."""
+    hot = make_partition(0)
+    hot.loc[3, "air_temperature"] = 75.0
+    missing = make_partition(1)
+    missing.loc[5, "air_temperature"] = np.nan
+    return {
+        "out of bounds": hot,
+        "missing value": missing,
+        "duplicate": pd.concat([make_partition(2)] * 2, ignore_index=True),
+        "string timestamps on wrong date": make_partition(3).assign(
+            timestamp=lambda df: (df["timestamp"] + pd.Timedelta(days=1)).dt.strftime(
+                "%Y-%m-%dT%H:%M:%SZ"
+            )
+        ),
+        "missing column": make_partition(4).drop(columns="air_temperature"),
+    }
+
+
+def error_message(data, engine: str) -> str:
+    try:
+        validate_weather_data(data, TARGET_DATE, engine=engine)
+    except ValueError as e:
+        return str(e)
+    return ""
+
+
+def timed(label: str, num_partitions: int, function):
+    started = time.perf_counter()
+    function()
+    seconds = time.perf_counter() - started
+    print(
+        f"{label:<40} {seconds * 1000:9.1f}ms  {seconds / num_partitions * 1e6:8.1f}us/partition"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmarks the pandas and Arrow validation engines."
+    )
+    parser.add_argument("--partitions", type=int, default=2000)
+    args = parser.parse_args()
+
+    frames = [make_partition(i) for i in range(args.partitions)]
+    tables = [pa.Table.from_pandas(df, preserve_index=False) for df in frames]
+    batch = pd.concat(frames, ignore_index=True).assign(
+        **{PARTITION_DATE_COLUMN: TARGET_DATE}
+    )
+
+    print(f"Validating {args.partitions} partitions of 24 rows:")
+    timed(
+        "pandas engine (DataFrame copy)",
+        args.partitions,
+        lambda: [
+            validate_weather_data(df.copy(), TARGET_DATE, engine="pandas")
+            for df in frames
+        ],
+    )
+    timed(
+        "arrow engine (Arrow table)",
+        args.partitions,
+        lambda: [
+            validate_weather_data(table, TARGET_DATE, engine="arrow")
+            for table in tables
+        ],
+    )
+    timed(
+        "batch validator (one frame)",
+        args.partitions,
+        lambda: validate_weather_batch(batch),
+    )
+
+    print("Error messages:")
+    for name, df in invalid_partitions().items():
+        pandas_message = error_message(df.copy(), "pandas")
+        arrow_message = error_message(
+            pa.Table.from_pandas(df, preserve_index=False), "arrow"
+        )
+        status = "identical" if pandas_message == arrow_message else "DIFFERENT"
+        print(f"  {name:<34} {status}")
@@ -0,0 +1,320 @@
+"""
+Local stand-in for the api.met.no locationforecast endpoint.
+
+Serves recorded or synthetic locationforecast documents over HTTP, so the data
+fetcher can be exercised and benchmarked without network access. Latency,
+error rate and the 'Expires' lifetime of responses are configurable, and
+'If-Modified-Since' requests are answered with '304 Not Modified'.
+
+Usage:
+    python -m scripts.mock_met_server --port 8080 --latency-ms 50 --error-rate 0.01
+    MET_API_URL=http://127.0.0.1:8080/weatherapi/locationforecast/2.0/compact python -m data_fetcher.main
+"""
+
+import argparse
+import json
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+logger = logging.getLogger(__name__)
+
+# Path of the locationforecast endpoint served by the mock, matching api.met.no.
+FORECAST_PATH = "/weatherapi/locationforecast/2.0/compact"
+
+
+def synthetic_forecast(lat: float, lon: float, hours: int = 72) -> dict:
+    """
+    Builds a locationforecast document with hourly entries starting at the current UTC day.
+
+    Values are deterministic for a coordinate, with a daily temperature cycle.
+
+    Args:
+        lat (float): Latitude of the location.
+        lon (float): Longitude of the location.
+        hours (int): Number of hourly entries.
+
+    Returns:
+        dict: GeoJSON document shaped like an api.met.no 'compact' response.
+    """
+    rng = random.Random(f"{lat:.4f},{lon:.4f}")
+    base_temperature = rng.uniform(15.0, 30.0)
+    start = datetime.now(timezone.utc).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    timeseries = []
+    for hour in range(hours):
+        entry_time = start + timedelta(hours=hour)
+        daily_cycle = 6.0 * (1 - abs(entry_time.hour - 14) / 12)
+        timeseries.append(
+            {
+                "time": entry_time.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "data": {
+                    "instant": {
+                        "details": {
+                            "air_pressure_at_sea_level": round(
+                                rng.uniform(1000.0, 1020.0), 1
+                            ),
+                            "air_temperature": round(
+                                base_temperature + daily_cycle + rng.uniform(-1, 1), 1
+                            ),
+                            "cloud_area_fraction": round(rng.uniform(0.0, 100.0), 1),
+                            "relative_humidity": round(rng.uniform(30.0, 90.0), 1),
+                            "wind_from_direction": round(rng.uniform(0.0, 360.0), 1),
+                            "wind_speed": round(rng.uniform(0.0, 8.0), 1),
+                        }
+                    }
+                },
+            }
+        )
+    return {
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": [lon, lat]},
+        "properties": {
+            "meta": {"updated_at": start.strftime("%Y-%m-%dT%H:%M:%SZ")},
+            "timeseries": timeseries,
+        },
+    }
+
+
+def rebase_forecast(document: dict) -> dict:
+    """
+    Shifts the timeseries of a recorded document so its first entry starts at the current UTC day.
+
+    Args:
+        document (dict): Recorded locationforecast document.
+
+    Returns:
+        dict: A copy of the document with shifted 'time' values.
+
+    Raises:
+        ValueError: If the document has no 'properties.timeseries'.
+    """
+    timeseries = document.get("properties", {}).get("timeseries")
+    if not timeseries:
+        raise ValueError(
+            "Recorded payload is not a locationforecast document: 'properties.timeseries' is missing."
+        )
+    first = datetime.strptime(timeseries[0]["time"], "%Y-%m-%dT%H:%M:%SZ")
+    start = datetime.now(timezone.utc).replace(
+        hour=first.hour, minute=0, second=0, microsecond=0, tzinfo=None
+    )
+    shift = start - first
+    rebased = json.loads(json.dumps(document))
+    for entry in rebased["properties"]["timeseries"]:
+        entry_time = datetime.strptime(entry["time"], "%Y-%m-%dT%H:%M:%SZ") + shift
+        entry["time"] = entry_time.strftime("%Y-%m-%dT%H:%M:%SZ")
+    return rebased
+
+
+class MockMetServer:
+    """
+    Threaded HTTP server replaying locationforecast documents.
+
+    Every coordinate gets its own synthetic document unless a recorded payload is
+    given, in which case that document is served for every coordinate.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        expires_seconds: int = 1800,
+        payload_path: str | None = None,
+        rebase: bool = True,
+    ):
+        """
+        Args:
+            host (str): Interface to listen on.
+            port (int): Port to listen on; 0 picks a free port.
+            latency_ms (float): Delay added before every response, in milliseconds.
+            jitter_ms (float): Maximum random delay added on top of latency_ms, in milliseconds.
+            error_rate (float): Fraction of requests answered with '503 Service Unavailable'.
+            expires_seconds (int): Lifetime announced in the 'Expires' header.
+            payload_path (str | None): Recorded locationforecast JSON to serve instead of synthetic data.
+            rebase (bool): Whether to shift a recorded payload's timeseries to the current day.
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.expires_seconds = expires_seconds
+        self.last_modified = datetime.now(timezone.utc).replace(microsecond=0)
+        self.recorded_body: bytes | None = None
+        if payload_path:
+            with open(payload_path, "r", encoding="utf-8") as payload_file:
+                document = json.load(payload_file)
+            if rebase:
+                document = rebase_forecast(document)
+            self.recorded_body = json.dumps(document).encode("utf-8")
+        self._bodies: dict[str, bytes] = {}
+        self._lock = threading.Lock()
+        self.request_counts: dict[int, int] = {}
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        """Returns the locationforecast URL served by this instance."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{FORECAST_PATH}"
+
+    def _body_for(self, lat: float, lon: float) -> bytes:
+        if self.recorded_body is not None:
+            return self.recorded_body
+        key = f"{lat:.4f}_{lon:.4f}"
+        with self._lock:
+            if key not in self._bodies:
+                self._bodies[key] = json.dumps(synthetic_forecast(lat, lon)).encode(
+                    "utf-8"
+                )
+            return self._bodies[key]
+
+    def _count(self, status_code: int):
+        with self._lock:
+            self.request_counts[status_code] = (
+                self.request_counts.get(status_code, 0) + 1
+            )
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                logger.debug(format, *args)
+
+            def _reply(self, status_code: int, body: bytes = b"", headers=None):
+                server._count(status_code)
+                self.send_response(status_code)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+
+            def do_GET(self):
+                delay = server.latency_ms + random.uniform(0.0, server.jitter_ms)
+                if delay > 0:
+                    time.sleep(delay / 1000)
+
+                parsed = urlparse(self.path)
+                if parsed.path != FORECAST_PATH:
+                    self._reply(404, b'{"error": "Not found"}')
+                    return
+                if random.random() < server.error_rate:
+                    self._reply(503, b'{"error": "Service unavailable"}')
+                    return
+                query = parse_qs(parsed.query)
+                try:
+                    lat = float(query["lat"][0])
+                    lon = float(query["lon"][0])
+                except (KeyError, ValueError):
+                    self._reply(400, b'{"error": "lat and lon are required"}')
+                    return
+
+                headers = {
+                    "Content-Type": "application/json",
+                    "Last-Modified": format_datetime(server.last_modified, usegmt=True),
+                    "Expires": format_datetime(
+                        datetime.now(timezone.utc).replace(microsecond=0)
+                        + timedelta(seconds=server.expires_seconds),
+                        usegmt=True,
+                    ),
+                }
+                if_modified_since = self.headers.get("If-Modified-Since")
+                if if_modified_since:
+                    try:
+                        if parsedate_to_datetime(if_modified_since) >= (
+                            server.last_modified
+                        ):
+                            self._reply(304, headers=headers)
+                            return
+                    except (TypeError, ValueError):
+                        pass
+                self._reply(200, server._body_for(lat, lon), headers)
+
+        return Handler
+
+    def start(self) -> "MockMetServer":
+        """Starts serving in a background thread and returns self."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"Mock met.no server listening on {self.url}")
+        return self
+
+    def serve_forever(self):
+        """Serves in the current thread until interrupted."""
+        logger.info(f"Mock met.no server listening on {self.url}")
+        self._server.serve_forever()
+
+    def stop(self):
+        """Stops the server and closes its socket."""
+        self._server.shutdown()
+        self._server.server_close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    parser = argparse.ArgumentParser(
+        description="Serves recorded or synthetic locationforecast documents for offline fetcher runs."
+    )
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument(
+        "--latency-ms", type=float, default=0.0, help="Delay added to every response."
+    )
+    parser.add_argument(
+        "--jitter-ms", type=float, default=0.0, help="Maximum random extra delay."
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of requests answered with '503 Service Unavailable'.",
+    )
+    parser.add_argument(
+        "--expires-seconds",
+        type=int,
+        default=1800,
+        help="Lifetime announced in the 'Expires' header.",
+    )
+    parser.add_argument(
+        "--payload",
+        type=str,
+        default=None,
+        help="Recorded locationforecast JSON served for every coordinate instead of synthetic data.",
+    )
+    parser.add_argument(
+        "--no-rebase",
+        action="store_true",
+        help="Serve a recorded payload with its original timestamps.",
+    )
+    args = parser.parse_args()
+
+    mock_server = MockMetServer(
+        host=args.host,
+        port=args.port,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        expires_seconds=args.expires_seconds,
+        payload_path=args.payload,
+        rebase=not args.no_rebase,
+    )
+    try:
+        mock_server.serve_forever()
+    except KeyboardInterrupt:
+        mock_server.stop()
@@ -0,0 +1,218 @@
+import json
+import pytest
+import requests
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import MagicMock, patch
+
+from data_fetcher.fetcher import (
+    fetch_weather_data,
+    parse_forecast_to_arrow,
+    split_forecast_by_date,
+)
+from data_fetcher.config import MET_API_MAX_RETRIES
+from data_fetcher.forecast_cache import ForecastCache
+
+LAST_MODIFIED = "Wed, 14 Oct 2026 10:00:00 GMT"
+
+
+def _forecast_body(hours: int = 3) -> bytes:
+    """Builds a minimal locationforecast document with hourly air temperatures."""
+    start = datetime(2026, 10, 14, 22, tzinfo=timezone.utc)
+    timeseries = [
+        {
+            "time": (start + timedelta(hours=h)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "data": {"instant": {"details": {"air_temperature": 20.0 + h}}},
+        }
+        for h in range(hours)
+    ]
+    return json.dumps({"properties": {"timeseries": timeseries}}).encode("utf-8")
+
+
+def _response(status_code: int, body: bytes = b"", headers: dict | None = None):
+    """Creates a mock requests.Response."""
+    response = MagicMock()
+    response.status_code = status_code
+    response.content = body
+    response.headers = headers or {}
+    response.raise_for_status.return_value = None
+    return response
+
+
+@pytest.fixture
+def mock_get():
+    """Patches the shared HTTP session and yields its mocked 'get' method."""
+    with patch("data_fetcher.fetcher.get_http_session") as mock_session:
+        yield mock_session.return_value.get
+
+
+def _expires_in(hours: int) -> str:
+    return format_datetime(
+        datetime.now(timezone.utc) + timedelta(hours=hours), usegmt=True
+    )
+
+
+def test_fetch_weather_data_parses_timeseries(mock_get):
+    """Test that the forecast document is parsed into UTC timestamps and temperatures."""
+    mock_get.return_value = _response(200, _forecast_body())
+
+    df = fetch_weather_data(15.85, 74.50, "Belagavi")
+
+    assert list(df["air_temperature"]) == [20.0, 21.0, 22.0]
+    assert (df["location_id"] == "Belagavi").all()
+    assert str(df["timestamp"].dt.tz) == "UTC"
+
+
+def test_fetch_weather_data_serves_fresh_cache_without_request(mock_get, tmp_path):
+    """Test that a cached document is reused until it expires."""
+    cache = ForecastCache(str(tmp_path))
+    mock_get.return_value = _response(
+        200,
+        _forecast_body(),
+        {"Expires": _expires_in(1), "Last-Modified": LAST_MODIFIED},
+    )
+
+    first = fetch_weather_data(15.85, 74.50, "Belagavi", cache=cache)
+    second = fetch_weather_data(15.85, 74.50, "Belagavi", cache=cache)
+
+    assert mock_get.call_count == 1
+    assert first.equals(second)
+
+
+def test_fetch_weather_data_revalidates_expired_cache(mock_get, tmp_path):
+    """Test that an expired entry is revalidated with If-Modified-Since and 304 is a cache hit."""
+    cache = ForecastCache(str(tmp_path))
+    cache.put(
+        15.85,
+        74.50,
+        _forecast_body(),
+        {"Expires": _expires_in(-1), "Last-Modified": LAST_MODIFIED},
+    )
+    mock_get.return_value = _response(304, headers={"Expires": _expires_in(1)})
+
+    df = fetch_weather_data(15.85, 74.50, "Belagavi", cache=cache)
+
+    assert len(df) == 3
+    sent_headers = mock_get.call_args.kwargs["headers"]
+    assert sent_headers["If-Modified-Since"] == LAST_MODIFIED
+    assert cache.get(15.85, 74.50).is_fresh()
+
+
+@patch("data_fetcher.fetcher.time.sleep")
+def test_fetch_weather_data_retries_after_429(mock_sleep, mock_get):
+    """Test that a '429' response is retried after the Retry-After delay."""
+    mock_get.side_effect = [
+        _response(429, headers={"Retry-After": "3"}),
+        _response(200, _forecast_body()),
+    ]
+
+    df = fetch_weather_data(15.85, 74.50, "Belagavi")
+
+    assert len(df) == 3
+    mock_sleep.assert_called_once_with(3.0)
+
+
+@pytest.mark.parametrize(
+    "lat, lon, expected_key",
+    [
+        (15.85, 74.5, "15.8500_74.5000"),
+        (-1.383333333, 38.01, "-1.3833_38.0100"),
+    ],
+)
+def test_forecast_cache_key_rounds_to_four_decimals(lat, lon, expected_key):
+    """Test that cache keys use coordinates rounded to 4 decimals."""
+    assert ForecastCache.cache_key(lat, lon) == expected_key
+
+
+def test_split_forecast_by_date_keeps_only_target_dates(mock_get):
+    """Test that one response is split per UTC date and unrequested dates are dropped."""
+    mock_get.return_value = _response(200, _forecast_body(hours=30))
+    df = fetch_weather_data(15.85, 74.50, "Belagavi")
+
+    frames = split_forecast_by_date(
+        df, [datetime(2026, 10, 14).date(), datetime(2026, 10, 15).date()]
+    )
+
+    assert sorted(frames) == [
+        datetime(2026, 10, 14).date(),
+        datetime(2026, 10, 15).date(),
+    ]
+    assert len(frames[datetime(2026, 10, 14).date()]) == 2  # 22:00 and 23:00.
+    assert len(frames[datetime(2026, 10, 15).date()]) == 24
+
+
+def test_parse_forecast_to_arrow_keeps_all_detail_variables():
+    """Test that every 'instant.details' variable becomes a typed column."""
+    body = json.dumps(
+        {
+            "properties": {
+                "timeseries": [
+                    {
+                        "time": "2026-10-15T00:00:00Z",
+                        "data": {
+                            "instant": {
+                                "details": {"air_temperature": 18.5, "wind_speed": 2}
+                            }
+                        },
+                    },
+                    {
+                        "time": "2026-10-15T01:00:00Z",
+                        "data": {
+                            "instant": {
+                                "details": {
+                                    "air_temperature": 18.1,
+                                    "relative_humidity": 80.2,
+                                }
+                            }
+                        },
+                    },
+                    {
+                        "time": "2026-10-15T02:00:00Z",
+                        "data": {"instant": {"details": {"wind_speed": 3.0}}},
+                    },
+                ]
+            }
+        }
+    ).encode("utf-8")
+
+    table = parse_forecast_to_arrow(body, "Kitui")
+
+    assert table.column_names == [
+        "timestamp",
+        "air_temperature",
+        "relative_humidity",
+        "wind_speed",
+        "location_id",
+    ]
+    # The entry without an air temperature is dropped.
+    assert table.num_rows == 2
+    assert str(table.schema.field("timestamp").type) == "timestamp[ns, tz=UTC]"
+    assert table["wind_speed"].to_pylist() == [2.0, None]
+    assert table["relative_humidity"].to_pylist() == [None, 80.2]
+
+
+@patch("data_fetcher.fetcher.time.sleep")
+def test_fetch_weather_data_retries_server_errors_and_timeouts(mock_sleep, mock_get):
+    """Test that 5xx responses and timeouts are retried with backoff."""
+    mock_get.side_effect = [
+        _response(503),
+        requests.exceptions.Timeout("timed out"),
+        _response(200, _forecast_body()),
+    ]
+
+    df = fetch_weather_data(15.85, 74.50, "Belagavi")
+
+    assert len(df) == 3
+    assert mock_get.call_count == 3
+    assert mock_sleep.call_count == 2
+
+
+@patch("data_fetcher.fetcher.time.sleep")
+def test_fetch_weather_data_gives_up_after_max_retries(mock_sleep, mock_get):
+    """Test that a persistent timeout is raised once the retries are exhausted."""
+    mock_get.side_effect = requests.exceptions.Timeout("timed out")
+
+    with pytest.raises(requests.exceptions.Timeout):
+        fetch_weather_data(15.85, 74.50, "Belagavi")
+
+    assert mock_get.call_count == MET_API_MAX_RETRIES + 1
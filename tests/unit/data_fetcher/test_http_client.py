@@ -0,0 +1,66 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from data_fetcher.config import HEADERS, HTTP_POOL_MAXSIZE
+from data_fetcher.http_client import FetchStats, get_http_session, reset_http_session
+
+
+@pytest.fixture
+def fresh_session():
+    """Starts and ends with no shared HTTP session."""
+    reset_http_session()
+    yield
+    reset_http_session()
+
+
+def test_get_http_session_is_shared_across_threads(fresh_session):
+    """Test that concurrent callers get one session with a pool sized for the fetch concurrency."""
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        sessions = list(executor.map(lambda _: get_http_session(), range(32)))
+
+    session = sessions[0]
+    assert all(other is session for other in sessions)
+    for prefix in ("https://", "http://"):
+        adapter = session.get_adapter(f"{prefix}api.met.no")
+        assert adapter._pool_maxsize == HTTP_POOL_MAXSIZE
+    assert session.headers["User-Agent"] == HEADERS["User-Agent"]
+    assert session.headers["Accept-Encoding"] == "gzip, deflate"
+
+
+def test_reset_http_session_creates_a_new_session(fresh_session):
+    """Test that the reset hook drops the shared session."""
+    first = get_http_session()
+
+    reset_http_session()
+
+    assert get_http_session() is not first
+
+
+def test_fetch_stats_snapshot_aggregates_requests_and_fetches():
+    """Test that counters, status codes and nearest-rank percentiles are reported."""
+    stats = FetchStats()
+    for seconds in (0.1, 0.2, 0.3, 0.4):
+        stats.record_request(seconds, 200)
+    stats.record_request(1.0, 304)
+    stats.record_request(2.0)
+    stats.record_retry()
+    stats.record_fetch(0.5, cache_hit=True)
+    stats.record_fetch(1.5)
+
+    snapshot = stats.snapshot()
+
+    assert snapshot["requests"] == 6
+    assert snapshot["request_seconds_total"] == pytest.approx(4.0)
+    assert snapshot["request_seconds_p50"] == 0.3
+    assert snapshot["request_seconds_p99"] == 2.0
+    assert snapshot["status_counts"] == {200: 4, 304: 1}
+    assert snapshot["request_errors"] == 1
+    assert snapshot["not_modified"] == 1
+    assert snapshot["retries"] == 1
+    assert (snapshot["fetches"], snapshot["cache_hits"]) == (2, 1)
+    assert snapshot["fetch_seconds_p50"] == 0.5
+
+    stats.reset()
+    assert stats.snapshot()["requests"] == 0
+    assert stats.snapshot()["request_seconds_p50"] is None
@@ -0,0 +1,55 @@
+import pytest
+
+from data_fetcher.config import DEFAULT_LOCATION_REGISTRY_PATH
+from data_fetcher.locations import group_by_grid_point, load_location_registry
+
+
+def test_load_location_registry_defaults_to_config_locations():
+    """Test that the built-in maize and sorghum locations are used without a registry file."""
+    registry = load_location_registry()
+
+    assert list(registry.columns) == ["crop_id", "location_id", "lat", "lon"]
+    assert set(registry["crop_id"]) == {"maize", "sorghum"}
+    assert len(registry) == 10
+
+
+def test_default_registry_file_matches_config_locations():
+    """Test that data/locations.csv and the fallback config locations list the same rows."""
+    registry = load_location_registry(DEFAULT_LOCATION_REGISTRY_PATH)
+
+    assert registry.equals(load_location_registry())
+
+
+def test_group_by_grid_point_dedupes_coordinates_across_crops(tmp_path):
+    """Test that rows mapping to the same 4-decimal grid point share one fetch."""
+    registry_file = tmp_path / "locations.csv"
+    registry_file.write_text(
+        "crop_id,location_id,lat,lon\n"
+        "maize,Belagavi,15.85001,74.5\n"
+        "sorghum,Belagavi,15.85002,74.5\n"
+        "maize,Jalgaon,21.01,75.56\n"
+    )
+
+    grid_points = group_by_grid_point(load_location_registry(str(registry_file)))
+
+    assert grid_points == {
+        (15.85, 74.5): [("maize", "Belagavi"), ("sorghum", "Belagavi")],
+        (21.01, 75.56): [("maize", "Jalgaon")],
+    }
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "crop_id,location_id,lat\nmaize,Belagavi,15.85\n",  # Missing 'lon' column.
+        "crop_id,location_id,lat,lon\nmaize,Belagavi,95.0,74.5\n",  # Latitude out of range.
+        "crop_id,location_id,lat,lon\nmaize,Belagavi,abc,74.5\n",  # Non-numeric latitude.
+    ],
+)
+def test_load_location_registry_rejects_invalid_files(tmp_path, content):
+    """Test that registries with missing columns or invalid coordinates are refused."""
+    registry_file = tmp_path / "locations.csv"
+    registry_file.write_text(content)
+
+    with pytest.raises(ValueError):
+        load_location_registry(str(registry_file))
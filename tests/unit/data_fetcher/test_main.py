@@ -0,0 +1,91 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from data_fetcher import fetcher, main
+from data_fetcher.http_client import reset_http_session
+from scripts.benchmark_fetcher import InMemoryS3Client
+from scripts.mock_met_server import MockMetServer
+
+TODAY = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+TOMORROW = (datetime.now(timezone.utc) + timedelta(days=1)).strftime("%Y-%m-%d")
+
+
+@pytest.fixture
+def mock_api(monkeypatch, tmp_path):
+    """Points the fetcher at a local mock met.no server and yields it."""
+    server = MockMetServer(latency_ms=20).start()
+    monkeypatch.setattr(fetcher, "MET_API_URL", server.url)
+    monkeypatch.setattr(main, "FETCHER_STATE_DIR", str(tmp_path / "state"))
+    monkeypatch.setattr(main.app_config, "STORAGE_BACKEND", "minio")
+    monkeypatch.setattr(main.app_config, "MINIO_DATA_BUCKET_NAME", "bucket")
+    monkeypatch.setattr(main.app_config, "BRONZE_WRITE_MODE", "rewrite")
+    reset_http_session()
+    yield server
+    reset_http_session()
+    server.stop()
+
+
+def _write_registry(tmp_path, num_grid_points: int) -> str:
+    """Writes a registry of maize locations at distinct grid points, plus a sorghum location sharing the first."""
+    registry_path = tmp_path / "locations.csv"
+    rows = [f"maize,loc{i},{10 + i}.5,{20 + i}.5" for i in range(num_grid_points)]
+    rows.append("sorghum,shared,10.5,20.5")
+    registry_path.write_text("crop_id,location_id,lat,lon\n" + "\n".join(rows) + "\n")
+    return str(registry_path)
+
+
+def _run(tmp_path, registry_path: str, s3_client, concurrency: int = 4) -> int:
+    return main.run_data_fetcher(
+        concurrency=concurrency,
+        use_cache=False,
+        registry_path=registry_path,
+        start_date_str=TODAY,
+        end_date_str=TOMORROW,
+        s3_client=s3_client,
+        failure_ledger_path=str(tmp_path / "failed.jsonl"),
+    )
+
+
+def test_run_data_fetcher_fetches_each_grid_point_once(mock_api, tmp_path):
+    """Test that one response per grid point feeds every date and crop mapped to it."""
+    s3 = InMemoryS3Client()
+
+    failed = _run(tmp_path, _write_registry(tmp_path, 3), s3)
+
+    assert failed == 0
+    # 3 grid points x 2 dates, with 4 (crop, location) pairs per date.
+    assert mock_api.request_counts == {200: 3}
+    partition_keys = [
+        key for _, key in s3.objects if key.endswith(".parquet") and "/data_" in key
+    ]
+    assert len(partition_keys) == 8
+
+
+def test_run_data_fetcher_bounds_concurrent_fetches(mock_api, tmp_path, monkeypatch):
+    """Test that grid points are fetched in parallel, never more than the concurrency at once."""
+    in_flight, max_in_flight = 0, 0
+    lock = threading.Lock()
+
+    def counting_fetch(*args, **kwargs):
+        nonlocal in_flight, max_in_flight
+        with lock:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+        try:
+            time.sleep(0.05)
+            return fetcher.fetch_forecast_body(*args, **kwargs)
+        finally:
+            with lock:
+                in_flight -= 1
+
+    monkeypatch.setattr(main, "fetch_forecast_body", counting_fetch)
+
+    failed = _run(
+        tmp_path, _write_registry(tmp_path, 8), InMemoryS3Client(), concurrency=3
+    )
+
+    assert failed == 0
+    assert max_in_flight == 3
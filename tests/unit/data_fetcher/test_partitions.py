@@ -0,0 +1,92 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from data_fetcher.locations import load_location_registry
+from data_fetcher.partitions import (
+    FailureLedger,
+    FetchPartition,
+    PartitionCheckpoint,
+    group_failures_by_grid_point,
+    load_failures,
+    plan_partitions_by_grid_point,
+)
+from universal.processing_utils import determine_fetcher_date_range
+
+
+def test_determine_fetcher_date_range_is_inclusive():
+    """Test that a backfill range includes both the start and the end date."""
+    dates = determine_fetcher_date_range("2025-01-30", "2025-02-02")
+
+    assert [d.strftime("%Y-%m-%d") for d in dates] == [
+        "2025-01-30",
+        "2025-01-31",
+        "2025-02-01",
+        "2025-02-02",
+    ]
+    assert all(d.tzinfo == timezone.utc for d in dates)
+
+
+@pytest.mark.parametrize(
+    "start, end", [("2025-02-02", "2025-01-30"), ("2025/01/30", "2025-02-02")]
+)
+def test_determine_fetcher_date_range_rejects_invalid_ranges(start, end):
+    """Test that inverted ranges and malformed dates raise ValueError."""
+    with pytest.raises(ValueError):
+        determine_fetcher_date_range(start, end)
+
+
+def test_plan_partitions_by_grid_point_covers_every_date_and_target():
+    """Test that every (date, crop, location) partition is planned under its grid point."""
+    dates = determine_fetcher_date_range("2025-05-01", "2025-05-02")
+
+    plan = plan_partitions_by_grid_point(dates, load_location_registry())
+
+    partitions = [p for grid_partitions in plan.values() for p in grid_partitions]
+    assert len(partitions) == 2 * 10
+    assert len(set(partitions)) == len(partitions)
+
+
+def test_partition_checkpoint_resumes_from_file(tmp_path):
+    """Test that finished partitions are persisted and reloaded by a new checkpoint."""
+    path = str(tmp_path / "state" / "backfill.jsonl")
+    day = datetime(2025, 5, 1, tzinfo=timezone.utc)
+    done = FetchPartition(day, "maize", "Belagavi")
+    pending = FetchPartition(day, "maize", "Jalgaon")
+
+    PartitionCheckpoint(path).mark_done(done)
+    with open(path, "a", encoding="utf-8") as checkpoint_file:
+        checkpoint_file.write('{"date": "2025-05-01", "crop')  # Interrupted write.
+    resumed = PartitionCheckpoint(path)
+
+    assert resumed.is_done(done)
+    assert not resumed.is_done(pending)
+    resumed.mark_done(pending)
+    assert len(PartitionCheckpoint(path)) == 2
+
+
+def test_failure_ledger_round_trips_failed_partitions(tmp_path):
+    """Test that recorded failures are read back and grouped by grid point for a retry."""
+    path = str(tmp_path / "failed_partitions.jsonl")
+    day = datetime(2025, 5, 1, tzinfo=timezone.utc)
+    ledger = FailureLedger(path)
+    ledger.clear()
+    ledger.record(
+        FetchPartition(day, "maize", "Belagavi"), 15.85, 74.5, TimeoutError("slow")
+    )
+    ledger.record(
+        FetchPartition(day, "sorghum", "Belagavi"), 15.85, 74.5, TimeoutError("slow")
+    )
+
+    failures = load_failures(path)
+
+    assert len(ledger) == 2
+    assert [f.error_class for f in failures] == ["TimeoutError", "TimeoutError"]
+    assert group_failures_by_grid_point(failures) == {
+        (15.85, 74.5): [
+            FetchPartition(day, "maize", "Belagavi"),
+            FetchPartition(day, "sorghum", "Belagavi"),
+        ]
+    }
+    FailureLedger(path).clear()
+    assert load_failures(path) == []
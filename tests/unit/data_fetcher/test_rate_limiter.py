@@ -0,0 +1,53 @@
+import pytest
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+from data_fetcher.rate_limiter import TokenBucketRateLimiter, parse_retry_after
+
+
+@pytest.mark.parametrize(
+    "header_value, expected",
+    [
+        ("5", 5.0),
+        (" 12 ", 12.0),
+        (None, None),
+        ("", None),
+        ("not-a-date", None),
+    ],
+)
+def test_parse_retry_after_seconds(header_value, expected):
+    """Test parsing of delay-seconds and missing or invalid 'Retry-After' values."""
+    assert parse_retry_after(header_value) == expected
+
+
+def test_parse_retry_after_http_date():
+    """Test that an HTTP-date 'Retry-After' value is converted to seconds from now."""
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+    seconds = parse_retry_after(format_datetime(retry_at, usegmt=True))
+    assert 25 <= seconds <= 30
+
+
+def test_rate_limiter_rejects_non_positive_rate():
+    """Test that a zero or negative rate is refused."""
+    with pytest.raises(ValueError):
+        TokenBucketRateLimiter(0)
+
+
+def test_rate_limiter_limits_rate_after_burst():
+    """Test that requests beyond the burst capacity are spread out at the configured rate."""
+    limiter = TokenBucketRateLimiter(rate=50, capacity=1)
+    start = time.monotonic()
+    for _ in range(6):
+        limiter.acquire()
+    # One token is available immediately, the remaining five arrive at 50/s.
+    assert time.monotonic() - start >= 0.09
+
+
+def test_rate_limiter_pause_blocks_acquire():
+    """Test that a server-requested pause delays the next request."""
+    limiter = TokenBucketRateLimiter(rate=1000)
+    limiter.pause_for(0.1)
+    start = time.monotonic()
+    limiter.acquire()
+    assert time.monotonic() - start >= 0.09
@@ -0,0 +1,33 @@
+from datetime import datetime, timezone
+
+from data_fetcher.raw_store import (
+    compress_forecast_body,
+    decompress_forecast_body,
+    parse_raw_key,
+)
+from universal.processing_utils import generate_raw_s3_key
+
+
+def test_compress_forecast_body_round_trips_as_zstd():
+    """Test that raw bodies are stored as standard zstd frames and restored unchanged."""
+    body = b'{"properties": {"timeseries": []}}' * 100
+
+    compressed = compress_forecast_body(body)
+
+    assert compressed[:4] == b"\x28\xb5\x2f\xfd"  # zstd frame magic number.
+    assert len(compressed) < len(body)
+    assert decompress_forecast_body(compressed) == body
+
+
+def test_parse_raw_key_reverses_generate_raw_s3_key():
+    """Test that grid point and fetch time are recovered from a raw object key."""
+    fetched_at = datetime(2025, 5, 26, 6, 15, 2, tzinfo=timezone.utc)
+    key = generate_raw_s3_key("raw", fetched_at, -15.85, 74.5)
+
+    ref = parse_raw_key(key)
+
+    assert key.startswith(
+        "raw/year=2025/month=05/day=2025-05-26/grid=-15.8500_74.5000/"
+    )
+    assert (ref.lat, ref.lon, ref.fetched_at) == (-15.85, 74.5, fetched_at)
+    assert parse_raw_key("bronze/year=2025/month=05/data_2025-05-26.parquet") is None
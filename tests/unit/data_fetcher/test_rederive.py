@@ -0,0 +1,126 @@
+import io
+import json
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+from botocore.exceptions import ClientError
+
+from data_fetcher import rederive
+from data_fetcher.raw_store import save_raw_forecast
+from universal.processing_utils import generate_partitioned_s3_key
+
+BASE_KEY = generate_partitioned_s3_key(
+    "bronze", "2025", "05", "2025-05-26", "maize", "loc1"
+)
+
+
+class DictS3Client:
+    """Keeps objects in memory, with the calls the raw store and the saver make."""
+
+    def __init__(self):
+        self.objects = {}
+        self.metadata = {}
+
+    def put_object(self, Bucket, Key, Body, Metadata=None, **kwargs):
+        self.objects[Key] = Body
+        self.metadata[Key] = Metadata or {}
+
+    def head_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise ClientError({"Error": {"Code": "404"}}, "HeadObject")
+        return {"Metadata": self.metadata[Key]}
+
+    def get_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+        return {"Body": io.BytesIO(self.objects[Key])}
+
+    def list_objects_v2(self, Bucket, Prefix="", **kwargs):
+        keys = sorted(key for key in self.objects if key.startswith(Prefix))
+        return {"Contents": [{"Key": key} for key in keys], "IsTruncated": False}
+
+
+def _forecast_body(start: datetime, hours: int, temperature: float) -> bytes:
+    """Builds a locationforecast document with a constant hourly air temperature."""
+    timeseries = [
+        {
+            "time": (start + timedelta(hours=h)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "data": {"instant": {"details": {"air_temperature": temperature}}},
+        }
+        for h in range(hours)
+    ]
+    return json.dumps({"properties": {"timeseries": timeseries}}).encode("utf-8")
+
+
+@pytest.fixture
+def bronze_store(monkeypatch, tmp_path):
+    """Yields an S3 client holding a full 2025-05-26 partition, and a registry path."""
+    monkeypatch.setattr(rederive.app_config, "STORAGE_BACKEND", "minio")
+    monkeypatch.setattr(rederive.app_config, "MINIO_DATA_BUCKET_NAME", "bucket")
+    monkeypatch.setattr(rederive.app_config, "BRONZE_WRITE_MODE", "rewrite")
+    registry_path = tmp_path / "locations.csv"
+    registry_path.write_text("crop_id,location_id,lat,lon\nmaize,loc1,15.85,74.5\n")
+    s3 = DictS3Client()
+    # The partition was built from a document of 2025-05-25 that is not in the raw layer.
+    day = pd.Timestamp("2025-05-26", tz="UTC")
+    existing = pd.DataFrame(
+        {
+            "timestamp": pd.date_range(day, periods=24, freq="h"),
+            "air_temperature": 10.0,
+            "crop_id": "maize",
+            "location_id": "loc1",
+        }
+    )
+    s3.objects[BASE_KEY] = existing.to_parquet(index=False)
+    s3.metadata[BASE_KEY] = {}
+    return s3, str(registry_path)
+
+
+def test_rederive_keeps_hours_missing_from_the_raw_documents(bronze_store):
+    """Test that rebuilt rows win for their hours and the partition keeps the others."""
+    s3, registry_path = bronze_store
+    fetched_at = datetime(2025, 5, 26, 12, tzinfo=timezone.utc)
+    save_raw_forecast(
+        s3,
+        "bucket",
+        "raw",
+        15.85,
+        74.5,
+        _forecast_body(fetched_at, 12, 20.0),
+        fetched_at=fetched_at,
+    )
+
+    result = rederive.rederive_bronze(
+        "2025-05-26", "2025-05-26", registry_path=registry_path, s3_client=s3
+    )
+
+    assert result == {"raw_documents": 1, "saved": 1, "failed": 0}
+    written = pd.read_parquet(io.BytesIO(s3.objects[BASE_KEY]))
+    assert len(written) == 24
+    assert written["air_temperature"].tolist() == [10.0] * 12 + [20.0] * 12
+
+
+def test_rederive_in_delta_mode_writes_only_the_rebuilt_rows(bronze_store, monkeypatch):
+    """Test that delta writes carry the rebuilt rows and leave the canonical file alone."""
+    s3, registry_path = bronze_store
+    monkeypatch.setattr(rederive.app_config, "BRONZE_WRITE_MODE", "delta")
+    existing = s3.objects[BASE_KEY]
+    fetched_at = datetime(2025, 5, 26, 12, tzinfo=timezone.utc)
+    save_raw_forecast(
+        s3,
+        "bucket",
+        "raw",
+        15.85,
+        74.5,
+        _forecast_body(fetched_at, 12, 20.0),
+        fetched_at=fetched_at,
+    )
+
+    rederive.rederive_bronze(
+        "2025-05-26", "2025-05-26", registry_path=registry_path, s3_client=s3
+    )
+
+    assert s3.objects[BASE_KEY] == existing
+    (delta_key,) = [key for key in s3.objects if "/delta_2025-05-26_" in key]
+    assert len(pd.read_parquet(io.BytesIO(s3.objects[delta_key]))) == 12
@@ -0,0 +1,162 @@
+import io
+from datetime import datetime
+
+import pandas as pd
+from botocore.exceptions import ClientError
+
+from data_fetcher.main import _merge_partition
+from data_fetcher.saver import CONTENT_HASH_METADATA_KEY, save_partitioned_dataset_s3
+from universal import parquet_profile
+
+
+class RecordingS3Client:
+    """Keeps uploaded objects in memory and fails uploads for one location."""
+
+    def __init__(self, failing_location: str | None = None):
+        self.objects = {}
+        self.metadata = {}
+        self.puts = 0
+        self.failing_location = failing_location
+
+    def put_object(self, Bucket, Key, Body, Metadata=None, **kwargs):
+        if self.failing_location and f"location_id={self.failing_location}/" in Key:
+            raise ConnectionError("upload failed")
+        self.objects[Key] = Body
+        self.metadata[Key] = Metadata or {}
+        # Partition uploads only; manifest updates are not counted.
+        self.puts += "/_manifests/" not in Key
+
+    def head_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise ClientError({"Error": {"Code": "404"}}, "HeadObject")
+        return {"Metadata": self.metadata[Key]}
+
+    def get_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+        return {"Body": io.BytesIO(self.objects[Key])}
+
+
+def _partition(date_str: str, crop_id: str, location_id: str) -> pd.DataFrame:
+    day = pd.Timestamp(date_str, tz="UTC")
+    return pd.DataFrame(
+        {
+            "timestamp": pd.date_range(day, periods=3, freq="h"),
+            "air_temperature": [20.0, 21.0, 22.0],
+            "crop_id": crop_id,
+            "location_id": location_id,
+            "partition_date": day,
+        }
+    )
+
+
+def test_save_partitioned_dataset_s3_writes_one_file_per_partition():
+    """Test that every partition lands at its hive key and failures are reported per partition."""
+    df = pd.concat(
+        [
+            _partition("2025-05-25", "maize", "loc1"),
+            _partition("2025-05-26", "maize", "loc1"),
+            _partition("2025-05-26", "sorghum", "loc2"),
+        ],
+        ignore_index=True,
+    )
+    s3 = RecordingS3Client(failing_location="loc2")
+
+    results = save_partitioned_dataset_s3(df, "bucket", "bronze", s3_client=s3)
+
+    saved = {
+        (r.date_str, r.crop_id, r.location_id): r.path
+        for r in results
+        if r.error is None
+    }
+    failed = [(r.date_str, r.location_id) for r in results if r.error is not None]
+    key = "bronze/year=2025/month=05/crop_id=maize/location_id=loc1/data_2025-05-26.parquet"
+    assert saved[("2025-05-26", "maize", "loc1")] == f"s3://bucket/{key}"
+    assert len(saved) == 2
+    assert failed == [("2025-05-26", "loc2")]
+    written = pd.read_parquet(io.BytesIO(s3.objects[key]))
+    assert list(written.columns) == [
+        "timestamp",
+        "air_temperature",
+        "crop_id",
+        "location_id",
+    ]
+    assert len(written) == 3
+
+
+def test_save_partitioned_dataset_s3_skips_unchanged_partitions():
+    """Test that partitions whose content hash matches the stored one are not uploaded again."""
+    df = pd.concat(
+        [
+            _partition("2025-05-26", "maize", "loc1"),
+            _partition("2025-05-26", "sorghum", "loc2"),
+        ],
+        ignore_index=True,
+    )
+    s3 = RecordingS3Client()
+    save_partitioned_dataset_s3(df, "bucket", "bronze", s3_client=s3)
+    assert s3.puts == 2
+
+    # Same rows in another order: the stored hash in the object metadata matches.
+    changed = df.iloc[::-1].copy()
+    changed.loc[changed["location_id"] == "loc2", "air_temperature"] += 1.0
+    results = save_partitioned_dataset_s3(
+        changed, "bucket", "bronze", s3_client=s3, skip_unchanged=True
+    )
+    assert s3.puts == 3
+    assert {r.location_id: r.skipped for r in results} == {
+        "loc1": True,
+        "loc2": False,
+    }
+    assert all(r.error is None and r.path for r in results)
+
+    # Known hashes of the stored rows are used as they are, without HEAD requests.
+    key = "bronze/year=2025/month=05/crop_id=maize/location_id=loc1/data_2025-05-26.parquet"
+    stored_hash = s3.metadata[key][CONTENT_HASH_METADATA_KEY]
+    results = save_partitioned_dataset_s3(
+        changed,
+        "bucket",
+        "bronze",
+        s3_client=s3,
+        skip_unchanged=True,
+        previous_hashes={("2025-05-26", "maize", "loc1"): stored_hash},
+    )
+    assert s3.puts == 4
+    assert [r.location_id for r in results if r.skipped] == ["loc1"]
+
+
+def test_save_partitioned_dataset_s3_skips_rows_read_back_under_compact_profile(
+    monkeypatch,
+):
+    """Test that the hash of a file read back matches its rows when the profile narrows floats."""
+    monkeypatch.setattr(parquet_profile.app_config, "PARQUET_PROFILE", "compact")
+    fetched = _partition("2025-05-26", "maize", "loc1")
+    fetched["air_temperature"] = [20.1, 21.3, 22.7]
+    s3 = RecordingS3Client()
+    save_partitioned_dataset_s3(fetched, "bucket", "bronze", s3_client=s3)
+    key = "bronze/year=2025/month=05/crop_id=maize/location_id=loc1/data_2025-05-26.parquet"
+    assert pd.read_parquet(io.BytesIO(s3.objects[key]))["air_temperature"].dtype == "float32"
+
+    # The next run fetches the same rows and merges them with the stored float32 rows.
+    df_merged, previous_hash = _merge_partition(
+        s3,
+        "bucket",
+        "bronze",
+        datetime(2025, 5, 26),
+        "maize",
+        "loc1",
+        fetched.drop(columns=["partition_date"]),
+    )
+    assert previous_hash == s3.metadata[key][CONTENT_HASH_METADATA_KEY]
+    df_merged["partition_date"] = pd.Timestamp("2025-05-26", tz="UTC")
+    for previous_hashes in (None, {("2025-05-26", "maize", "loc1"): previous_hash}):
+        results = save_partitioned_dataset_s3(
+            df_merged,
+            "bucket",
+            "bronze",
+            s3_client=s3,
+            skip_unchanged=True,
+            previous_hashes=previous_hashes,
+        )
+        assert [r.skipped for r in results] == [True]
+    assert s3.puts == 1
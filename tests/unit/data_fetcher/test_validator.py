@@ -0,0 +1,101 @@
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from data_fetcher.validator import validate_weather_batch, validate_weather_data
+
+
+def _partition_frame(location_id: str, day: str = "2025-05-01") -> pd.DataFrame:
+    """Builds 24 valid hourly rows of one partition."""
+    return pd.DataFrame(
+        {
+            "timestamp": pd.date_range(day, periods=24, freq="h", tz="UTC"),
+            "air_temperature": 20.0,
+            "location_id": location_id,
+            "crop_id": "maize",
+            "partition_date": pd.Timestamp(day, tz="UTC"),
+        }
+    )
+
+
+def test_validate_weather_batch_reports_each_partition():
+    """Test that one batch call reports passing and failing partitions separately."""
+    valid = _partition_frame("Belagavi")
+    too_hot = _partition_frame("Jalgaon")
+    too_hot.loc[5, "air_temperature"] = 75.0
+    wrong_day = _partition_frame("Dhar").assign(
+        partition_date=pd.Timestamp("2025-05-02", tz="UTC")
+    )
+    duplicated = pd.concat([_partition_frame("Guntur")] * 2, ignore_index=True)
+
+    report = validate_weather_batch(
+        pd.concat([valid, too_hot, wrong_day, duplicated], ignore_index=True)
+    ).set_index("location_id")
+
+    assert report["passed"].to_dict() == {
+        "Belagavi": True,
+        "Jalgaon": False,
+        "Dhar": False,
+        "Guntur": False,
+    }
+    assert report.loc["Belagavi", "errors"] == ""
+    assert (
+        report.loc["Jalgaon", "errors"] == "Temperature values out of realistic bounds."
+    )
+    assert report.loc["Dhar", "errors"] == (
+        "All timestamps must be on the target processing date: 2025-05-02."
+    )
+    assert report.loc["Guntur", "errors"] == (
+        "Duplicate rows detected based on timestamp, location, and crop."
+    )
+    assert report.loc["Guntur", "rows"] == 48
+
+
+def test_validate_weather_batch_uses_single_frame_messages():
+    """Test that batch errors match the messages raised by validate_weather_data."""
+    df = _partition_frame("Belagavi")
+    df.loc[3, "air_temperature"] = None
+
+    report = validate_weather_batch(df)
+    with pytest.raises(ValueError) as exc_info:
+        validate_weather_data(
+            df.drop(columns="partition_date"), pd.Timestamp("2025-05-01", tz="UTC")
+        )
+
+    assert str(exc_info.value) == "Data validation failed:\n" + report.loc[0, "errors"]
+
+
+@pytest.mark.parametrize(
+    "mutate",
+    [
+        lambda df: df,
+        lambda df: df.assign(
+            air_temperature=df["air_temperature"].where(df.index != 2)
+        ),
+        lambda df: df.assign(air_temperature=75.0),
+        lambda df: pd.concat([df, df.iloc[:1]], ignore_index=True),
+        lambda df: df.drop(columns="air_temperature"),
+        lambda df: df.drop(columns="timestamp"),
+        lambda df: df.assign(
+            timestamp=(df["timestamp"] + pd.Timedelta(days=1)).dt.strftime(
+                "%Y-%m-%dT%H:%M:%SZ"
+            )
+        ),
+    ],
+)
+def test_arrow_engine_matches_pandas_engine(mutate):
+    """Test that the Arrow engine accepts and rejects the same data with the same messages."""
+    df = mutate(_partition_frame("Belagavi").drop(columns="partition_date"))
+    target = pd.Timestamp("2025-05-01", tz="UTC")
+    messages = []
+    for engine, data in [
+        ("pandas", df.copy()),
+        ("arrow", pa.Table.from_pandas(df, preserve_index=False)),
+    ]:
+        try:
+            validate_weather_data(data, target, engine=engine)
+            messages.append(None)
+        except ValueError as e:
+            messages.append(str(e))
+
+    assert messages[0] == messages[1]
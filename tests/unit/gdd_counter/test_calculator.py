@@ -0,0 +1,122 @@
+import duckdb
+import pandas as pd
+import pytest
+
+from gdd_counter import calculator
+from universal import duckdb_utils
+from universal.bronze_deltas import generate_delta_s3_key
+from universal.compacted_files import generate_compacted_s3_key
+from universal.processing_utils import generate_partitioned_s3_key
+
+
+@pytest.fixture(params=["UTC", "Asia/Kolkata"])
+def local_engine(request, monkeypatch):
+    """Configures a local-only engine on a host in the given time zone."""
+    monkeypatch.setattr(calculator.app_config, "STORAGE_BACKEND", None)
+    monkeypatch.setattr(calculator.app_config, "BRONZE_WRITE_MODE", "rewrite")
+    monkeypatch.setattr(calculator.app_config, "GDD_DEFAULT_METHOD", "average")
+    monkeypatch.setattr(calculator.app_config, "GDD_METHOD_MAP", {})
+    connect = duckdb.connect
+
+    def connect_on_host(*args, **kwargs):
+        con = connect(*args, **kwargs)
+        con.execute(f"SET GLOBAL TimeZone = '{request.param}';")
+        return con
+
+    monkeypatch.setattr(duckdb_utils.duckdb, "connect", connect_on_host)
+    duckdb_utils.reset_duckdb_connection_cache()
+    yield
+    duckdb_utils.reset_duckdb_connection_cache()
+
+
+def _write(path, start: str, temperatures: list[float], location_id: str = "loc1"):
+    """Writes hourly maize readings from a UTC start time to a local Parquet file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame(
+        {
+            "timestamp": pd.date_range(
+                start, periods=len(temperatures), freq="h", tz="UTC"
+            ),
+            "air_temperature": temperatures,
+            "crop_id": "maize",
+            "location_id": location_id,
+        }
+    ).to_parquet(path, index=False)
+
+
+def _day_path(tmp_path, day_str: str):
+    year, month = day_str[:4], day_str[5:7]
+    return tmp_path / generate_partitioned_s3_key(
+        "bronze", year, month, day_str, "maize", "loc1"
+    )
+
+
+def _calculate(tmp_path, day_str: str) -> pd.DataFrame:
+    year, month = day_str[:4], day_str[5:7]
+    return calculator.calculate_daily_gdd(
+        [
+            f"{tmp_path}/bronze/year={year}/month={month}/crop_id=*/location_id=*/data_{day_str}.parquet"
+        ]
+    )
+
+
+def test_delta_wins_over_its_data_file(tmp_path, local_engine, monkeypatch):
+    """Test that in delta mode a delta's rows replace the data file's rows of the same hour."""
+    monkeypatch.setattr(calculator.app_config, "BRONZE_WRITE_MODE", "delta")
+    base_path = _day_path(tmp_path, "2099-05-26")
+    _write(base_path, "2099-05-26 00:00", [10.0, 20.0, 30.0])
+    _write(
+        tmp_path / generate_delta_s3_key(str(base_path.relative_to(tmp_path))),
+        "2099-05-26 02:00",
+        [14.0],
+    )
+
+    df = _calculate(tmp_path, "2099-05-26")
+
+    assert len(df) == 1
+    assert df.loc[0, "t_min_daily"] == 10.0
+    assert df.loc[0, "t_max_daily"] == 20.0
+
+
+def test_compacted_month_file_is_limited_to_the_requested_day(tmp_path, local_engine):
+    """Test that only the requested UTC day is read from a compacted month file."""
+    # Readings from 22:00 the day before to 01:00 the day after the requested day.
+    _write(
+        tmp_path / generate_compacted_s3_key("bronze", 2025, 4, "maize", "loc1"),
+        "2025-04-25 22:00",
+        [1.0, 2.0] + [20.0] * 12 + [30.0] * 12 + [40.0, 50.0],
+    )
+
+    df = _calculate(tmp_path, "2025-04-26")
+
+    assert df["date"].astype(str).tolist() == ["2025-04-26"]
+    assert df.loc[0, "t_min_daily"] == 20.0
+    assert df.loc[0, "t_max_daily"] == 30.0
+
+
+def test_day_file_overrides_a_compacted_file(tmp_path, local_engine):
+    """Test that a day file written after compaction wins over the compacted rows."""
+    _write(
+        tmp_path / generate_compacted_s3_key("bronze", 2025, 4, "maize"),
+        "2025-04-26 00:00",
+        [10.0, 20.0, 30.0],
+    )
+    _write(_day_path(tmp_path, "2025-04-26"), "2025-04-26 02:00", [14.0])
+
+    df = _calculate(tmp_path, "2025-04-26")
+
+    assert len(df) == 1
+    assert df.loc[0, "t_min_daily"] == 10.0
+    assert df.loc[0, "t_max_daily"] == 20.0
+
+
+def test_closed_month_without_compacted_files(tmp_path, local_engine):
+    """Test that day files of a closed month are read when no compacted file matches."""
+    _write(_day_path(tmp_path, "2025-04-26"), "2025-04-26 00:00", [8.0, 16.0, 24.0])
+
+    df = _calculate(tmp_path, "2025-04-26")
+
+    assert df["date"].astype(str).tolist() == ["2025-04-26"]
+    assert df.loc[0, "t_min_daily"] == 8.0
+    assert df.loc[0, "t_max_daily"] == 24.0
+    assert df.loc[0, "daily_gdd"] == pytest.approx(6.0)
@@ -0,0 +1,92 @@
+import io
+
+import pandas as pd
+import pytest
+from botocore.exceptions import ClientError
+
+from gdd_counter import gold
+from gdd_counter.gold import update_gold_cumulative_gdd
+from universal import duckdb_utils
+from universal.processing_utils import generate_gold_cumulative_s3_key
+
+
+class DictS3Client:
+    """Keeps objects in a dict and counts the GETs."""
+
+    def __init__(self):
+        self.objects = {}
+        self.gets = 0
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.objects[Key] = Body.read() if hasattr(Body, "read") else Body
+
+    def head_object(self, Bucket, Key, **kwargs):
+        if Key not in self.objects:
+            raise ClientError({"Error": {"Code": "404"}}, "HeadObject")
+        return {}
+
+    def get_object(self, Bucket, Key, **kwargs):
+        if Key not in self.objects:
+            raise ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+        self.gets += 1
+        return {"Body": io.BytesIO(self.objects[Key])}
+
+
+@pytest.fixture
+def gold_config(monkeypatch):
+    monkeypatch.setattr(gold.app_config, "STORAGE_BACKEND", None)
+    monkeypatch.setattr(gold.app_config, "GOLD_SEASON_START_MONTH", 10)
+    duckdb_utils.reset_duckdb_connection_cache()
+    yield
+    duckdb_utils.reset_duckdb_connection_cache()
+
+
+def _silver(dates, daily_gdd):
+    return pd.DataFrame(
+        {
+            "date": pd.to_datetime(dates),
+            "crop_id": "maize",
+            "location_id": "loc1",
+            "daily_gdd": daily_gdd,
+        }
+    )
+
+
+def _series(s3, season):
+    key = generate_gold_cumulative_s3_key("gold", season, "maize", "loc1")
+    df = pd.read_parquet(io.BytesIO(s3.objects[key]))
+    return list(zip(df["date"].dt.strftime("%Y-%m-%d"), df["cumulative_gdd"]))
+
+
+def test_update_gold_cumulative_gdd_continues_from_stored_totals(gold_config):
+    """Test that new and corrected days are accumulated per season from the stored totals."""
+    s3 = DictS3Client()
+    written = update_gold_cumulative_gdd(
+        _silver(["2099-09-29", "2099-09-30", "2099-10-01"], [1.0, 2.0, 4.0]),
+        "bucket",
+        "gold",
+        s3_client=s3,
+    )
+    assert written == 2
+    assert _series(s3, 2098) == [("2099-09-29", 1.0), ("2099-09-30", 3.0)]
+    assert _series(s3, 2099) == [("2099-10-01", 4.0)]
+
+    # A corrected earlier day and a new day only touch the totals from the corrected day on.
+    s3.gets = 0
+    update_gold_cumulative_gdd(
+        _silver(["2099-10-03", "2099-10-02"], [8.0, 16.0]),
+        "bucket",
+        "gold",
+        s3_client=s3,
+    )
+    update_gold_cumulative_gdd(
+        _silver(["2099-10-02"], [0.5]), "bucket", "gold", s3_client=s3
+    )
+
+    assert s3.gets == 2  # One small object per update.
+    assert _series(s3, 2099) == [
+        ("2099-10-01", 4.0),
+        ("2099-10-02", 4.5),
+        ("2099-10-03", 12.5),
+    ]
+    assert _series(s3, 2098) == [("2099-09-29", 1.0), ("2099-09-30", 3.0)]
@@ -0,0 +1,139 @@
+import duckdb
+import numpy as np
+import pandas as pd
+import pytest
+
+from gdd_counter import calculator
+from gdd_counter.methods import (
+    average_gdd,
+    capped_gdd,
+    degree_hours_gdd,
+    degree_hours_sql,
+    single_sine_gdd,
+    single_triangle_gdd,
+)
+from universal import duckdb_utils
+from universal.processing_utils import generate_partitioned_s3_key
+
+# Days below the base, crossing it, between the thresholds, crossing both, crossing
+# the cutoff, above the cutoff, and constant.
+T_MIN = np.array([2.0, 5.0, 12.0, 6.0, 18.0, 31.0, 15.0])
+T_MAX = np.array([8.0, 20.0, 25.0, 36.0, 34.0, 40.0, 15.0])
+
+
+def _integrate(curve, t_base, t_upper):
+    """Mean degrees between base and cutoff of one day sampled finely along a curve."""
+    phase = np.linspace(0.0, 1.0, 200_001)
+    temperatures = curve(phase)
+    return np.clip(temperatures, t_base, t_upper).mean(axis=1) - t_base
+
+
+def _sine(phase):
+    mean, amplitude = (T_MAX + T_MIN) / 2, (T_MAX - T_MIN) / 2
+    return mean[:, None] + amplitude[:, None] * np.sin(2 * np.pi * phase)
+
+
+def _triangle(phase):
+    rising = 1 - np.abs(2 * phase - 1)
+    return T_MIN[:, None] + (T_MAX - T_MIN)[:, None] * rising
+
+
+@pytest.mark.parametrize("t_upper", [30.0, np.nan])
+def test_sine_and_triangle_match_their_curves(t_upper):
+    """Test that the closed forms equal the mean degrees along a sine and a triangle day."""
+    cutoff = np.inf if np.isnan(t_upper) else t_upper
+    np.testing.assert_allclose(
+        single_sine_gdd(T_MIN, T_MAX, 10.0, t_upper),
+        _integrate(_sine, 10.0, cutoff),
+        atol=1e-4,
+    )
+    np.testing.assert_allclose(
+        single_triangle_gdd(T_MIN, T_MAX, 10.0, t_upper),
+        _integrate(_triangle, 10.0, cutoff),
+        atol=1e-4,
+    )
+
+
+def test_average_and_capped_methods():
+    """Test the classic average and the modified average with base and cutoff."""
+    np.testing.assert_allclose(
+        average_gdd(T_MIN, T_MAX, 10.0), [0.0, 2.5, 8.5, 11.0, 16.0, 25.5, 5.0]
+    )
+    np.testing.assert_allclose(
+        capped_gdd(T_MIN, T_MAX, 10.0, 30.0), [0.0, 5.0, 8.5, 10.0, 14.0, 20.0, 5.0]
+    )
+
+
+def test_degree_hours_kernel_matches_sql():
+    """Test that the NumPy and DuckDB degree-hours agree, with and without a cutoff."""
+    rng = np.random.default_rng(0)
+    readings = pd.DataFrame(
+        {
+            "day": np.repeat(np.arange(50), 24),
+            "temperature": rng.uniform(0, 40, 50 * 24),
+            "t_base": 10.0,
+            "t_upper": np.where(np.arange(50 * 24) < 600, 30.0, np.nan),
+        }
+    )
+    con = duckdb.connect()
+    con.register("readings", readings)
+    sql_gdd = (
+        con.execute(
+            f"SELECT {degree_hours_sql('temperature', 't_base', 't_upper')} "
+            "FROM readings GROUP BY day ORDER BY day;"
+        )
+        .fetchnumpy()
+        .popitem()[1]
+    )
+    np.testing.assert_allclose(
+        degree_hours_gdd(
+            readings["temperature"],
+            readings["day"],
+            readings["t_base"],
+            readings["t_upper"],
+        ),
+        sql_gdd,
+    )
+
+
+def test_calculate_daily_gdd_applies_each_crops_method(tmp_path, monkeypatch):
+    """Test that the calculator uses the configured method and cutoff of each crop."""
+    monkeypatch.setattr(calculator.app_config, "STORAGE_BACKEND", None)
+    monkeypatch.setattr(calculator.app_config, "BRONZE_WRITE_MODE", "rewrite")
+    monkeypatch.setattr(calculator.app_config, "GDD_DEFAULT_METHOD", "average")
+    monkeypatch.setattr(
+        calculator.app_config, "GDD_METHOD_MAP", {"sorghum": "degree_hours"}
+    )
+    duckdb_utils.reset_duckdb_connection_cache()
+    temperatures = np.concatenate([np.full(12, 6.0), np.full(12, 36.0)])
+    for crop_id in ("maize", "sorghum"):
+        path = tmp_path / generate_partitioned_s3_key(
+            "bronze", 2099, 5, "2099-05-26", crop_id, "loc1"
+        )
+        path.parent.mkdir(parents=True)
+        pd.DataFrame(
+            {
+                "timestamp": pd.date_range(
+                    "2099-05-26", periods=24, freq="h", tz="UTC"
+                ),
+                "air_temperature": temperatures,
+                "crop_id": crop_id,
+                "location_id": "loc1",
+            }
+        ).to_parquet(path, index=False)
+
+    try:
+        df = calculator.calculate_daily_gdd(
+            [
+                f"{tmp_path}/bronze/year=2099/month=05/crop_id=*/location_id=*/data_2099-05-26.parquet"
+            ]
+        ).set_index("crop_id")
+    finally:
+        duckdb_utils.reset_duckdb_connection_cache()
+
+    assert df.loc["maize", "gdd_method"] == "average"
+    assert df.loc["maize", "daily_gdd"] == pytest.approx(11.0)
+    # Half the hours at 36 °C count 26 degrees above the base; sorghum has no cutoff.
+    assert df.loc["sorghum", "gdd_method"] == "degree_hours"
+    assert np.isnan(df.loc["sorghum", "t_upper_used"])
+    assert df.loc["sorghum", "daily_gdd"] == pytest.approx(13.0)
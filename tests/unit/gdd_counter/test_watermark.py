@@ -0,0 +1,90 @@
+import hashlib
+import io
+
+from botocore.exceptions import ClientError
+
+from gdd_counter.watermark import (
+    bronze_month_prefixes,
+    find_changed_partitions,
+    list_bronze_files,
+    read_watermark,
+    write_watermark,
+)
+
+
+class ListingS3Client:
+    """Keeps objects in a dict and lists them with their ETags."""
+
+    def __init__(self):
+        self.objects = {}
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.objects[Key] = Body
+
+    def head_object(self, Bucket, Key, **kwargs):
+        if Key not in self.objects:
+            raise ClientError({"Error": {"Code": "404"}}, "HeadObject")
+        return {}
+
+    def get_object(self, Bucket, Key, **kwargs):
+        if Key not in self.objects:
+            raise ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+        return {"Body": io.BytesIO(self.objects[Key])}
+
+    def list_objects_v2(self, Bucket, Prefix="", **kwargs):
+        keys = sorted(key for key in self.objects if key.startswith(Prefix))
+        contents = [
+            {"Key": key, "ETag": '"' + hashlib.md5(self.objects[key]).hexdigest() + '"'}
+            for key in keys
+        ]
+        return {"Contents": contents, "IsTruncated": False}
+
+
+def _put_bronze(s3, day_str: str, location_id: str, body: bytes, name: str = "data"):
+    year, month = day_str[:4], day_str[5:7]
+    suffix = "" if name == "data" else "_20990101T000000000000Z_0000abcd"
+    s3.put_object(
+        Bucket="bucket",
+        Key=f"bronze/year={year}/month={month}/crop_id=maize/location_id={location_id}"
+        f"/{name}_{day_str}{suffix}.parquet",
+        Body=body,
+    )
+
+
+def _changed(s3, start_date_str=None, end_date_str=None):
+    prefixes = bronze_month_prefixes("bronze", start_date_str, end_date_str)
+    df_files = list_bronze_files(s3, "bucket", prefixes)
+    df_watermark = read_watermark(s3, "bucket", "silver")
+    df_changed = find_changed_partitions(
+        df_files, df_watermark, start_date_str, end_date_str
+    )
+    write_watermark(
+        s3, "bucket", "silver", df_watermark, df_files, start_date_str, end_date_str
+    )
+    return list(df_changed.itertuples(index=False, name=None))
+
+
+def test_watermark_reports_only_new_or_rewritten_partitions():
+    """Test that consumed files are not reported again and that deltas and rewrites are."""
+    s3 = ListingS3Client()
+    _put_bronze(s3, "2099-04-30", "loc1", b"a")
+    _put_bronze(s3, "2099-05-01", "loc1", b"b")
+    _put_bronze(s3, "2099-05-01", "loc2", b"c")
+    s3.put_object(
+        Bucket="bucket",
+        Key="bronze/year=2099/month=05/crop_id=maize/compacted_2099-05.parquet",
+        Body=b"d",
+    )
+    assert _changed(s3) == [
+        ("2099-04-30", "maize", "loc1"),
+        ("2099-05-01", "maize", "loc1"),
+        ("2099-05-01", "maize", "loc2"),
+    ]
+    assert _changed(s3) == []
+
+    _put_bronze(s3, "2099-05-01", "loc2", b"c2")
+    _put_bronze(s3, "2099-04-30", "loc1", b"e", name="delta")
+    # A run bounded to May leaves the April change for a later run.
+    assert _changed(s3, "2099-05-01", "2099-05-31") == [("2099-05-01", "maize", "loc2")]
+    assert _changed(s3) == [("2099-04-30", "maize", "loc1")]
+    assert _changed(s3) == []
@@ -0,0 +1,133 @@
+import json
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import pytest
+import requests
+
+from scripts.benchmark_fetcher import InMemoryS3Client, write_registry
+from scripts.mock_met_server import MockMetServer, rebase_forecast
+
+
+@pytest.fixture
+def start_server():
+    """Starts mock servers with the given options and stops them after the test."""
+    servers = []
+
+    def start(**kwargs) -> MockMetServer:
+        servers.append(MockMetServer(**kwargs).start())
+        return servers[-1]
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+def test_mock_server_serves_synthetic_forecasts_with_cache_headers(start_server):
+    """Test that a coordinate gets a 72-hour document starting today, with its 'Expires' lifetime."""
+    server = start_server(expires_seconds=600)
+
+    response = requests.get(server.url, params={"lat": 15.85, "lon": 74.5}, timeout=5)
+
+    assert response.status_code == 200
+    timeseries = response.json()["properties"]["timeseries"]
+    assert len(timeseries) == 72
+    assert timeseries[0]["time"] == datetime.now(timezone.utc).strftime(
+        "%Y-%m-%dT00:00:00Z"
+    )
+    lifetime = parsedate_to_datetime(response.headers["Expires"]) - datetime.now(
+        timezone.utc
+    )
+    assert 590 <= lifetime.total_seconds() <= 600
+    again = requests.get(server.url, params={"lat": 15.85, "lon": 74.5}, timeout=5)
+    assert again.content == response.content
+
+
+def test_mock_server_answers_revalidation_with_not_modified(start_server):
+    """Test that 'If-Modified-Since' at or after 'Last-Modified' gets a 304 without body."""
+    server = start_server()
+    params = {"lat": 15.85, "lon": 74.5}
+    first = requests.get(server.url, params=params, timeout=5)
+
+    revalidated = requests.get(
+        server.url,
+        params=params,
+        headers={"If-Modified-Since": first.headers["Last-Modified"]},
+        timeout=5,
+    )
+
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert server.request_counts == {200: 1, 304: 1}
+
+
+def test_mock_server_injects_errors_and_rejects_bad_requests(start_server):
+    """Test the configured error rate and the answers to requests without coordinates."""
+    failing = start_server(error_rate=1.0)
+    healthy = start_server()
+
+    assert (
+        requests.get(failing.url, params={"lat": 1, "lon": 2}, timeout=5).status_code
+        == 503
+    )
+    assert requests.get(healthy.url, params={"lat": 1}, timeout=5).status_code == 400
+    assert requests.get(healthy.url + "/other", timeout=5).status_code == 404
+
+
+def test_mock_server_replays_a_rebased_recorded_payload(start_server, tmp_path):
+    """Test that a recorded document is served for every coordinate, shifted to the current day."""
+    payload_path = tmp_path / "forecast.json"
+    payload_path.write_text(
+        json.dumps(
+            {
+                "properties": {
+                    "timeseries": [
+                        {"time": "2025-05-26T06:00:00Z", "data": {}},
+                        {"time": "2025-05-27T07:00:00Z", "data": {}},
+                    ]
+                }
+            }
+        )
+    )
+    server = start_server(payload_path=str(payload_path))
+
+    documents = [
+        requests.get(server.url, params={"lat": lat, "lon": 0}, timeout=5).json()
+        for lat in (1, 2)
+    ]
+
+    assert documents[0] == documents[1]
+    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    times = [entry["time"] for entry in documents[0]["properties"]["timeseries"]]
+    assert times[0] == f"{today}T06:00:00Z"
+    assert times[1].endswith("T07:00:00Z") and times[1] > times[0]
+
+
+def test_rebase_forecast_rejects_documents_without_timeseries():
+    """Test that bronze records or other JSON are refused as payloads."""
+    with pytest.raises(ValueError):
+        rebase_forecast({"type": "Feature", "properties": {}})
+
+
+def test_write_registry_creates_distinct_grid_points(tmp_path):
+    """Test that the benchmark registry has one grid point per location."""
+    registry_path = tmp_path / "locations.csv"
+
+    write_registry(str(registry_path), 250)
+
+    lines = registry_path.read_text().splitlines()
+    assert lines[0] == "crop_id,location_id,lat,lon"
+    assert len({tuple(line.split(",")[2:]) for line in lines[1:]}) == 250
+
+
+def test_in_memory_s3_client_counts_calls():
+    """Test that the benchmark storage keeps objects and counts every operation."""
+    s3 = InMemoryS3Client()
+
+    s3.put_object(Bucket="bucket", Key="a/b.parquet", Body=b"data")
+    body = s3.get_object(Bucket="bucket", Key="a/b.parquet")["Body"].read()
+    listing = s3.list_objects_v2(Bucket="bucket", Prefix="a/")
+
+    assert body == b"data"
+    assert [obj["Key"] for obj in listing["Contents"]] == ["a/b.parquet"]
+    assert dict(s3.calls) == {"put_object": 1, "get_object": 1, "list_objects_v2": 1}
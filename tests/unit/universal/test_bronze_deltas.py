@@ -0,0 +1,129 @@
+import io
+from datetime import datetime, timezone
+
+import pandas as pd
+from botocore.exceptions import ClientError
+
+from data_fetcher.compaction import compact_bronze_deltas
+from data_fetcher.saver import CONTENT_HASH_METADATA_KEY
+from universal import bronze_deltas
+from universal.parquet_profile import get_parquet_profile
+from universal.processing_utils import compute_content_hash
+from universal.bronze_deltas import (
+    delta_glob_for,
+    generate_delta_s3_key,
+    read_partition_with_deltas,
+)
+
+BASE_KEY = (
+    "bronze/year=2025/month=05/crop_id=maize/location_id=loc1/data_2025-05-26.parquet"
+)
+
+
+class DictS3Client:
+    """Keeps objects in a dict and supports the calls used by the delta readers and compaction."""
+
+    def __init__(self):
+        self.objects = {}
+        self.metadata = {}
+
+    def put_object(self, Bucket, Key, Body, Metadata=None, **kwargs):
+        self.objects[Key] = Body
+        self.metadata[Key] = Metadata or {}
+
+    def get_object(self, Bucket, Key, **kwargs):
+        if Key not in self.objects:
+            raise ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+        return {"Body": io.BytesIO(self.objects[Key])}
+
+    def list_objects_v2(self, Bucket, Prefix="", **kwargs):
+        keys = sorted(key for key in self.objects if key.startswith(Prefix))
+        return {"Contents": [{"Key": key} for key in keys], "IsTruncated": False}
+
+    def delete_objects(self, Bucket, Delete, **kwargs):
+        for obj in Delete["Objects"]:
+            self.objects.pop(obj["Key"], None)
+
+
+def _parquet(temperatures: dict[int, float]) -> bytes:
+    df = pd.DataFrame(
+        {
+            "timestamp": [
+                pd.Timestamp(f"2025-05-26 {hour:02d}:00", tz="UTC")
+                for hour in temperatures
+            ],
+            "air_temperature": list(temperatures.values()),
+            "crop_id": "maize",
+            "location_id": "loc1",
+        }
+    )
+    buffer = io.BytesIO()
+    df.to_parquet(buffer, index=False)
+    return buffer.getvalue()
+
+
+def _write_delta(s3, hour_of_write: int, temperatures: dict[int, float]) -> str:
+    key = generate_delta_s3_key(
+        BASE_KEY, datetime(2025, 5, 26, hour_of_write, tzinfo=timezone.utc)
+    )
+    s3.put_object(Bucket="bucket", Key=key, Body=_parquet(temperatures))
+    return key
+
+
+def test_delta_keys_sort_after_the_partition_file_by_write_time():
+    """Test that ordering a partition's file names orders its writes."""
+    early = generate_delta_s3_key(
+        BASE_KEY, datetime(2025, 5, 26, 6, tzinfo=timezone.utc)
+    )
+    late = generate_delta_s3_key(
+        BASE_KEY, datetime(2025, 5, 26, 18, tzinfo=timezone.utc)
+    )
+
+    assert sorted([late, early, BASE_KEY]) == [BASE_KEY, early, late]
+    assert early.rsplit("/", 1)[0] == BASE_KEY.rsplit("/", 1)[0]
+    assert delta_glob_for("s3://b/bronze/*/data_2025-05-26.parquet") == (
+        "s3://b/bronze/*/delta_2025-05-26_*.parquet"
+    )
+    assert delta_glob_for("s3://b/bronze/year=2025/*/*/*.parquet") is None
+
+
+def test_read_partition_with_deltas_applies_last_write_wins():
+    """Test that later deltas override earlier deltas and the partition file per hour."""
+    s3 = DictS3Client()
+    s3.put_object(Bucket="bucket", Key=BASE_KEY, Body=_parquet({0: 10.0, 1: 11.0}))
+    _write_delta(s3, 6, {1: 21.0, 2: 22.0})
+    _write_delta(s3, 18, {2: 32.0})
+    # A delta of another day in the same directory is not part of the partition.
+    s3.put_object(
+        Bucket="bucket",
+        Key=BASE_KEY.replace("data_2025-05-26", "delta_2025-05-27_x"),
+        Body=_parquet({3: 99.0}),
+    )
+
+    df, delta_keys = read_partition_with_deltas(s3, "bucket", BASE_KEY)
+
+    assert len(delta_keys) == 2
+    assert df["air_temperature"].tolist() == [10.0, 21.0, 32.0]
+
+
+def test_compact_bronze_deltas_folds_deltas_into_the_partition_file(monkeypatch):
+    """Test that compaction keeps what readers see and removes the merged deltas."""
+    monkeypatch.setattr(bronze_deltas.app_config, "STORAGE_BACKEND", "minio")
+    monkeypatch.setattr(bronze_deltas.app_config, "MINIO_DATA_BUCKET_NAME", "bucket")
+    monkeypatch.setattr(bronze_deltas.app_config, "BRONZE_PREFIX", "bronze")
+    s3 = DictS3Client()
+    _write_delta(s3, 6, {0: 10.0, 1: 11.0})
+    _write_delta(s3, 18, {1: 21.0})
+    df_before, _ = read_partition_with_deltas(s3, "bucket", BASE_KEY)
+
+    result = compact_bronze_deltas("2025-05-26", "2025-05-26", s3_client=s3)
+
+    assert result == {"partitions": 1, "deltas": 2, "failed": 0}
+    assert [key for key in s3.objects if "/_manifests/" not in key] == [BASE_KEY]
+    df_after, delta_keys = read_partition_with_deltas(s3, "bucket", BASE_KEY)
+    assert delta_keys == []
+    pd.testing.assert_frame_equal(df_after, df_before)
+    # The canonical file carries the content hash the fetcher compares against.
+    assert s3.metadata[BASE_KEY][CONTENT_HASH_METADATA_KEY] == compute_content_hash(
+        df_after, get_parquet_profile()
+    )
@@ -0,0 +1,212 @@
+import hashlib
+import io
+from datetime import date
+
+import pandas as pd
+import pytest
+from botocore.exceptions import ClientError
+
+from data_fetcher.monthly_compaction import compact_bronze_month
+from gdd_counter.monthly_compaction import compact_silver_month
+from universal import monthly_compaction
+from universal.bronze_deltas import read_bronze_partition
+from universal.compacted_files import compacted_globs_for, generate_compacted_s3_key
+from universal.processing_utils import generate_partitioned_s3_key
+
+TODAY = date(2025, 6, 15)
+
+
+class DictS3Client:
+    """Keeps objects in a dict and supports the calls used by the compaction and its readers."""
+
+    def __init__(self):
+        self.objects = {}
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.objects[Key] = Body
+
+    def _etag(self, Key):
+        return f'"{hashlib.md5(self.objects[Key]).hexdigest()}"'
+
+    def head_object(self, Bucket, Key, **kwargs):
+        if Key not in self.objects:
+            raise ClientError({"Error": {"Code": "404"}}, "HeadObject")
+        return {"ETag": self._etag(Key)}
+
+    def get_object(self, Bucket, Key, **kwargs):
+        if Key not in self.objects:
+            raise ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+        return {"Body": io.BytesIO(self.objects[Key]), "ETag": self._etag(Key)}
+
+    def list_objects_v2(self, Bucket, Prefix="", **kwargs):
+        keys = sorted(key for key in self.objects if key.startswith(Prefix))
+        return {"Contents": [{"Key": key} for key in keys], "IsTruncated": False}
+
+    def delete_objects(self, Bucket, Delete, **kwargs):
+        for obj in Delete["Objects"]:
+            self.objects.pop(obj["Key"], None)
+
+
+def _day_key(day_str: str, location_id: str) -> str:
+    return generate_partitioned_s3_key("bronze", 2025, 5, day_str, "maize", location_id)
+
+
+def _write_day(s3, day_str: str, location_id: str, temperature: float):
+    df = pd.DataFrame(
+        {
+            "timestamp": pd.date_range(
+                pd.Timestamp(day_str, tz="UTC"), periods=3, freq="h"
+            ),
+            "air_temperature": temperature,
+            "crop_id": "maize",
+            "location_id": location_id,
+        }
+    )
+    buffer = io.BytesIO()
+    df.to_parquet(buffer, index=False)
+    s3.put_object(
+        Bucket="bucket", Key=_day_key(day_str, location_id), Body=buffer.getvalue()
+    )
+
+
+@pytest.fixture
+def bronze_month(monkeypatch):
+    monkeypatch.setattr(monthly_compaction.app_config, "STORAGE_BACKEND", "minio")
+    monkeypatch.setattr(
+        monthly_compaction.app_config, "MINIO_DATA_BUCKET_NAME", "bucket"
+    )
+    monkeypatch.setattr(monthly_compaction.app_config, "BRONZE_PREFIX", "bronze")
+    monkeypatch.setattr(monthly_compaction.app_config, "BRONZE_WRITE_MODE", "rewrite")
+    s3 = DictS3Client()
+    for day_str in ("2025-05-25", "2025-05-26"):
+        for location_id in ("loc1", "loc2"):
+            _write_day(s3, day_str, location_id, 20.0)
+    return s3
+
+
+@pytest.mark.parametrize("granularity", ["location", "crop"])
+def test_compact_month_keeps_what_readers_see(bronze_month, granularity):
+    """Test that compacted months read as their day files did, and later day files win."""
+    s3 = bronze_month
+    before = read_bronze_partition(s3, "bucket", _day_key("2025-05-26", "loc2"))
+
+    result = compact_bronze_month(
+        "2025-05", granularity=granularity, s3_client=s3, today=TODAY
+    )
+
+    location_id = "loc2" if granularity == "location" else None
+    compacted_key = generate_compacted_s3_key("bronze", 2025, 5, "maize", location_id)
+    assert result == {
+        "files": 2 if granularity == "location" else 1,
+        "sources": 4,
+        "failed": 0,
+    }
+    assert compacted_key in s3.objects
+    assert not any("/data_" in key for key in s3.objects)
+    after = read_bronze_partition(s3, "bucket", _day_key("2025-05-26", "loc2"))
+    pd.testing.assert_frame_equal(after, before)
+
+    # A day file written after compaction overrides the compacted rows of its hours.
+    _write_day(s3, "2025-05-26", "loc2", 30.0)
+    cache = {}
+    merged = read_bronze_partition(
+        s3, "bucket", _day_key("2025-05-26", "loc2"), compacted_cache=cache
+    )
+    assert merged["air_temperature"].tolist() == [30.0] * 3
+    other_day = read_bronze_partition(
+        s3, "bucket", _day_key("2025-05-25", "loc2"), compacted_cache=cache
+    )
+    assert other_day["air_temperature"].tolist() == [20.0] * 3
+
+
+def test_compact_month_keeps_sources_rewritten_during_compaction(
+    bronze_month, monkeypatch
+):
+    """Test that a day file rewritten between its read and the delete is not deleted."""
+    s3 = bronze_month
+    rewritten_key = _day_key("2025-05-26", "loc2")
+    put_object = s3.put_object
+
+    def put_object_and_rewrite(Bucket, Key, Body, **kwargs):
+        put_object(Bucket=Bucket, Key=Key, Body=Body, **kwargs)
+        if Key.endswith("compacted_2025-05.parquet"):
+            # A re-derivation rewrites the day file while its location is compacted.
+            _write_day(s3, "2025-05-26", "loc2", 30.0)
+
+    monkeypatch.setattr(s3, "put_object", put_object_and_rewrite)
+
+    result = compact_bronze_month(
+        "2025-05", granularity="crop", s3_client=s3, today=TODAY
+    )
+
+    assert result == {"files": 1, "sources": 3, "failed": 0}
+    assert [key for key in s3.objects if "/data_" in key] == [rewritten_key]
+    # The rewritten rows win over the compacted ones and are folded in by the next run.
+    merged = read_bronze_partition(s3, "bucket", rewritten_key)
+    assert merged["air_temperature"].tolist() == [30.0] * 3
+    monkeypatch.setattr(s3, "put_object", put_object)
+    assert compact_bronze_month(
+        "2025-05", granularity="crop", s3_client=s3, today=TODAY
+    ) == {"files": 1, "sources": 1, "failed": 0}
+    assert not any("/data_" in key for key in s3.objects)
+
+
+def test_compact_month_refuses_open_months(bronze_month):
+    """Test that the current month is not compacted and has no compacted globs."""
+    with pytest.raises(ValueError, match="has not ended"):
+        compact_bronze_month("2025-06", s3_client=bronze_month, today=TODAY)
+    assert (
+        compacted_globs_for(
+            "s3://b/bronze/year=2025/month=06/crop_id=*/location_id=*/data_2025-06-01.parquet",
+            today=TODAY,
+        )
+        == []
+    )
+    assert compacted_globs_for(
+        "s3://b/bronze/year=2025/month=05/crop_id=*/location_id=*/data_2025-05-26.parquet",
+        today=TODAY,
+    ) == [
+        (
+            "s3://b/bronze/year=2025/month=05/crop_id=*/compacted_2025-05.parquet",
+            "2025-05-26",
+        ),
+        (
+            "s3://b/bronze/year=2025/month=05/crop_id=*/location_id=*/compacted_2025-05.parquet",
+            "2025-05-26",
+        ),
+    ]
+
+
+def test_compact_silver_month_uses_the_silver_layout(bronze_month, monkeypatch):
+    """Test that the silver entry point compacts the silver layer only, by date."""
+    monkeypatch.setattr(monthly_compaction.app_config, "SILVER_PREFIX", "silver")
+    s3 = bronze_month
+    for day_str, daily_gdd in (("2025-05-26", 5.0), ("2025-05-25", 4.0)):
+        buffer = io.BytesIO()
+        pd.DataFrame(
+            {
+                "date": [pd.Timestamp(day_str)],
+                "crop_id": "maize",
+                "location_id": "loc1",
+                "daily_gdd": daily_gdd,
+            }
+        ).to_parquet(buffer, index=False)
+        s3.put_object(
+            Bucket="bucket",
+            Key=generate_partitioned_s3_key(
+                "silver", 2025, 5, day_str, "maize", "loc1"
+            ),
+            Body=buffer.getvalue(),
+        )
+    bronze_keys = {key for key in s3.objects if key.startswith("bronze/")}
+
+    result = compact_silver_month(
+        "2025-05", granularity="crop", s3_client=s3, today=TODAY
+    )
+
+    assert result == {"files": 1, "sources": 2, "failed": 0}
+    assert {key for key in s3.objects if key.startswith("bronze/")} == bronze_keys
+    compacted = pd.read_parquet(
+        io.BytesIO(s3.objects[generate_compacted_s3_key("silver", 2025, 5, "maize")])
+    )
+    assert compacted["daily_gdd"].tolist() == [4.0, 5.0]
@@ -0,0 +1,58 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from universal import duckdb_utils
+
+
+@pytest.fixture
+def local_engine(monkeypatch):
+    """Configures a local-only engine and starts and ends with an empty database cache."""
+    monkeypatch.setattr(duckdb_utils.app_config, "STORAGE_BACKEND", None)
+    monkeypatch.setattr(duckdb_utils.app_config, "DUCKDB_THREADS", "2")
+    monkeypatch.setattr(duckdb_utils.app_config, "DUCKDB_MEMORY_LIMIT", "256MiB")
+    duckdb_utils.reset_duckdb_connection_cache()
+    yield
+    duckdb_utils.reset_duckdb_connection_cache()
+
+
+def _setting(con, name):
+    return con.execute("SELECT current_setting(?);", [name]).fetchone()[0]
+
+
+def test_connections_share_one_configured_database(local_engine):
+    """Test that concurrent callers get their own connections to one configured database."""
+    first = duckdb_utils.get_duckdb_connection()
+    first.execute("CREATE TABLE shared AS SELECT 1 AS x;")
+
+    def query(_):
+        con = duckdb_utils.get_duckdb_connection()
+        try:
+            return con.execute("SELECT x FROM shared;").fetchone()[0]
+        finally:
+            con.close()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert list(executor.map(query, range(8))) == [1] * 8
+
+    # Closing a connection leaves the database open for the others.
+    first.close()
+    con = duckdb_utils.get_duckdb_connection()
+    assert con.execute("SELECT x FROM shared;").fetchone()[0] == 1
+    assert _setting(con, "threads") == 2
+    assert _setting(con, "memory_limit") == "256.0 MiB"
+    assert _setting(con, "enable_object_cache") is True
+    assert _setting(con, "TimeZone") == "UTC"
+
+
+def test_reset_duckdb_connection_cache_creates_a_new_database(local_engine):
+    """Test that the reset hook drops the cached database."""
+    con = duckdb_utils.get_duckdb_connection()
+    con.execute("CREATE TABLE dropped AS SELECT 1 AS x;")
+
+    duckdb_utils.reset_duckdb_connection_cache()
+
+    con = duckdb_utils.get_duckdb_connection()
+    assert con.execute(
+        "SELECT count(*) FROM duckdb_tables() WHERE table_name = 'dropped';"
+    ).fetchone() == (0,)
@@ -0,0 +1,201 @@
+import hashlib
+import io
+from datetime import datetime, timezone
+
+import pandas as pd
+import pytest
+from botocore.exceptions import ClientError
+
+from universal import manifest
+from universal.manifest import (
+    ManifestUpdateError,
+    build_manifest_entry,
+    generate_manifest_s3_key,
+    query_manifest,
+    update_manifest,
+    update_manifests,
+)
+from universal.processing_utils import (
+    compute_content_hash,
+    find_incomplete_partitions,
+    generate_partitioned_s3_key,
+)
+
+
+class ConditionalS3Client:
+    """Keeps objects in a dict and honours conditional PUTs on ETags."""
+
+    def __init__(self):
+        self.objects = {}
+        self.calls = []
+        self.before_put = None
+
+    def _etag(self, key):
+        return '"' + hashlib.md5(self.objects[key]).hexdigest() + '"'
+
+    def get_object(self, Bucket, Key, **kwargs):
+        self.calls.append(("get_object", Key))
+        if Key not in self.objects:
+            raise ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+        return {"Body": io.BytesIO(self.objects[Key]), "ETag": self._etag(Key)}
+
+    def put_object(self, Bucket, Key, Body, IfMatch=None, IfNoneMatch=None, **kwargs):
+        self.calls.append(("put_object", Key))
+        if self.before_put is not None:
+            # Simulates another writer replacing the object between read and write.
+            before_put, self.before_put = self.before_put, None
+            before_put()
+        exists = Key in self.objects
+        if (IfNoneMatch == "*" and exists) or (
+            IfMatch is not None and (not exists or IfMatch != self._etag(Key))
+        ):
+            raise ClientError({"Error": {"Code": "PreconditionFailed"}}, "PutObject")
+        self.objects[Key] = Body
+
+    def delete_object(self, Bucket, Key, **kwargs):
+        self.calls.append(("delete_object", Key))
+        self.objects.pop(Key, None)
+
+    def list_objects_v2(self, Bucket, Prefix="", **kwargs):
+        self.calls.append(("list_objects_v2", Prefix))
+        keys = sorted(key for key in self.objects if key.startswith(Prefix))
+        return {"Contents": [{"Key": key} for key in keys], "IsTruncated": False}
+
+
+def _entry(location_id: str, num_rows: int):
+    df = pd.DataFrame(
+        {
+            "timestamp": pd.date_range(
+                "2099-05-26", periods=num_rows, freq="h", tz="UTC"
+            ),
+            "air_temperature": 20.0,
+        }
+    )
+    key = generate_partitioned_s3_key(
+        "bronze", 2099, 5, "2099-05-26", "maize", location_id
+    )
+    return build_manifest_entry(
+        "2099-05-26",
+        "maize",
+        location_id,
+        key,
+        df,
+        "timestamp",
+        compute_content_hash(df),
+        datetime(2099, 5, 26, 6, tzinfo=timezone.utc),
+    )
+
+
+def _manifest_bytes(entries) -> bytes:
+    """Serializes entries as a manifest object."""
+    s3 = ConditionalS3Client()
+    update_manifest(s3, "bucket", "bronze", 2099, 5, entries)
+    return s3.objects[generate_manifest_s3_key("bronze", 2099, 5)]
+
+
+def test_update_manifest_keeps_concurrent_entries():
+    """Test that an update that loses a race retries on the new manifest instead of overwriting it."""
+    s3 = ConditionalS3Client()
+    update_manifest(s3, "bucket", "bronze", 2099, 5, [_entry("loc1", 24)])
+    s3.before_put = lambda: update_manifest(
+        s3, "bucket", "bronze", 2099, 5, [_entry("loc2", 24)]
+    )
+
+    update_manifest(
+        s3,
+        "bucket",
+        "bronze",
+        2099,
+        5,
+        [_entry("loc3", 10)],
+        removed_keys={_entry("loc1", 24).key},
+    )
+
+    df = query_manifest(s3, "bucket", "bronze", "2099-05-26", "2099-05-26")
+    assert df["location_id"].tolist() == ["loc2", "loc3"]
+    assert df["num_rows"].tolist() == [24, 10]
+    assert df["max_time"].iloc[1] == pd.Timestamp("2099-05-26 09:00", tz="UTC")
+    assert generate_manifest_s3_key("bronze", 2099, 5) in s3.objects
+
+
+def test_find_incomplete_partitions_trusts_complete_manifest_entries():
+    """Test that partitions recorded as complete in the manifest are not listed or read."""
+    s3 = ConditionalS3Client()
+    update_manifest(
+        s3, "bucket", "bronze", 2099, 5, [_entry("loc1", 24), _entry("loc2", 24)]
+    )
+    s3.calls.clear()
+
+    incomplete = find_incomplete_partitions(
+        s3,
+        "bucket",
+        "bronze",
+        datetime(2099, 5, 26, tzinfo=timezone.utc),
+        [("maize", "loc1"), ("maize", "loc2")],
+    )
+
+    assert incomplete == []
+    assert s3.calls == [("get_object", generate_manifest_s3_key("bronze", 2099, 5))]
+
+
+class UnconditionalS3Client(ConditionalS3Client):
+    """A store without conditional writes, rejecting PUTs with If-Match / If-None-Match."""
+
+    def __init__(self, delete_fails: bool = False):
+        super().__init__()
+        self.delete_fails = delete_fails
+
+    def put_object(self, Bucket, Key, Body, IfMatch=None, IfNoneMatch=None, **kwargs):
+        if IfMatch is not None or IfNoneMatch is not None:
+            raise ClientError({"Error": {"Code": "NotImplemented"}}, "PutObject")
+        super().put_object(Bucket, Key, Body)
+
+    def delete_object(self, Bucket, Key, **kwargs):
+        if self.delete_fails:
+            raise ClientError({"Error": {"Code": "AccessDenied"}}, "DeleteObject")
+        super().delete_object(Bucket, Key)
+
+
+def test_failed_manifest_update_deletes_the_stale_manifest():
+    """Test that a manifest that cannot be updated is deleted, so readers list instead."""
+    s3 = UnconditionalS3Client()
+    manifest_key = generate_manifest_s3_key("bronze", 2099, 5)
+    # A manifest written earlier, recording loc1 as complete.
+    ConditionalS3Client.put_object(
+        s3, "bucket", manifest_key, _manifest_bytes([_entry("loc1", 24)])
+    )
+
+    assert update_manifests(s3, "bucket", "bronze", [_entry("loc2", 24)]) is False
+
+    assert manifest_key not in s3.objects
+    s3.calls.clear()
+    incomplete = find_incomplete_partitions(
+        s3,
+        "bucket",
+        "bronze",
+        datetime(2099, 5, 26, tzinfo=timezone.utc),
+        [("maize", "loc1")],
+    )
+    # loc1's file is not in the bucket: without the manifest, the listing shows it missing.
+    assert incomplete == [("maize", "loc1")]
+    assert ("list_objects_v2", "bronze/year=2099/month=05/") in s3.calls
+
+
+def test_manifest_that_can_neither_be_updated_nor_deleted_is_fatal():
+    """Test that a manifest that may stay stale fails the update."""
+    s3 = UnconditionalS3Client(delete_fails=True)
+    with pytest.raises(ManifestUpdateError):
+        update_manifests(s3, "bucket", "bronze", [_entry("loc1", 24)])
+
+
+def test_disabled_manifests_are_neither_written_nor_read(monkeypatch):
+    """Test that MANIFESTS_ENABLED=false skips the manifests entirely."""
+    monkeypatch.setattr(manifest.app_config, "MANIFESTS_ENABLED", False)
+    s3 = ConditionalS3Client()
+    s3.objects[generate_manifest_s3_key("bronze", 2099, 5)] = _manifest_bytes(
+        [_entry("loc1", 24)]
+    )
+
+    assert update_manifests(s3, "bucket", "bronze", [_entry("loc2", 24)]) is True
+    assert query_manifest(s3, "bucket", "bronze", "2099-05-26", "2099-05-26").empty
+    assert s3.calls == []
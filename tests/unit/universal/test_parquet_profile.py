@@ -0,0 +1,53 @@
+import io
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from universal.parquet_profile import get_parquet_profile, parquet_bytes
+
+
+def _bronze_rows() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "timestamp": pd.to_datetime(
+                ["2025-05-26T02:00Z", "2025-05-26T00:00Z", "2025-05-26T01:00Z"]
+            ),
+            "air_temperature": [22.1, 20.1, 21.1],
+            "relative_humidity": [50.0, 51.0, 52.0],
+            "crop_id": "maize",
+            "location_id": "loc1",
+        }
+    )
+
+
+def test_default_profile_matches_to_parquet_defaults():
+    """Test that the default profile keeps row order, types and snappy compression."""
+    data = parquet_bytes(_bronze_rows(), get_parquet_profile("default"))
+
+    metadata = pq.ParquetFile(pa.BufferReader(data)).metadata
+    assert metadata.row_group(0).column(0).compression == "SNAPPY"
+    pd.testing.assert_frame_equal(pd.read_parquet(io.BytesIO(data)), _bronze_rows())
+
+
+def test_compact_profile_sorts_and_narrows_temperatures():
+    """Test that the compact profile writes zstd, sorted by time, with float32 temperatures."""
+    data = parquet_bytes(_bronze_rows(), get_parquet_profile("compact"))
+
+    parquet_file = pq.ParquetFile(pa.BufferReader(data))
+    column = parquet_file.metadata.row_group(0).column(0)
+    assert column.compression == "ZSTD"
+    assert column.statistics.has_min_max
+    schema = parquet_file.schema_arrow
+    assert schema.field("air_temperature").type == pa.float32()
+    assert schema.field("relative_humidity").type == pa.float64()
+    df = pd.read_parquet(io.BytesIO(data))
+    assert df["timestamp"].is_monotonic_increasing
+    assert df["air_temperature"].astype(float).round(1).tolist() == [20.1, 21.1, 22.1]
+
+
+def test_get_parquet_profile_rejects_unknown_names():
+    """Test that an unknown profile name is reported with the valid names."""
+    with pytest.raises(ValueError, match="Unknown Parquet profile 'fast'"):
+        get_parquet_profile("fast")
@@ -0,0 +1,78 @@
+import io
+from datetime import datetime, timezone
+
+import pandas as pd
+from botocore.exceptions import ClientError
+
+from universal.processing_utils import (
+    find_incomplete_partitions,
+    generate_partitioned_s3_key,
+)
+
+DAY = datetime(2099, 5, 26, tzinfo=timezone.utc)
+
+
+class RangeS3Client:
+    """Keeps objects in a dict, serves suffix byte ranges and records the calls made."""
+
+    def __init__(self):
+        self.objects = {}
+        self.calls = []
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.objects[Key] = Body
+
+    def get_object(self, Bucket, Key, Range=None, **kwargs):
+        self.calls.append(("get_object", Range))
+        if Key not in self.objects:
+            raise ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+        body = self.objects[Key]
+        if Range is not None:
+            body = body[-int(Range.removeprefix("bytes=-")) :]
+        return {"Body": io.BytesIO(body)}
+
+    def list_objects_v2(self, Bucket, Prefix="", **kwargs):
+        self.calls.append(("list_objects_v2", Prefix))
+        keys = sorted(key for key in self.objects if key.startswith(Prefix))
+        return {"Contents": [{"Key": key} for key in keys], "IsTruncated": False}
+
+
+def _write_partition(s3, location_id: str, num_rows: int):
+    df = pd.DataFrame(
+        {
+            "timestamp": pd.date_range(DAY, periods=num_rows, freq="h"),
+            "air_temperature": 20.0,
+            "crop_id": "maize",
+            "location_id": location_id,
+        }
+    )
+    buffer = io.BytesIO()
+    df.to_parquet(buffer, index=False)
+    key = generate_partitioned_s3_key(
+        "bronze", DAY.year, DAY.month, "2099-05-26", "maize", location_id
+    )
+    s3.put_object(Bucket="bucket", Key=key, Body=buffer.getvalue())
+
+
+def test_find_incomplete_partitions_reads_only_footers():
+    """Test that one listing and one ranged GET per existing file find short and missing partitions."""
+    # The month has no manifest, so every partition is probed.
+    s3 = RangeS3Client()
+    _write_partition(s3, "full", 24)
+    _write_partition(s3, "short", 10)
+
+    incomplete = find_incomplete_partitions(
+        s3,
+        "bucket",
+        "bronze",
+        DAY,
+        [("maize", "full"), ("maize", "short"), ("maize", "missing")],
+    )
+
+    assert incomplete == [("maize", "short"), ("maize", "missing")]
+    assert sorted(s3.calls, key=str) == [
+        ("get_object", "bytes=-65536"),
+        ("get_object", "bytes=-65536"),
+        ("get_object", None),
+        ("list_objects_v2", "bronze/year=2099/month=05/"),
+    ]
@@ -0,0 +1,50 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from universal import s3_utils
+
+
+@pytest.fixture
+def minio_config(monkeypatch):
+    """Configures the MinIO backend and starts and ends with an empty client cache."""
+    monkeypatch.setattr(s3_utils.app_config, "STORAGE_BACKEND", "minio")
+    monkeypatch.setattr(
+        s3_utils.app_config, "MINIO_ENDPOINT_URL", "http://localhost:9000"
+    )
+    monkeypatch.setattr(s3_utils.app_config, "MINIO_ACCESS_KEY", "access")
+    monkeypatch.setattr(s3_utils.app_config, "MINIO_SECRET_KEY", "secret")
+    monkeypatch.setattr(s3_utils.app_config, "S3_MAX_POOL_CONNECTIONS", 17)
+    s3_utils.reset_s3_client_cache()
+    yield
+    s3_utils.reset_s3_client_cache()
+
+
+def test_get_s3_client_is_shared_across_threads(minio_config):
+    """Test that concurrent callers get one client with the configured pool and retries."""
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        clients = list(executor.map(lambda _: s3_utils.get_s3_client(), range(32)))
+
+    assert all(client is clients[0] for client in clients)
+    config = clients[0].meta.config
+    assert config.max_pool_connections == 17
+    assert config.retries["mode"] == "adaptive"
+
+
+def test_reset_s3_client_cache_creates_a_new_client(minio_config):
+    """Test that the reset hook drops the cached client."""
+    first = s3_utils.get_s3_client()
+
+    s3_utils.reset_s3_client_cache()
+
+    assert s3_utils.get_s3_client() is not first
+
+
+def test_get_s3_client_does_not_cache_configuration_errors(minio_config, monkeypatch):
+    """Test that an incomplete configuration raises and is not memoized."""
+    monkeypatch.setattr(s3_utils.app_config, "MINIO_SECRET_KEY", None)
+    with pytest.raises(ValueError, match="incomplete"):
+        s3_utils.get_s3_client()
+
+    monkeypatch.setattr(s3_utils.app_config, "MINIO_SECRET_KEY", "secret")
+    assert s3_utils.get_s3_client() is not None
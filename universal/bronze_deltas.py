@@ -0,0 +1,254 @@
+"""
+Append-only delta files for bronze partitions.
+
+With BRONZE_WRITE_MODE='delta', the data fetcher does not rewrite a partition's
+canonical file ('data_<date>.parquet'). It writes the newly fetched rows as a
+small immutable delta file next to it:
+
+    bronze/year=2025/month=05/crop_id=maize/location_id=Belagavi/delta_2025-05-26_20250526T061502123456Z_1a2b3c4d.parquet
+
+Readers merge the canonical file and its deltas on the fly, with last-write-wins
+per (crop_id, location_id, timestamp): deltas override the canonical file and
+later deltas override earlier ones. The compaction job (data_fetcher.compaction)
+folds deltas into the canonical file and deletes them.
+
+Switching back to BRONZE_WRITE_MODE='rewrite' requires compacting first, since
+rewrite-mode readers ignore delta files.
+"""
+
+import io
+import logging
+import uuid
+from datetime import datetime, timezone
+
+import pandas as pd
+from botocore.exceptions import ClientError
+
+try:
+    from . import config as app_config
+    from .s3_utils import get_s3_parquet_to_df_if_exists
+    from .compacted_files import read_with_compacted
+except ImportError as e:
+    raise ImportError(
+        "CRITICAL ERROR: Could not import shared configuration or S3 utils from 'universal'. "
+        "These are dependencies for 'universal.bronze_deltas'."
+    ) from e
+
+logger = logging.getLogger(__name__)
+
+# Supported values of BRONZE_WRITE_MODE.
+BRONZE_WRITE_MODES = ("rewrite", "delta")
+
+# Columns identifying one bronze row; the last written row per key wins.
+BRONZE_ROW_KEY = ["crop_id", "location_id", "timestamp"]
+
+
+def _split_base_key(base_key: str) -> tuple[str, str]:
+    """Splits a canonical partition key into its directory and its date string."""
+    directory, filename = base_key.rsplit("/", 1)
+    if not (filename.startswith("data_") and filename.endswith(".parquet")):
+        raise ValueError(f"Not a canonical bronze partition key: '{base_key}'")
+    return directory, filename[len("data_") : -len(".parquet")]
+
+
+def generate_delta_s3_key(base_key: str, written_at: datetime | None = None) -> str:
+    """
+    Generates the key of a new delta file for a canonical partition key.
+
+    Delta names sort by write time, and after the canonical 'data_' file, so ordering
+    a partition's files by name orders them from oldest to newest.
+
+    Args:
+        base_key (str): Key of the canonical partition file (see generate_partitioned_s3_key).
+        written_at (datetime | None): Write time of the delta. Defaults to now (UTC).
+
+    Returns:
+        str: The S3 key of the delta file.
+    """
+    directory, day_str = _split_base_key(base_key)
+    written_at = (written_at or datetime.now(timezone.utc)).astimezone(timezone.utc)
+    return (
+        f"{directory}/delta_{day_str}_{written_at.strftime('%Y%m%dT%H%M%S%fZ')}"
+        f"_{uuid.uuid4().hex[:8]}.parquet"
+    )
+
+
+def delta_s3_prefix(base_key: str) -> str:
+    """Returns the key prefix shared by all delta files of a canonical partition key."""
+    directory, day_str = _split_base_key(base_key)
+    return f"{directory}/delta_{day_str}_"
+
+
+def delta_glob_for(base_glob: str) -> str | None:
+    """
+    Returns the glob matching the delta files of the partitions matched by a canonical glob.
+
+    Example: s3://bucket/bronze/.../data_2025-05-26.parquet -> s3://bucket/bronze/.../delta_2025-05-26_*.parquet
+
+    Returns:
+        str | None: The delta glob, or None if the glob does not name canonical 'data_' files
+                    (a glob such as '*.parquet' already matches the delta files).
+    """
+    directory, filename = base_glob.rsplit("/", 1)
+    if not (filename.startswith("data_") and filename.endswith(".parquet")):
+        return None
+    return f"{directory}/delta_{filename[len('data_') : -len('.parquet')]}_*.parquet"
+
+
+def merge_bronze_frames(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Merges bronze rows with last-write-wins per (crop_id, location_id, timestamp).
+
+    Args:
+        frames (list[pd.DataFrame]): Rows ordered from oldest to newest write.
+
+    Returns:
+        pd.DataFrame: The merged rows, sorted by timestamp.
+    """
+    frames = [df for df in frames if df is not None and not df.empty]
+    if not frames:
+        return pd.DataFrame()
+    combined = pd.concat(frames, ignore_index=True)
+    combined["timestamp"] = pd.to_datetime(combined["timestamp"], utc=True)
+    # A stable sort keeps later writes after earlier ones with the same timestamp.
+    return (
+        combined.sort_values(by="timestamp", kind="stable")
+        .drop_duplicates(subset=BRONZE_ROW_KEY, keep="last")
+        .reset_index(drop=True)
+    )
+
+
+def latest_rows_by_file(
+    df: pd.DataFrame, filename_column: str = "filename"
+) -> pd.DataFrame:
+    """
+    Keeps the last written row per (crop_id, location_id, timestamp) of rows read with their file names.
+
+    Canonical files and deltas of a partition share a directory and delta names sort by
+    write time after the canonical file, so ordering by file name orders by write.
+
+    Args:
+        df (pd.DataFrame): Bronze rows with a column holding the file each row was read from.
+        filename_column (str): Name of that column; it is dropped from the result.
+
+    Returns:
+        pd.DataFrame: The merged rows.
+    """
+    return (
+        df.sort_values(by=filename_column, kind="stable")
+        .drop_duplicates(subset=BRONZE_ROW_KEY, keep="last")
+        .drop(columns=[filename_column])
+        .reset_index(drop=True)
+    )
+
+
+def list_partition_files(
+    s3_client, bucket_name: str, base_key: str
+) -> tuple[bool, list[str]]:
+    """
+    Lists the canonical file and the delta files of one partition with a single listing.
+
+    Args:
+        s3_client: Initialized Boto3 S3 client.
+        bucket_name (str): Name of the S3 bucket.
+        base_key (str): Key of the canonical partition file.
+
+    Returns:
+        tuple[bool, list[str]]: Whether the canonical file exists, and the delta keys
+                                ordered from oldest to newest.
+    """
+    directory, _ = _split_base_key(base_key)
+    prefix = delta_s3_prefix(base_key)
+    has_base, delta_keys = False, []
+    # Canonical and delta names both start with 'd', which narrows the listing to data files.
+    request = {"Bucket": bucket_name, "Prefix": f"{directory}/d"}
+    while True:
+        response = s3_client.list_objects_v2(**request)
+        for obj in response.get("Contents", []):
+            if obj["Key"] == base_key:
+                has_base = True
+            elif obj["Key"].startswith(prefix):
+                delta_keys.append(obj["Key"])
+        if not response.get("IsTruncated"):
+            break
+        request["ContinuationToken"] = response["NextContinuationToken"]
+    return has_base, sorted(delta_keys)
+
+
+def _read_parquet_object(s3_client, bucket_name: str, key: str) -> pd.DataFrame:
+    response = s3_client.get_object(Bucket=bucket_name, Key=key)
+    return pd.read_parquet(io.BytesIO(response["Body"].read()))
+
+
+def read_partition_with_deltas(
+    s3_client, bucket_name: str, base_key: str
+) -> tuple[pd.DataFrame | None, list[str]]:
+    """
+    Reads a partition's canonical file and delta files and merges them.
+
+    Args:
+        s3_client: Initialized Boto3 S3 client.
+        bucket_name (str): Name of the S3 bucket.
+        base_key (str): Key of the canonical partition file.
+
+    Returns:
+        tuple[pd.DataFrame | None, list[str]]: The merged rows (None if the partition has
+                                               no files), and the delta keys merged in.
+    """
+    has_base, delta_keys = list_partition_files(s3_client, bucket_name, base_key)
+    if not has_base and not delta_keys:
+        return None, []
+    frames = (
+        [_read_parquet_object(s3_client, bucket_name, base_key)] if has_base else []
+    )
+    frames += [_read_parquet_object(s3_client, bucket_name, key) for key in delta_keys]
+    return merge_bronze_frames(frames), delta_keys
+
+
+def read_bronze_partition(
+    s3_client, bucket_name: str, base_key: str, compacted_cache: dict | None = None
+) -> pd.DataFrame | None:
+    """
+    Reads one bronze partition as readers should see it under the configured write mode.
+
+    In 'delta' mode the canonical file and its deltas are merged; otherwise only the
+    canonical file is read. Days of closed months also take their rows from the monthly
+    compacted files (see universal.compacted_files).
+
+    Args:
+        s3_client: Initialized Boto3 S3 client.
+        bucket_name (str): Name of the S3 bucket.
+        base_key (str): Key of the canonical partition file.
+        compacted_cache (dict | None): Compacted files already read, by key, shared between
+                                       calls for several days of a month.
+
+    Returns:
+        pd.DataFrame | None: The partition's rows, or None if it does not exist or cannot be read.
+    """
+    return read_with_compacted(
+        s3_client,
+        bucket_name,
+        base_key,
+        _read_bronze_day,
+        BRONZE_ROW_KEY,
+        "timestamp",
+        compacted_cache,
+    )
+
+
+def _read_bronze_day(s3_client, bucket_name: str, base_key: str) -> pd.DataFrame | None:
+    """Reads the day files of one bronze partition under the configured write mode."""
+    if app_config.BRONZE_WRITE_MODE != "delta":
+        return get_s3_parquet_to_df_if_exists(s3_client, bucket_name, base_key)
+    try:
+        df, _ = read_partition_with_deltas(s3_client, bucket_name, base_key)
+    except ClientError:
+        # Permission or bucket errors are raised, as for canonical files.
+        raise
+    except Exception as e:
+        logger.warning(
+            f"Failed to read bronze partition s3://{bucket_name}/{base_key} with its deltas: {e}. "
+            "Will proceed as if no existing data was found."
+        )
+        return None
+    return df
@@ -0,0 +1,251 @@
+"""
+Monthly compacted files of the bronze and silver layers.
+
+Day partitions ('data_<date>.parquet', see generate_partitioned_s3_key) are small,
+so a year of them for hundreds of locations means hundreds of thousands of objects
+whose LIST and GET costs are dominated by per-object overhead. The monthly
+compaction job (universal.monthly_compaction, run per layer by
+data_fetcher.monthly_compaction and gdd_counter.monthly_compaction) rolls the day
+files of a closed month into one file per (month, crop, location) or per (month, crop):
+
+    bronze/year=2025/month=05/crop_id=maize/location_id=Belagavi/compacted_2025-05.parquet
+    bronze/year=2025/month=05/crop_id=maize/compacted_2025-05.parquet
+
+and deletes the day files. For days of closed months, readers combine the rows of
+the day from the compacted files with any day file written after compaction, with
+the day file winning per row. Compacted names sort before the 'data_' and 'delta_'
+files of the same partition, so ordering a month's files by key orders them from
+oldest to newest write.
+"""
+
+import re
+from datetime import datetime, timezone
+from typing import Callable
+
+import pandas as pd
+
+try:
+    from .s3_utils import get_s3_parquet_to_df_if_exists
+except ImportError as e:
+    raise ImportError(
+        "CRITICAL ERROR: Could not import S3 utils from 'universal.s3_utils'. "
+        "This is a dependency for 'universal.compacted_files'."
+    ) from e
+
+# Supported granularities of the compacted files.
+COMPACTION_GRANULARITIES = ("location", "crop")
+
+# Columns identifying one silver row.
+SILVER_ROW_KEY = ["date", "crop_id", "location_id"]
+
+# Canonical day partition keys, as generated by generate_partitioned_s3_key.
+_DAY_KEY_PATTERN = re.compile(
+    r"^(?P<crop_directory>.*/year=(?P<year>\d{4})/month=(?P<month>\d{2})/crop_id=(?P<crop_id>[^/]+))"
+    r"/location_id=(?P<location_id>[^/]+)/data_(?P<day>\d{4}-\d{2}-\d{2})\.parquet$"
+)
+
+
+def is_closed_month(year: int | str, month: int | str, today=None) -> bool:
+    """
+    Checks whether a month has ended, so that its day partitions may be compacted.
+
+    Args:
+        year (int | str): Year of the month.
+        month (int | str): Month number.
+        today (date | None): Current date. Defaults to today (UTC).
+
+    Returns:
+        bool: True if the month lies before the current month.
+    """
+    today = today or datetime.now(timezone.utc).date()
+    return (int(year), int(month)) < (today.year, today.month)
+
+
+def generate_compacted_s3_key(
+    layer_prefix: str,
+    year: int | str,
+    month: int | str,
+    crop_id: str,
+    location_id: str | None = None,
+) -> str:
+    """
+    Generates the S3 key of a compacted month file.
+    Example: bronze/year=2025/month=05/crop_id=maize/location_id=Belagavi/compacted_2025-05.parquet
+
+    Args:
+        layer_prefix (str): Base prefix of the layer.
+        year (int | str): Year of the month.
+        month (int | str): Month number.
+        crop_id (str): Identifier of the crop.
+        location_id (str | None): Identifier of the location, or None for a file holding
+                                  every location of the crop.
+
+    Returns:
+        str: The S3 key.
+    """
+    month_str = f"{int(month):02d}"
+    directory = f"{layer_prefix}/year={year}/month={month_str}/crop_id={crop_id}"
+    if location_id is not None:
+        directory += f"/location_id={location_id}"
+    return f"{directory}/compacted_{year}-{month_str}.parquet"
+
+
+def compacted_keys_for(base_key: str) -> list[str]:
+    """
+    Returns the keys of the compacted files that may hold the rows of a day partition.
+
+    Args:
+        base_key (str): Key of the canonical day partition file.
+
+    Returns:
+        list[str]: The per-crop and the per-location compacted key, oldest layout first,
+                   or an empty list if the key is not a canonical day partition key.
+    """
+    match = _DAY_KEY_PATTERN.match(base_key)
+    if match is None:
+        return []
+    month_suffix = f"compacted_{match['year']}-{match['month']}.parquet"
+    return [
+        f"{match['crop_directory']}/{month_suffix}",
+        f"{match['crop_directory']}/location_id={match['location_id']}/{month_suffix}",
+    ]
+
+
+def compacted_globs_for(base_glob: str, today=None) -> list[tuple[str, str]]:
+    """
+    Returns the globs of the compacted files that may hold the rows matched by a day glob.
+
+    Only days of closed months have compacted files.
+    Example: s3://b/bronze/year=2025/month=05/crop_id=*/location_id=*/data_2025-05-26.parquet ->
+             [(s3://b/bronze/year=2025/month=05/crop_id=*/compacted_2025-05.parquet, '2025-05-26'),
+              (s3://b/bronze/year=2025/month=05/crop_id=*/location_id=*/compacted_2025-05.parquet, '2025-05-26')]
+
+    Args:
+        base_glob (str): Glob of canonical day partition files of one day.
+        today (date | None): Current date. Defaults to today (UTC).
+
+    Returns:
+        list[tuple[str, str]]: The compacted globs with the day whose rows must be kept,
+                               or an empty list if the glob does not name the day files
+                               of a closed month.
+    """
+    match = _DAY_KEY_PATTERN.match(base_glob)
+    if match is None or not is_closed_month(match["year"], match["month"], today):
+        return []
+    return [(glob, match["day"]) for glob in compacted_keys_for(base_glob)]
+
+
+def rows_of_day(df: pd.DataFrame, time_column: str, day_str: str) -> pd.DataFrame:
+    """Keeps the rows whose time column falls on a UTC day ('YYYY-MM-DD')."""
+    start = pd.Timestamp(day_str, tz="UTC")
+    times = pd.to_datetime(df[time_column], utc=True)
+    return df[(times >= start) & (times < start + pd.Timedelta(days=1))]
+
+
+def merge_by_row_key(
+    frames: list[pd.DataFrame], row_key: list[str], time_column: str
+) -> pd.DataFrame:
+    """
+    Merges rows with last-write-wins per row key.
+
+    Args:
+        frames (list[pd.DataFrame]): Rows ordered from oldest to newest write.
+        row_key (list[str]): Columns identifying one row.
+        time_column (str): Column the result is sorted by.
+
+    Returns:
+        pd.DataFrame: The merged rows, sorted by the time column.
+    """
+    frames = [df for df in frames if df is not None and not df.empty]
+    if not frames:
+        return pd.DataFrame()
+    return (
+        pd.concat(frames, ignore_index=True)
+        .drop_duplicates(subset=row_key, keep="last")
+        .sort_values(by=time_column, kind="stable")
+        .reset_index(drop=True)
+    )
+
+
+def read_compacted_day(
+    s3_client,
+    bucket_name: str,
+    base_key: str,
+    time_column: str,
+    compacted_cache: dict | None = None,
+) -> pd.DataFrame | None:
+    """
+    Reads the rows of a day partition from the compacted files of its month.
+
+    Args:
+        s3_client: Initialized Boto3 S3 client.
+        bucket_name (str): Name of the S3 bucket.
+        base_key (str): Key of the canonical day partition file.
+        time_column (str): Column holding the time of each row.
+        compacted_cache (dict | None): Compacted files already read, by key. Passing the
+                                       same dict when reading several days of a month
+                                       reads each compacted file once.
+
+    Returns:
+        pd.DataFrame | None: The rows of the day, per-crop file rows first, or None if no
+                             compacted file holds any.
+    """
+    match = _DAY_KEY_PATTERN.match(base_key)
+    if match is None:
+        return None
+    compacted_cache = {} if compacted_cache is None else compacted_cache
+    frames = []
+    for key in compacted_keys_for(base_key):
+        if key not in compacted_cache:
+            compacted_cache[key] = get_s3_parquet_to_df_if_exists(
+                s3_client, bucket_name, key
+            )
+        df = compacted_cache[key]
+        if df is None or df.empty:
+            continue
+        df = rows_of_day(df, time_column, match["day"])
+        if "location_id" in df.columns:
+            df = df[df["location_id"] == match["location_id"]]
+        frames.append(df)
+    frames = [df for df in frames if not df.empty]
+    if not frames:
+        return None
+    return pd.concat(frames, ignore_index=True)
+
+
+def read_with_compacted(
+    s3_client,
+    bucket_name: str,
+    base_key: str,
+    read_day: Callable[..., pd.DataFrame | None],
+    row_key: list[str],
+    time_column: str,
+    compacted_cache: dict | None = None,
+    today=None,
+) -> pd.DataFrame | None:
+    """
+    Reads a day partition, combining it with the compacted files of its month if the month is closed.
+
+    Args:
+        s3_client: Initialized Boto3 S3 client.
+        bucket_name (str): Name of the S3 bucket.
+        base_key (str): Key of the canonical day partition file.
+        read_day (Callable): Reader of the day files, called with (s3_client, bucket_name, base_key).
+        row_key (list[str]): Columns identifying one row; day files win over compacted files.
+        time_column (str): Column holding the time of each row.
+        compacted_cache (dict | None): Compacted files already read, by key (see read_compacted_day).
+        today (date | None): Current date. Defaults to today (UTC).
+
+    Returns:
+        pd.DataFrame | None: The partition's rows, or None if there are none.
+    """
+    df_day = read_day(s3_client, bucket_name, base_key)
+    match = _DAY_KEY_PATTERN.match(base_key)
+    if match is None or not is_closed_month(match["year"], match["month"], today):
+        return df_day
+    df_compacted = read_compacted_day(
+        s3_client, bucket_name, base_key, time_column, compacted_cache
+    )
+    if df_compacted is None:
+        return df_day
+    return merge_by_row_key([df_compacted, df_day], row_key, time_column)
@@ -11,6 +11,17 @@ T_BASE_MAP = {
     # Add more base temperatures for crops here.
 }
 
+# Upper temperature cutoffs, in celsius, used by the 'capped', 'single_sine',
+# 'single_triangle' and 'degree_hours' GDD methods. Crops without one have no cutoff.
+T_UPPER_MAP = {
+    "maize": 30.0,
+}
+
+# GDD method per crop (see gdd_counter/methods.py); crops not listed use GDD_DEFAULT_METHOD.
+# Options: 'average', 'capped', 'single_sine', 'single_triangle', 'degree_hours'.
+GDD_METHOD_MAP = {}
+GDD_DEFAULT_METHOD = os.getenv("GDD_DEFAULT_METHOD", "average")
+
 # Storage Configuration Options: 'minio', 's3'.
 STORAGE_BACKEND = os.getenv("STORAGE_BACKEND")
 
@@ -23,7 +34,43 @@ MINIO_DATA_BUCKET_NAME = os.getenv("MINIO_DATA_BUCKET_NAME")
 # AWS S3 Configuration. Used if STORAGE_BACKEND is 's3'.
 AWS_S3_DATA_BUCKET_NAME = os.getenv("AWS_S3_DATA_BUCKET_NAME")
 
+# S3 client tuning, for both backends. The client is shared by all threads of a process,
+# so the connection pool should be at least as large as the number of concurrent uploads.
+S3_MAX_POOL_CONNECTIONS = int(os.getenv("S3_MAX_POOL_CONNECTIONS", "32"))
+S3_MAX_ATTEMPTS = int(os.getenv("S3_MAX_ATTEMPTS", "5"))
+
+# DuckDB engine tuning (see universal/duckdb_utils.py). Unset values keep DuckDB's defaults:
+# one thread per core and 80% of the memory.
+DUCKDB_THREADS = os.getenv("DUCKDB_THREADS")
+DUCKDB_MEMORY_LIMIT = os.getenv("DUCKDB_MEMORY_LIMIT")  # e.g. '2GB'.
+
 # Base prefixes for data layers.
+RAW_PREFIX = os.getenv("RAW_PREFIX", "raw")
 BRONZE_PREFIX = os.getenv("BRONZE_PREFIX", "bronze")
 SILVER_PREFIX = os.getenv("SILVER_PREFIX", "silver")
 GOLD_PREFIX = os.getenv("GOLD_PREFIX", "gold")
+
+# First month of a growing season in the gold cumulative GDD series. A season is named
+# after the year it starts in, e.g. with 10 the season 2025 runs from October 2025 to
+# September 2026.
+GOLD_SEASON_START_MONTH = int(os.getenv("GOLD_SEASON_START_MONTH", "1"))
+
+# How the data fetcher updates bronze partitions: 'rewrite' merges new rows into the
+# partition file, 'delta' writes them as append-only delta files that readers merge on
+# the fly until data_fetcher.compaction folds them in (see universal/bronze_deltas.py).
+BRONZE_WRITE_MODE = os.getenv("BRONZE_WRITE_MODE", "rewrite").lower()
+
+# Parquet layout (codec, dictionary encoding, sort order, float32 temperatures, row groups)
+# used by the bronze and silver writers: 'default', 'zstd' or 'compact'
+# (see universal/parquet_profile.py).
+PARQUET_PROFILE = os.getenv("PARQUET_PROFILE", "default")
+
+# Whether the writers maintain per-month manifests of the partition files and readers use
+# them (see universal/manifest.py). Manifests are updated with conditional PUTs
+# (If-Match / If-None-Match), so disable them on stores that do not support conditional
+# writes, such as older MinIO releases; readers then list the partition files.
+MANIFESTS_ENABLED = os.getenv("MANIFESTS_ENABLED", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
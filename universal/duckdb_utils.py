@@ -0,0 +1,173 @@
+"""
+Process-wide DuckDB engine shared by the query paths (GDD calculation and friends).
+
+The in-memory database is created once per process: the httpfs extension is loaded,
+the storage credentials are registered with DuckDB's secret manager (so they never
+appear in the text of the queries), the time zone is set to UTC and the Parquet
+metadata caches are enabled, so that files read again in a later query do not have
+their footers fetched again.
+Callers get their own connection to the shared database with get_duckdb_connection()
+and close it when done; registered DataFrames and views stay private to it.
+"""
+
+import logging
+import threading
+
+import duckdb
+
+try:
+    from . import config as app_config
+except ImportError as e:
+    raise ImportError(
+        "CRITICAL ERROR: Could not import shared configuration from 'universal.config'. "
+        "This is a dependency for 'universal.duckdb_utils'."
+    ) from e
+
+logger = logging.getLogger(__name__)
+
+# Process-wide database, created on first use. Connections are not safe to share
+# between threads, so each caller gets its own connection (cursor) to it.
+_duckdb_database = None
+_duckdb_database_lock = threading.Lock()
+
+# Name of the secret holding the storage credentials.
+_S3_SECRET_NAME = "gdd_storage"
+
+# Caches of Parquet metadata, validated against the files' last modification time.
+# Different DuckDB versions know different ones; the known ones are enabled. The HTTP
+# metadata cache of httpfs is left off: bronze files are rewritten under the same key,
+# and it would keep serving their old size and modification time.
+_CACHE_SETTINGS = (
+    "enable_object_cache",
+    "parquet_metadata_cache",
+    "enable_external_file_cache",
+)
+
+
+def _sql_string(value: str) -> str:
+    """Quotes a value as a SQL string literal."""
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _load_httpfs(con: duckdb.DuckDBPyConnection):
+    """Loads httpfs, installing it if needed; without it only local files can be read."""
+    try:
+        con.execute("LOAD httpfs;")
+    except duckdb.Error:
+        try:
+            con.execute("INSTALL httpfs;")
+            con.execute("LOAD httpfs;")
+        except duckdb.Error as e:
+            logger.warning(
+                f"Could not load the DuckDB httpfs extension: {e}. Only local paths can be read."
+            )
+            return False
+    return True
+
+
+def _create_storage_secret(con: duckdb.DuckDBPyConnection):
+    """
+    Registers the credentials of the configured storage backend with DuckDB's secret manager.
+
+    Raises:
+        ValueError: If the MinIO configuration is incomplete.
+    """
+    if app_config.STORAGE_BACKEND == "minio":
+        if not all(
+            [
+                app_config.MINIO_ENDPOINT_URL,
+                app_config.MINIO_ACCESS_KEY,
+                app_config.MINIO_SECRET_KEY,
+            ]
+        ):
+            raise ValueError(
+                "MinIO configuration (MINIO_ENDPOINT_URL, MINIO_ACCESS_KEY, MINIO_SECRET_KEY) "
+                "is incomplete in the shared app_config."
+            )
+        endpoint = app_config.MINIO_ENDPOINT_URL
+        # DuckDB expects the S3 endpoint without the scheme (http/https).
+        endpoint_host_port = endpoint.replace("http://", "").replace("https://", "")
+        use_ssl = "true" if endpoint.startswith("https://") else "false"
+        # MinIO uses path-style addressing for buckets.
+        con.execute(
+            f"CREATE OR REPLACE SECRET {_S3_SECRET_NAME} ("
+            f"TYPE S3, KEY_ID {_sql_string(app_config.MINIO_ACCESS_KEY)}, "
+            f"SECRET {_sql_string(app_config.MINIO_SECRET_KEY)}, "
+            f"ENDPOINT {_sql_string(endpoint_host_port)}, "
+            f"USE_SSL {use_ssl}, URL_STYLE 'path');"
+        )
+        logger.info("DuckDB secret configured for MinIO.")
+    elif app_config.STORAGE_BACKEND == "s3":
+        # For AWS S3, credentials come from the default providers (environment, profile, role).
+        try:
+            con.execute(
+                f"CREATE OR REPLACE SECRET {_S3_SECRET_NAME} (TYPE S3, PROVIDER credential_chain);"
+            )
+            logger.info("DuckDB secret configured from the AWS credential chain.")
+        except duckdb.Error as e:
+            logger.warning(
+                f"Could not create a DuckDB secret from the AWS credential chain: {e}. "
+                "DuckDB will use its default S3 settings."
+            )
+
+
+def _apply_settings(con: duckdb.DuckDBPyConnection):
+    """Applies the time zone, thread, memory and cache settings to the whole database."""
+    # Dates of TIMESTAMPTZ values are taken in the session time zone, which defaults to
+    # the host's; partitions and days are UTC throughout.
+    con.execute("SET GLOBAL TimeZone = 'UTC';")
+    if app_config.DUCKDB_THREADS:
+        con.execute(f"SET GLOBAL threads = {int(app_config.DUCKDB_THREADS)};")
+    if app_config.DUCKDB_MEMORY_LIMIT:
+        con.execute(
+            f"SET GLOBAL memory_limit = {_sql_string(app_config.DUCKDB_MEMORY_LIMIT)};"
+        )
+    known_settings = {
+        row[0] for row in con.execute("SELECT name FROM duckdb_settings();").fetchall()
+    }
+    for setting in _CACHE_SETTINGS:
+        if setting in known_settings:
+            con.execute(f"SET GLOBAL {setting} = true;")
+
+
+def _create_duckdb_database() -> duckdb.DuckDBPyConnection:
+    """Creates the in-memory database with httpfs, the storage secret and the settings."""
+    con = duckdb.connect()
+    try:
+        if app_config.STORAGE_BACKEND in ("minio", "s3") and _load_httpfs(con):
+            _create_storage_secret(con)
+        _apply_settings(con)
+    except Exception:
+        con.close()
+        raise
+    logger.info("Shared DuckDB database initialised.")
+    return con
+
+
+def get_duckdb_connection() -> duckdb.DuckDBPyConnection:
+    """
+    Returns a new connection to the process-wide DuckDB database, creating it on first use.
+
+    The database is configured from the shared app_config: httpfs with a secret for the
+    storage backend, DUCKDB_THREADS and DUCKDB_MEMORY_LIMIT, and the Parquet metadata
+    caches. Its time zone is UTC, whatever the host's. Closing the returned connection
+    leaves the database and its caches open.
+
+    Raises:
+        ValueError: If the MinIO configuration is incomplete.
+    """
+    global _duckdb_database
+    if _duckdb_database is None:
+        with _duckdb_database_lock:
+            if _duckdb_database is None:
+                _duckdb_database = _create_duckdb_database()
+    return _duckdb_database.cursor()
+
+
+def reset_duckdb_connection_cache():
+    """Closes the process-wide DuckDB database, so the next connection creates a new one."""
+    global _duckdb_database
+    with _duckdb_database_lock:
+        if _duckdb_database is not None:
+            _duckdb_database.close()
+        _duckdb_database = None
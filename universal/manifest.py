@@ -0,0 +1,364 @@
+"""
+Per-month manifests of the files of the bronze and silver layers.
+
+The writers (data_fetcher.saver, gdd_counter.writer and the compaction jobs)
+record every partition file they write or delete in a small Parquet manifest per
+layer and month:
+
+    bronze/_manifests/manifest_2025-05.parquet
+
+with one entry per file: its partition (date, crop, location), key, row count,
+time range and content hash. Components that need to know which partitions exist
+(completeness checks, incremental processing, planning) read one object per month
+instead of listing and reading the partition files. A manifest is replaced with a
+conditional PUT on the ETag it was read with, so concurrent writers never lose each
+other's entries; a writer that loses the race reads the manifest again and retries.
+
+Readers treat a partition missing from the manifest as unknown rather than absent,
+so a manifest may miss files but must never list files that are gone or changed. A
+failed update therefore does not fail the write, but deletes the month's manifest:
+readers fall back to listing until writers rebuild it. If even the delete fails, the
+update raises ManifestUpdateError. Conditional writes are required; on stores without
+them, manifests are disabled with MANIFESTS_ENABLED and readers always list.
+"""
+
+import io
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from typing import NamedTuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from botocore.exceptions import ClientError
+
+try:
+    from . import config as app_config
+except ImportError as e:
+    raise ImportError(
+        "CRITICAL ERROR: Could not import shared configuration from 'universal.config'. "
+        "This is a dependency for 'universal.manifest'."
+    ) from e
+
+logger = logging.getLogger(__name__)
+
+# Attempts to replace a manifest that other writers keep changing.
+_MAX_UPDATE_ATTEMPTS = 5
+
+# Error codes of a conditional PUT whose condition no longer holds.
+_CONFLICT_CODES = ("PreconditionFailed", "ConditionalRequestConflict", "412", "409")
+
+MANIFEST_SCHEMA = pa.schema(
+    [
+        ("date", pa.string()),
+        ("crop_id", pa.string()),
+        ("location_id", pa.string()),
+        ("key", pa.string()),
+        ("num_rows", pa.int64()),
+        ("min_time", pa.timestamp("us", tz="UTC")),
+        ("max_time", pa.timestamp("us", tz="UTC")),
+        ("content_hash", pa.string()),
+        ("written_at", pa.timestamp("us", tz="UTC")),
+    ]
+)
+
+
+class ManifestUpdateError(Exception):
+    """
+    Raised when a manifest can neither be updated nor deleted, and may list stale files.
+    """
+
+    pass
+
+
+class ManifestEntry(NamedTuple):
+    """One partition file recorded in a manifest."""
+
+    date: str
+    crop_id: str
+    location_id: str | None  # None for per-crop compacted files.
+    key: str
+    num_rows: int
+    min_time: pd.Timestamp | None
+    max_time: pd.Timestamp | None
+    content_hash: str
+    written_at: datetime
+
+
+def generate_manifest_s3_key(
+    layer_prefix: str, year: int | str, month: int | str
+) -> str:
+    """
+    Generates the S3 key of a layer's manifest for one month.
+    Example: bronze/_manifests/manifest_2025-05.parquet
+    """
+    return f"{layer_prefix}/_manifests/manifest_{year}-{int(month):02d}.parquet"
+
+
+def build_manifest_entry(
+    date_str: str,
+    crop_id: str,
+    location_id: str | None,
+    key: str,
+    df: pd.DataFrame,
+    time_column: str,
+    content_hash: str,
+    written_at: datetime | None = None,
+) -> ManifestEntry:
+    """
+    Builds the manifest entry of a partition file from the rows written to it.
+
+    Args:
+        date_str (str): Date of the partition ('YYYY-MM-DD'); the first day of the month
+                        for compacted files.
+        crop_id (str): Identifier of the crop.
+        location_id (str | None): Identifier of the location, or None for per-crop files.
+        key (str): S3 key of the file.
+        df (pd.DataFrame): Rows written to the file.
+        time_column (str): Column holding the time of each row.
+        content_hash (str): Content hash of the rows (see compute_content_hash).
+        written_at (datetime | None): Write time. Defaults to now (UTC).
+
+    Returns:
+        ManifestEntry: The entry.
+    """
+    times = (
+        pd.to_datetime(df[time_column], utc=True)
+        if time_column in df.columns
+        else pd.Series(dtype="datetime64[ns, UTC]")
+    )
+    return ManifestEntry(
+        date=date_str,
+        crop_id=crop_id,
+        location_id=location_id,
+        key=key,
+        num_rows=len(df),
+        min_time=times.min() if not times.empty else None,
+        max_time=times.max() if not times.empty else None,
+        content_hash=content_hash,
+        written_at=written_at or datetime.now(timezone.utc),
+    )
+
+
+def _empty_manifest() -> pd.DataFrame:
+    return MANIFEST_SCHEMA.empty_table().to_pandas()
+
+
+def _read_manifest_object(
+    s3_client, bucket_name: str, manifest_key: str
+) -> tuple[pd.DataFrame, str | None]:
+    """Reads a manifest and its ETag; a missing manifest is empty, with no ETag."""
+    try:
+        response = s3_client.get_object(Bucket=bucket_name, Key=manifest_key)
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+            return _empty_manifest(), None
+        raise
+    df = pd.read_parquet(io.BytesIO(response["Body"].read()))
+    return df, response.get("ETag")
+
+
+def read_manifest(
+    s3_client, bucket_name: str, layer_prefix: str, year: int | str, month: int | str
+) -> pd.DataFrame:
+    """
+    Reads the manifest of one month of a layer.
+
+    Args:
+        s3_client: Initialized Boto3 S3 client.
+        bucket_name (str): Name of the S3 bucket.
+        layer_prefix (str): Base S3 prefix of the layer.
+        year (int | str): Year of the month.
+        month (int | str): Month number.
+
+    Returns:
+        pd.DataFrame: One row per file, with the columns of MANIFEST_SCHEMA. Empty if
+                      the month has no manifest or manifests are disabled.
+    """
+    if not app_config.MANIFESTS_ENABLED:
+        return _empty_manifest()
+    df, _ = _read_manifest_object(
+        s3_client, bucket_name, generate_manifest_s3_key(layer_prefix, year, month)
+    )
+    return df
+
+
+def query_manifest(
+    s3_client,
+    bucket_name: str,
+    layer_prefix: str,
+    start_date_str: str,
+    end_date_str: str,
+    crop_id: str | None = None,
+    location_id: str | None = None,
+) -> pd.DataFrame:
+    """
+    Returns the manifest entries of a date range, reading one manifest per month.
+
+    Entries of compacted month files (dated by the first day of their month) are
+    returned for every range that overlaps their month.
+
+    Args:
+        s3_client: Initialized Boto3 S3 client.
+        bucket_name (str): Name of the S3 bucket.
+        layer_prefix (str): Base S3 prefix of the layer.
+        start_date_str (str): First date in 'YYYY-MM-DD' format.
+        end_date_str (str): Last date in 'YYYY-MM-DD' format (inclusive).
+        crop_id (str | None): Optional crop to restrict the entries to.
+        location_id (str | None): Optional location to restrict the entries to.
+
+    Returns:
+        pd.DataFrame: The matching entries, sorted by date, crop, location and key.
+    """
+    months = pd.period_range(start_date_str, end_date_str, freq="M")
+    frames = [
+        read_manifest(s3_client, bucket_name, layer_prefix, month.year, month.month)
+        for month in months
+    ]
+    df = pd.concat(frames, ignore_index=True) if frames else _empty_manifest()
+    is_compacted = df["key"].str.rsplit("/", n=1).str[-1].str.startswith("compacted_")
+    mask = (df["date"] >= start_date_str) & (df["date"] <= end_date_str)
+    mask |= is_compacted & (df["date"].str[:7] >= start_date_str[:7])
+    if crop_id is not None:
+        mask &= df["crop_id"] == crop_id
+    if location_id is not None:
+        mask &= df["location_id"] == location_id
+    return (
+        df[mask]
+        .sort_values(by=["date", "crop_id", "location_id", "key"])
+        .reset_index(drop=True)
+    )
+
+
+def update_manifest(
+    s3_client,
+    bucket_name: str,
+    layer_prefix: str,
+    year: int | str,
+    month: int | str,
+    entries: list[ManifestEntry] = (),
+    removed_keys: set[str] | frozenset = frozenset(),
+):
+    """
+    Records written and deleted files in the manifest of one month.
+
+    The manifest is read, changed and written back with a conditional PUT on the ETag
+    it was read with (or on its absence), retrying from the read when another writer
+    replaced it in between.
+
+    Args:
+        s3_client: Initialized Boto3 S3 client.
+        bucket_name (str): Name of the S3 bucket.
+        layer_prefix (str): Base S3 prefix of the layer.
+        year (int | str): Year of the month.
+        month (int | str): Month number.
+        entries (list[ManifestEntry]): Files written; they replace entries with the same key.
+        removed_keys (set[str]): Keys of files deleted.
+
+    Raises:
+        ClientError: If the manifest cannot be read or written, or is still being changed
+                     by other writers after several attempts.
+    """
+    manifest_key = generate_manifest_s3_key(layer_prefix, year, month)
+    df_entries = pd.DataFrame(list(entries), columns=MANIFEST_SCHEMA.names)
+    replaced_keys = set(df_entries["key"]) | set(removed_keys)
+    for attempt in range(1, _MAX_UPDATE_ATTEMPTS + 1):
+        df_manifest, etag = _read_manifest_object(s3_client, bucket_name, manifest_key)
+        frames = [
+            df
+            for df in (df_manifest[~df_manifest["key"].isin(replaced_keys)], df_entries)
+            if not df.empty
+        ]
+        df_updated = (
+            pd.concat(frames, ignore_index=True) if frames else _empty_manifest()
+        ).sort_values(by=["date", "crop_id", "location_id", "key"])
+        buffer = io.BytesIO()
+        pq.write_table(
+            pa.Table.from_pandas(
+                df_updated, schema=MANIFEST_SCHEMA, preserve_index=False
+            ),
+            buffer,
+            compression="zstd",
+        )
+        condition = {"IfMatch": etag} if etag else {"IfNoneMatch": "*"}
+        try:
+            s3_client.put_object(
+                Bucket=bucket_name,
+                Key=manifest_key,
+                Body=buffer.getvalue(),
+                **condition,
+            )
+            return
+        except ClientError as e:
+            code = e.response.get("Error", {}).get("Code")
+            if code not in _CONFLICT_CODES or attempt == _MAX_UPDATE_ATTEMPTS:
+                raise
+            logger.info(
+                f"Manifest s3://{bucket_name}/{manifest_key} changed concurrently; retrying (attempt {attempt})."
+            )
+            time.sleep(random.uniform(0.05, 0.2) * attempt)
+
+
+def update_manifests(
+    s3_client,
+    bucket_name: str,
+    layer_prefix: str,
+    entries: list[ManifestEntry] = (),
+    removed_keys: dict[str, set[str]] | None = None,
+) -> bool:
+    """
+    Records written and deleted files in the manifests of their months.
+
+    A manifest that cannot be updated is deleted, so that readers list the partition
+    files instead of trusting entries that may be stale. Nothing is done when manifests
+    are disabled (MANIFESTS_ENABLED).
+
+    Args:
+        s3_client: Initialized Boto3 S3 client.
+        bucket_name (str): Name of the S3 bucket.
+        layer_prefix (str): Base S3 prefix of the layer.
+        entries (list[ManifestEntry]): Files written, of any months.
+        removed_keys (dict[str, set[str]] | None): Keys of files deleted, per month ('YYYY-MM').
+
+    Returns:
+        bool: True if every manifest was updated, False if some were deleted instead.
+
+    Raises:
+        ManifestUpdateError: If a manifest could neither be updated nor deleted.
+    """
+    if not app_config.MANIFESTS_ENABLED:
+        return True
+    entries_by_month: dict[str, list[ManifestEntry]] = {}
+    for entry in entries:
+        entries_by_month.setdefault(entry.date[:7], []).append(entry)
+    removed_keys = removed_keys or {}
+    all_updated = True
+    for month_str in sorted(set(entries_by_month) | set(removed_keys)):
+        year, month = month_str.split("-")
+        try:
+            update_manifest(
+                s3_client,
+                bucket_name,
+                layer_prefix,
+                year,
+                month,
+                entries_by_month.get(month_str, []),
+                removed_keys.get(month_str, set()),
+            )
+        except Exception as e:
+            manifest_key = generate_manifest_s3_key(layer_prefix, year, month)
+            try:
+                s3_client.delete_object(Bucket=bucket_name, Key=manifest_key)
+            except Exception as delete_error:
+                raise ManifestUpdateError(
+                    f"Could not update the {layer_prefix} manifest of {month_str} ({e}) "
+                    f"nor delete it ({delete_error}); it may list stale files."
+                ) from e
+            logger.warning(
+                f"Could not update the {layer_prefix} manifest of {month_str}: {e}. "
+                "Deleted it; readers list the partition files until it is rebuilt."
+            )
+            all_updated = False
+    return all_updated
@@ -0,0 +1,346 @@
+"""
+Rolls the day partition files of a closed month of a layer into monthly compacted files.
+
+One file is written per (month, crop, location) with granularity 'location', or per
+(month, crop) with granularity 'crop' (see universal.compacted_files), with rows
+sorted by time so that row-group statistics let readers skip to a day. The day
+files, their bronze delta files and, for granularity 'crop', the per-location
+compacted files are deleted only after the compacted file holding their rows has
+been written. Running the job again for a month folds in day files written since.
+The month's manifest (universal.manifest) is updated once at the end.
+
+The logic is the same for every layer; a layer only brings its LayerLayout. The
+entry points are data_fetcher.monthly_compaction (bronze) and
+gdd_counter.monthly_compaction (silver).
+"""
+
+import io
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import NamedTuple
+
+import pandas as pd
+from botocore.exceptions import ClientError
+
+try:
+    from . import config as app_config
+    from .compacted_files import (
+        COMPACTION_GRANULARITIES,
+        generate_compacted_s3_key,
+        is_closed_month,
+        merge_by_row_key,
+    )
+    from .manifest import ManifestEntry, build_manifest_entry, update_manifests
+    from .parquet_profile import get_parquet_profile, parquet_bytes
+    from .processing_utils import compute_content_hash
+    from .s3_utils import get_s3_client
+except ImportError as e:
+    raise ImportError(
+        "CRITICAL ERROR: Could not import shared modules from 'universal'. "
+        "They are a dependency for 'universal.monthly_compaction'."
+    ) from e
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of keys accepted by one DeleteObjects request.
+_DELETE_BATCH_SIZE = 1000
+
+# Row-group size of compacted files when the Parquet profile does not set one; about a
+# day of hourly bronze rows for a thousand locations, so that day filters skip row groups.
+_COMPACTED_ROW_GROUP_SIZE = 32 * 1024
+
+# Files of a month under the layer prefix: day files, bronze deltas and compacted files,
+# either in a location directory or (compacted per crop) in the crop directory.
+_MONTH_FILE_PATTERN = re.compile(
+    r"/crop_id=(?P<crop_id>[^/]+)/(?:location_id=(?P<location_id>[^/]+)/)?"
+    r"(?P<filename>(?:data|delta|compacted)_[^/]+\.parquet)$"
+)
+
+
+class LayerLayout(NamedTuple):
+    """Where a layer is stored and how its rows are identified and ordered."""
+
+    prefix: str
+    row_key: list[str]
+    time_column: str
+
+
+def previous_month() -> str:
+    """Returns the last closed month (UTC) in 'YYYY-MM' format."""
+    first_of_month = datetime.now(timezone.utc).replace(day=1)
+    return (first_of_month - pd.Timedelta(days=1)).strftime("%Y-%m")
+
+
+def list_month_files(
+    s3_client, bucket_name: str, layer_prefix: str, year: int, month: int
+) -> dict[tuple[str, str | None], list[str]]:
+    """
+    Lists the data files of one month of a layer, grouped by directory.
+
+    Args:
+        s3_client: Initialized Boto3 S3 client.
+        bucket_name (str): Name of the bucket holding the layer.
+        layer_prefix (str): Base S3 prefix of the layer.
+        year (int): Year of the month.
+        month (int): Month number.
+
+    Returns:
+        dict[tuple[str, str | None], list[str]]: Keys per (crop_id, location_id), with
+            location_id None for files in the crop directory, in key order.
+    """
+    files: dict[tuple[str, str | None], list[str]] = {}
+    request = {
+        "Bucket": bucket_name,
+        "Prefix": f"{layer_prefix}/year={year}/month={month:02d}/",
+    }
+    while True:
+        response = s3_client.list_objects_v2(**request)
+        for obj in response.get("Contents", []):
+            match = _MONTH_FILE_PATTERN.search(obj["Key"])
+            if match is not None:
+                files.setdefault((match["crop_id"], match["location_id"]), []).append(
+                    obj["Key"]
+                )
+        if not response.get("IsTruncated"):
+            break
+        request["ContinuationToken"] = response["NextContinuationToken"]
+    return {directory: sorted(keys) for directory, keys in files.items()}
+
+
+def _read_parquet_object(
+    s3_client, bucket_name: str, key: str
+) -> tuple[pd.DataFrame, str | None]:
+    """Reads a Parquet object with the ETag of the version read."""
+    response = s3_client.get_object(Bucket=bucket_name, Key=key)
+    return pd.read_parquet(io.BytesIO(response["Body"].read())), response.get("ETag")
+
+
+def _current_etag(s3_client, bucket_name: str, key: str) -> str | None:
+    """Returns the ETag of an object, or None if it no longer exists."""
+    try:
+        return s3_client.head_object(Bucket=bucket_name, Key=key).get("ETag")
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+            return None
+        raise
+
+
+def compact_files(
+    s3_client,
+    bucket_name: str,
+    source_keys: list[str],
+    target_key: str,
+    layout: LayerLayout,
+    executor: ThreadPoolExecutor,
+    month_start: datetime,
+    crop_id: str,
+    location_id: str | None,
+) -> tuple[list[str], ManifestEntry]:
+    """
+    Merges files into one compacted file and deletes them.
+
+    A source rewritten after it was read (by a backfill, a retry or a re-derivation)
+    holds rows the compacted file does not have, so it is kept: sources are deleted only
+    if their ETag is still the one they were read with. Kept files win over the
+    compacted rows for readers and are folded in by the next run.
+
+    Args:
+        s3_client: Initialized Boto3 S3 client, shared between workers.
+        bucket_name (str): Name of the bucket holding the layer.
+        source_keys (list[str]): Keys of the files to merge, ordered from oldest to newest
+                                 write. May include the target key itself.
+        target_key (str): Key of the compacted file.
+        layout (LayerLayout): Layout of the layer.
+        executor (ThreadPoolExecutor): Pool reading the files in parallel.
+        month_start (datetime): First day of the month.
+        crop_id (str): Identifier of the crop of the compacted file.
+        location_id (str | None): Identifier of its location, or None for a per-crop file.
+
+    Returns:
+        tuple[list[str], ManifestEntry]: The keys folded in and deleted, and the manifest
+                                         entry of the compacted file.
+    """
+    frames, read_etags = zip(
+        *executor.map(
+            lambda key: _read_parquet_object(s3_client, bucket_name, key), source_keys
+        )
+    )
+    frames = list(frames)
+    df_merged = merge_by_row_key(frames, layout.row_key, layout.time_column)
+    profile = get_parquet_profile()
+    profile = profile._replace(
+        sort_by=(layout.time_column, "crop_id", "location_id"),
+        row_group_size=profile.row_group_size or _COMPACTED_ROW_GROUP_SIZE,
+    )
+    entry = build_manifest_entry(
+        month_start.strftime("%Y-%m-%d"),
+        crop_id,
+        location_id,
+        target_key,
+        df_merged,
+        layout.time_column,
+        compute_content_hash(df_merged, profile),
+    )
+    s3_client.put_object(
+        Bucket=bucket_name, Key=target_key, Body=parquet_bytes(df_merged, profile)
+    )
+    # Sources are deleted only after the compacted file contains their rows, and only if
+    # they were not rewritten since they were read.
+    read_etag_by_key = dict(zip(source_keys, read_etags))
+    candidate_keys = [key for key in source_keys if key != target_key]
+    current_etags = executor.map(
+        lambda key: _current_etag(s3_client, bucket_name, key), candidate_keys
+    )
+    folded_keys = []
+    for key, current_etag in zip(candidate_keys, current_etags):
+        if current_etag == read_etag_by_key[key]:
+            folded_keys.append(key)
+        elif current_etag is not None:
+            logger.warning(
+                f"    s3://{bucket_name}/{key} was rewritten during compaction; "
+                "it is kept for the next run."
+            )
+    for start in range(0, len(folded_keys), _DELETE_BATCH_SIZE):
+        s3_client.delete_objects(
+            Bucket=bucket_name,
+            Delete={
+                "Objects": [
+                    {"Key": key}
+                    for key in folded_keys[start : start + _DELETE_BATCH_SIZE]
+                ],
+                "Quiet": True,
+            },
+        )
+    logger.info(
+        f"    Compacted {len(folded_keys)} files ({len(df_merged)} rows) into s3://{bucket_name}/{target_key}"
+    )
+    return folded_keys, entry
+
+
+def compact_month(
+    layout: LayerLayout,
+    month_str: str,
+    granularity: str = "location",
+    concurrency: int = 8,
+    s3_client=None,
+    today=None,
+) -> dict:
+    """
+    Compacts the day partition files of one closed month of a layer.
+
+    Args:
+        layout (LayerLayout): Layout of the layer to compact.
+        month_str (str): Month to compact in 'YYYY-MM' format.
+        granularity (str): 'location' for one file per (month, crop, location), 'crop' for
+                           one file per (month, crop).
+        concurrency (int): Maximum number of files read in parallel.
+        s3_client: Optional S3 client to use instead of the shared one.
+        today (date | None): Current date. Defaults to today (UTC).
+
+    Returns:
+        dict: Number of compacted files written, source files folded in and compacted
+              files that failed.
+
+    Raises:
+        ValueError: If the storage configuration, granularity or month is invalid, or if
+                    the month has not ended yet.
+    """
+    if granularity not in COMPACTION_GRANULARITIES:
+        raise ValueError(
+            f"Unknown granularity '{granularity}'. Expected one of {COMPACTION_GRANULARITIES}."
+        )
+    try:
+        month_start = datetime.strptime(month_str, "%Y-%m")
+    except ValueError:
+        raise ValueError(
+            f"Invalid month '{month_str}'. Please use YYYY-MM format."
+        ) from None
+    if not is_closed_month(month_start.year, month_start.month, today):
+        raise ValueError(
+            f"Month {month_str} has not ended yet; only closed months are compacted."
+        )
+    if app_config.STORAGE_BACKEND == "minio":
+        bucket_name = app_config.MINIO_DATA_BUCKET_NAME
+    elif app_config.STORAGE_BACKEND == "s3":
+        bucket_name = app_config.AWS_S3_DATA_BUCKET_NAME
+    else:
+        raise ValueError(
+            f"Invalid STORAGE_BACKEND '{app_config.STORAGE_BACKEND}' defined in shared config."
+        )
+    if not bucket_name:
+        raise ValueError(
+            f"Target bucket name could not be determined for backend '{app_config.STORAGE_BACKEND}'."
+        )
+    s3_client = s3_client if s3_client is not None else get_s3_client()
+
+    files = list_month_files(
+        s3_client, bucket_name, layout.prefix, month_start.year, month_start.month
+    )
+    # Source keys per compacted file. Sorting keys orders a directory's files from oldest
+    # to newest write, and a crop's compacted file before its location directories.
+    sources: dict[str, list[str]] = {}
+    targets: dict[str, tuple[str, str | None]] = {}
+    for (crop_id, location_id), keys in files.items():
+        if granularity == "crop":
+            target_location_id = None
+        elif location_id is None:
+            # Per-crop compacted files are left as they are by per-location compaction.
+            continue
+        else:
+            target_location_id = location_id
+        target_key = generate_compacted_s3_key(
+            layout.prefix,
+            month_start.year,
+            month_start.month,
+            crop_id,
+            target_location_id,
+        )
+        sources.setdefault(target_key, []).extend(keys)
+        targets[target_key] = (crop_id, target_location_id)
+    # Compacted files that have nothing new to fold in are left as they are.
+    sources = {
+        target_key: sorted(keys)
+        for target_key, keys in sources.items()
+        if keys != [target_key]
+    }
+    logger.info(
+        f"Compacting {sum(map(len, sources.values()))} files of {month_str} under '{layout.prefix}' "
+        f"into {len(sources)} files per {granularity} with concurrency {concurrency}."
+    )
+
+    written, num_files, failed = 0, 0, 0
+    manifest_entries, removed_keys = [], set()
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        for target_key, source_keys in sources.items():
+            try:
+                folded_keys, entry = compact_files(
+                    s3_client,
+                    bucket_name,
+                    source_keys,
+                    target_key,
+                    layout,
+                    executor,
+                    month_start,
+                    *targets[target_key],
+                )
+                num_files += len(folded_keys)
+                written += 1
+                manifest_entries.append(entry)
+                removed_keys.update(folded_keys)
+            except Exception as e:
+                logger.error(f"    ERROR compacting into {target_key}: {e}")
+                failed += 1
+
+    update_manifests(
+        s3_client,
+        bucket_name,
+        layout.prefix,
+        manifest_entries,
+        {month_str: removed_keys},
+    )
+    logger.info(
+        f"Monthly compaction finished: {written} files written ({num_files} files folded in), {failed} failed."
+    )
+    return {"files": written, "sources": num_files, "failed": failed}
@@ -0,0 +1,182 @@
+"""
+Parquet write profiles shared by the bronze and silver writers.
+
+A profile fixes how a DataFrame is laid out in a Parquet file: compression
+codec and level, which columns are dictionary-encoded, the row order (sorted
+data gives tight min/max statistics per row group and page, so readers can skip
+them), which float columns are narrowed to float32, the row-group size and
+whether statistics are written. The profile used by the writers is chosen with
+PARQUET_PROFILE; scripts/benchmark_parquet_profiles.py compares the profiles on
+realistic data.
+"""
+
+from typing import NamedTuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+try:
+    from . import config as app_config
+except ImportError as e:
+    raise ImportError(
+        "CRITICAL ERROR: Could not import shared configuration from 'universal.config'. "
+        "This is a dependency for 'universal.parquet_profile'."
+    ) from e
+
+# Temperature columns of the bronze and silver layers, narrowed to float32 by profiles
+# that trade precision below ~1e-6 relative for size. Readers then see e.g. 20.100000381
+# instead of 20.1 unless they round.
+TEMPERATURE_COLUMNS = (
+    "air_temperature",
+    "t_min_daily",
+    "t_max_daily",
+    "t_avg_daily",
+    "t_base_used",
+    "t_upper_used",
+)
+
+
+class ParquetProfile(NamedTuple):
+    """Layout options applied when writing a Parquet file."""
+
+    name: str
+    compression: str = "snappy"
+    compression_level: int | None = None
+    # Columns to dictionary-encode; None encodes every column, as pyarrow does by default.
+    dictionary_columns: tuple[str, ...] | None = None
+    sort_by: tuple[str, ...] = ()
+    float32_columns: tuple[str, ...] = ()
+    row_group_size: int | None = None
+    write_statistics: bool = True
+
+
+PARQUET_PROFILES = {
+    # Library defaults, as written by DataFrame.to_parquet.
+    "default": ParquetProfile(name="default"),
+    # zstd, rows sorted by crop, location and time, and row groups small enough for
+    # location and time filters to skip most of a monthly file. Forecast values have one
+    # decimal, so dictionary encoding stays on for every column.
+    "zstd": ParquetProfile(
+        name="zstd",
+        compression="zstd",
+        compression_level=3,
+        sort_by=("crop_id", "location_id", "timestamp", "date"),
+        row_group_size=64 * 1024,
+    ),
+    # As 'zstd', at a higher level and with float32 temperatures, for the smallest files.
+    "compact": ParquetProfile(
+        name="compact",
+        compression="zstd",
+        compression_level=9,
+        sort_by=("crop_id", "location_id", "timestamp", "date"),
+        float32_columns=TEMPERATURE_COLUMNS,
+        row_group_size=64 * 1024,
+    ),
+}
+
+
+def get_parquet_profile(name: str | None = None) -> ParquetProfile:
+    """
+    Returns a Parquet write profile by name.
+
+    Args:
+        name (str | None): Name of a profile in PARQUET_PROFILES. Defaults to PARQUET_PROFILE.
+
+    Returns:
+        ParquetProfile: The profile.
+
+    Raises:
+        ValueError: If no profile has that name.
+    """
+    name = name or app_config.PARQUET_PROFILE
+    try:
+        return PARQUET_PROFILES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown Parquet profile '{name}'. Expected one of {sorted(PARQUET_PROFILES)}."
+        ) from None
+
+
+def to_profiled_table(
+    data: pd.DataFrame | pa.Table, profile: ParquetProfile
+) -> pa.Table:
+    """
+    Converts a DataFrame to an Arrow table with the profile's row order and column types.
+
+    Profile columns that the data does not have are ignored.
+
+    Args:
+        data (pd.DataFrame | pa.Table): Rows to write. The DataFrame index is not kept.
+        profile (ParquetProfile): Profile to apply.
+
+    Returns:
+        pa.Table: The table to write.
+    """
+    table = (
+        data
+        if isinstance(data, pa.Table)
+        else pa.Table.from_pandas(data, preserve_index=False)
+    )
+    sort_keys = [
+        (column, "ascending")
+        for column in profile.sort_by
+        if column in table.schema.names
+    ]
+    if sort_keys and table.num_rows > 1:
+        table = table.sort_by(sort_keys)
+    for column in profile.float32_columns:
+        index = table.schema.get_field_index(column)
+        if index >= 0 and pa.types.is_float64(table.schema.field(index).type):
+            table = table.set_column(
+                index, column, pc.cast(table.column(index), pa.float32())
+            )
+    return table
+
+
+def write_parquet(
+    data: pd.DataFrame | pa.Table, sink, profile: ParquetProfile | None = None
+):
+    """
+    Writes rows to a Parquet file with a write profile.
+
+    Args:
+        data (pd.DataFrame | pa.Table): Rows to write. The DataFrame index is not kept.
+        sink: File path or writable file-like object or Arrow output stream.
+        profile (ParquetProfile | None): Profile to apply. Defaults to PARQUET_PROFILE.
+    """
+    profile = profile or get_parquet_profile()
+    table = to_profiled_table(data, profile)
+    use_dictionary = (
+        True
+        if profile.dictionary_columns is None
+        else [c for c in profile.dictionary_columns if c in table.schema.names]
+    )
+    pq.write_table(
+        table,
+        sink,
+        compression=profile.compression,
+        compression_level=profile.compression_level,
+        use_dictionary=use_dictionary,
+        row_group_size=profile.row_group_size,
+        write_statistics=profile.write_statistics,
+    )
+
+
+def parquet_bytes(
+    data: pd.DataFrame | pa.Table, profile: ParquetProfile | None = None
+) -> bytes:
+    """
+    Serializes rows to Parquet in memory with a write profile.
+
+    Args:
+        data (pd.DataFrame | pa.Table): Rows to write. The DataFrame index is not kept.
+        profile (ParquetProfile | None): Profile to apply. Defaults to PARQUET_PROFILE.
+
+    Returns:
+        bytes: The Parquet file.
+    """
+    sink = pa.BufferOutputStream()
+    write_parquet(data, sink, profile)
+    return sink.getvalue().to_pybytes()
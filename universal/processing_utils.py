@@ -1,19 +1,35 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+import hashlib
 import logging
+import re
 from typing import List, Dict, Any
 
+from botocore.exceptions import ClientError
+
+import pandas as pd
+
 logger = logging.getLogger(__name__)
 
-# Attempt to import s3_utils for file checking; handle potential circularity or setup issues gracefully.
+# Attempt to import the bronze partition reader for file checking; handle potential circularity or setup issues gracefully.
 try:
-    from .s3_utils import get_s3_parquet_to_df_if_exists
+    from .bronze_deltas import read_bronze_partition
+    from .compacted_files import is_closed_month
+    from .manifest import read_manifest
+    from .parquet_profile import ParquetProfile, to_profiled_table
+    from .s3_utils import get_s3_parquet_num_rows
 except ImportError:
-    # This might happen if s3_utils itself imports processing_utils, or during initial setup.
+    # This might happen if bronze_deltas or s3_utils imports processing_utils, or during initial setup.
     # Assuming that is available. If circular dependencies become an issue,
     # s3_utils might need to be passed in as an argument to functions requiring it.
-    get_s3_parquet_to_df_if_exists = None
+    read_bronze_partition = None
+    is_closed_month = None
+    read_manifest = None
+    ParquetProfile = None
+    to_profiled_table = None
+    get_s3_parquet_num_rows = None
     logging.warning(
-        "universal.s3_utils.get_s3_parquet_to_df_if_exists could not be imported in processing_utils. "
+        "universal.bronze_deltas.read_bronze_partition could not be imported in processing_utils. "
         "Functions relying on it might fail if it's not available at runtime."
     )
 
@@ -34,6 +50,50 @@ def generate_partitioned_s3_key(
     return f"{layer_prefix}/year={year}/month={month_str}/crop_id={crop_id}/location_id={location_id}/data_{day_str}.parquet"
 
 
+def generate_gold_cumulative_s3_key(
+    layer_prefix: str, season: int | str, crop_id: str, location_id: str
+) -> str:
+    """
+    Generates the S3 key of the season-cumulative GDD series of one crop and location.
+    Example: gold/cumulative_gdd/season=2025/crop_id=maize/location_id=Belagavi/cumulative_gdd_2025.parquet
+    """
+    return (
+        f"{layer_prefix}/cumulative_gdd/season={season}/crop_id={crop_id}"
+        f"/location_id={location_id}/cumulative_gdd_{season}.parquet"
+    )
+
+
+# Keys generated by generate_partitioned_s3_key.
+_PARTITIONED_KEY_PATTERN = re.compile(
+    r"/crop_id=(?P<crop_id>[^/]+)/location_id=(?P<location_id>[^/]+)/data_(?P<day>\d{4}-\d{2}-\d{2})\.parquet$"
+)
+
+
+def parse_partitioned_s3_key(key: str) -> tuple[str, str, str] | None:
+    """
+    Returns the (date, crop_id, location_id) of a key generated by generate_partitioned_s3_key.
+    Example: bronze/year=2025/month=05/crop_id=maize/location_id=Belagavi/data_2025-05-26.parquet -> ('2025-05-26', 'maize', 'Belagavi')
+    """
+    match = _PARTITIONED_KEY_PATTERN.search(key)
+    if match is None:
+        return None
+    return match["day"], match["crop_id"], match["location_id"]
+
+
+def generate_raw_s3_key(
+    layer_prefix: str, fetched_at: datetime, lat: float, lon: float
+) -> str:
+    """
+    Generates the S3 object key of a raw API response, partitioned by fetch date and grid point.
+    Example: raw/year=2025/month=05/day=2025-05-26/grid=15.8500_74.5000/forecast_20250526T061502Z.json.zst
+    """
+    fetched_at = fetched_at.astimezone(timezone.utc)
+    return (
+        f"{layer_prefix}/year={fetched_at.year}/month={fetched_at.month:02d}/day={fetched_at.strftime('%Y-%m-%d')}"
+        f"/grid={float(lat):.4f}_{float(lon):.4f}/forecast_{fetched_at.strftime('%Y%m%dT%H%M%SZ')}.json.zst"
+    )
+
+
 def generate_daily_s3_glob_uri(
     bucket_name: str, layer_prefix: str, target_date: datetime
 ) -> str:
@@ -55,12 +115,14 @@ def determine_fetcher_processing_dates(
     bronze_prefix: str,
     locations_config: Dict[str, Dict[str, tuple]],
     expected_rows_per_day: int = 24,
+    max_workers: int = 8,
 ) -> List[datetime]:
     """
     Determines the list of dates for the data_fetcher to process.
     - If target_date_str is provided, processes only that date.
     - Otherwise, processes today.
-    - Additionally, processes yesterday if its data is missing or incomplete.
+    - Additionally, processes yesterday if its data is missing or incomplete
+      (see find_incomplete_partitions).
     """
     dates_to_process: List[datetime] = []
 
@@ -90,33 +152,32 @@ def determine_fetcher_processing_dates(
         f"Pre-checking yesterday's ({yesterday.strftime('%Y-%m-%d')}) data status..."
     )
 
-    if get_s3_parquet_to_df_if_exists is None:  # Guard against missing import.
+    if read_bronze_partition is None:  # Guard against missing import.
         logging.warning(
             "Cannot check yesterday's data completeness: s3_utils not fully available. Assuming yesterday needs processing."
         )
         should_process_yesterday = True
     else:
-        for crop_id, locations in locations_config.items():
-            if should_process_yesterday:
-                break
-            for loc_id in locations.keys():
-                key = generate_partitioned_s3_key(
-                    bronze_prefix,
-                    yesterday.year,
-                    yesterday.month,
-                    yesterday.strftime("%Y-%m-%d"),
-                    crop_id,
-                    loc_id,
-                )
-                df_existing = get_s3_parquet_to_df_if_exists(
-                    s3_client, bucket_name, key
-                )
-                if df_existing is None or len(df_existing) < expected_rows_per_day:
-                    logging.info(
-                        f"Yesterday's data for {crop_id}-{loc_id} is missing or incomplete. Marking yesterday for processing."
-                    )
-                    should_process_yesterday = True
-                    break
+        incomplete = find_incomplete_partitions(
+            s3_client,
+            bucket_name,
+            bronze_prefix,
+            yesterday,
+            [
+                (crop_id, loc_id)
+                for crop_id, locations in locations_config.items()
+                for loc_id in locations.keys()
+            ],
+            expected_rows_per_day=expected_rows_per_day,
+            max_workers=max_workers,
+        )
+        if incomplete:
+            crop_id, loc_id = incomplete[0]
+            logging.info(
+                f"Yesterday's data for {crop_id}-{loc_id} and {len(incomplete) - 1} other partitions is missing "
+                "or incomplete. Marking yesterday for processing."
+            )
+            should_process_yesterday = True
 
     if should_process_yesterday:
         dates_to_process.append(yesterday)
@@ -129,3 +190,196 @@ def determine_fetcher_processing_dates(
         )
 
     return dates_to_process
+
+
+def find_incomplete_partitions(
+    s3_client: Any,  # Boto3 S3 client.
+    bucket_name: str,
+    bronze_prefix: str,
+    day: datetime,
+    partitions: List[tuple[str, str]],
+    expected_rows_per_day: int = 24,
+    max_workers: int = 8,
+) -> List[tuple[str, str]]:
+    """
+    Finds the bronze partitions of a day that are missing or hold fewer rows than expected.
+
+    Partitions that the month's bronze manifest (universal.manifest) records as complete
+    need no further requests. For the others, the month's partition files are listed
+    once. Partitions with a file are probed
+    concurrently by reading only the row count from its Parquet footer; partitions
+    without one are incomplete without further requests. Partitions with delta files or
+    in a closed month, whose rows may also lie in deltas or compacted files, are read in
+    full when their file alone is not complete.
+
+    Args:
+        s3_client: Initialized Boto3 S3 client.
+        bucket_name (str): Name of the bucket holding the bronze layer.
+        bronze_prefix (str): Base S3 prefix of the bronze layer.
+        day (datetime): Day of the partitions.
+        partitions (List[tuple[str, str]]): (crop_id, location_id) pairs to check.
+        expected_rows_per_day (int): Rows of a complete partition.
+        max_workers (int): Maximum number of partitions probed in parallel.
+
+    Returns:
+        List[tuple[str, str]]: The (crop_id, location_id) pairs that are incomplete, in input order.
+    """
+    day_str = day.strftime("%Y-%m-%d")
+    try:
+        manifest = read_manifest(
+            s3_client, bucket_name, bronze_prefix, day.year, day.month
+        )
+        complete_in_manifest = set(
+            manifest.loc[
+                (manifest["date"] == day_str)
+                & (manifest["key"].str.endswith(f"/data_{day_str}.parquet"))
+                & (manifest["num_rows"] >= expected_rows_per_day),
+                ["crop_id", "location_id"],
+            ].itertuples(index=False, name=None)
+        )
+    except Exception as e:
+        logger.warning(
+            f"Could not read the bronze manifest of {day_str[:7]}: {e}. Probing all partitions."
+        )
+        complete_in_manifest = set()
+    remaining = [p for p in partitions if p not in complete_in_manifest]
+    if not remaining:
+        return []
+
+    listed_keys = set()
+    delta_directories = set()
+    request = {
+        "Bucket": bucket_name,
+        "Prefix": f"{bronze_prefix}/year={day.year}/month={day.month:02d}/",
+    }
+    while True:
+        response = s3_client.list_objects_v2(**request)
+        for obj in response.get("Contents", []):
+            directory, filename = obj["Key"].rsplit("/", 1)
+            if filename == f"data_{day_str}.parquet":
+                listed_keys.add(obj["Key"])
+            elif filename.startswith(f"delta_{day_str}_"):
+                delta_directories.add(directory)
+        if not response.get("IsTruncated"):
+            break
+        request["ContinuationToken"] = response["NextContinuationToken"]
+    month_closed = is_closed_month(day.year, day.month)
+
+    def is_complete(partition: tuple[str, str]) -> bool:
+        key = generate_partitioned_s3_key(
+            bronze_prefix, day.year, day.month, day_str, *partition
+        )
+        try:
+            if (
+                key in listed_keys
+                and get_s3_parquet_num_rows(s3_client, bucket_name, key)
+                >= expected_rows_per_day
+            ):
+                return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") not in ("404", "NoSuchKey"):
+                raise
+        except ValueError as e:
+            logger.warning(
+                f"Could not read the row count of s3://{bucket_name}/{key}: {e}"
+            )
+        if key.rsplit("/", 1)[0] not in delta_directories and not month_closed:
+            return False
+        # Deltas or compacted files may hold the missing rows.
+        df_existing = read_bronze_partition(s3_client, bucket_name, key)
+        return df_existing is not None and len(df_existing) >= expected_rows_per_day
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        complete = list(executor.map(is_complete, remaining))
+    return [
+        partition
+        for partition, partition_complete in zip(remaining, complete)
+        if not partition_complete
+    ]
+
+
+def determine_fetcher_date_range(
+    start_date_str: str, end_date_str: str
+) -> List[datetime]:
+    """
+    Determines the list of dates for a data_fetcher backfill between two dates.
+
+    Args:
+        start_date_str (str): First date to process in 'YYYY-MM-DD' format.
+        end_date_str (str): Last date to process in 'YYYY-MM-DD' format (inclusive).
+
+    Returns:
+        List[datetime]: UTC-aware dates from start to end, one per day.
+
+    Raises:
+        ValueError: If a date is not in 'YYYY-MM-DD' format or the start is after the end.
+    """
+    try:
+        start_date = datetime.strptime(start_date_str, "%Y-%m-%d").replace(
+            tzinfo=timezone.utc
+        )
+        end_date = datetime.strptime(end_date_str, "%Y-%m-%d").replace(
+            tzinfo=timezone.utc
+        )
+    except ValueError:
+        logger.error(
+            f"Invalid date range '{start_date_str}'..'{end_date_str}'. Please use YYYY-MM-DD."
+        )
+        raise
+    if start_date > end_date:
+        logger.error(f"Start date {start_date_str} is after end date {end_date_str}.")
+        raise ValueError(
+            f"Start date {start_date_str} is after end date {end_date_str}."
+        )
+
+    num_days = (end_date - start_date).days + 1
+    dates_to_process = [start_date + timedelta(days=i) for i in range(num_days)]
+    logger.info(
+        f"Fetcher will backfill {num_days} dates from {start_date_str} to {end_date_str}."
+    )
+    return dates_to_process
+
+
+def compute_content_hash(
+    df: pd.DataFrame, profile: "ParquetProfile | None" = None
+) -> str:
+    """
+    Computes a deterministic SHA-256 hash of a table's content, independent of row and column order.
+
+    The table is canonicalized first: columns are ordered by name, timezone-aware
+    timestamps are converted to nanosecond UTC, rows are sorted and exact duplicate rows
+    are dropped. Two tables with the same hash hold the same rows, so re-writing one over
+    the other would not change the data.
+
+    With a Parquet profile, the rows are hashed as the profile stores them (e.g. with
+    float32 temperatures), so the hash of rows about to be written equals the hash of the
+    same rows read back from the file.
+
+    Args:
+        df (pd.DataFrame): The table to hash. It is not modified.
+        profile (ParquetProfile | None): Write profile of the file holding the rows, if any.
+
+    Returns:
+        str: Hex digest of the canonical content.
+    """
+    if profile is not None:
+        df = to_profiled_table(df, profile).to_pandas()
+    canonical = df[sorted(df.columns)]
+    for column in canonical.columns:
+        if isinstance(canonical[column].dtype, pd.DatetimeTZDtype):
+            canonical = canonical.assign(
+                **{
+                    column: canonical[column]
+                    .dt.tz_convert("UTC")
+                    .astype("datetime64[ns, UTC]")
+                }
+            )
+    row_hashes = pd.util.hash_pandas_object(canonical, index=False)
+    # Sorting the per-row hashes orders rows canonically; unique() drops duplicate rows.
+    canonical_rows = pd.Series(row_hashes.unique()).sort_values(ignore_index=True)
+
+    digest = hashlib.sha256()
+    for column in canonical.columns:
+        digest.update(f"{column}\x1f".encode("utf-8"))
+    digest.update(canonical_rows.to_numpy(dtype="uint64").tobytes())
+    return digest.hexdigest()
@@ -1,7 +1,11 @@
 import boto3
 import io
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import logging
+import struct
+import threading
 from botocore.exceptions import ClientError
 from botocore.client import Config
 
@@ -19,9 +23,28 @@ except ImportError as e:
 logger = logging.getLogger(__name__)
 
 
-def get_s3_client():
+# Process-wide S3 client, created on first use. Boto3 clients are thread-safe, so one
+# client (and its connection pool) is shared by all threads.
+_s3_client = None
+_s3_client_lock = threading.Lock()
+
+# Bytes read from the end of a Parquet object to get its footer in one request; footers of
+# partition files are a few KB.
+_PARQUET_FOOTER_READ_BYTES = 64 * 1024
+
+
+def _client_config(**kwargs) -> Config:
+    """Returns the botocore config shared by both backends: pool size and adaptive retries."""
+    return Config(
+        max_pool_connections=app_config.S3_MAX_POOL_CONNECTIONS,
+        retries={"mode": "adaptive", "max_attempts": app_config.S3_MAX_ATTEMPTS},
+        **kwargs,
+    )
+
+
+def _create_s3_client():
     """
-    Creates and returns an S3 client configured based on the shared app_config.
+    Creates an S3 client configured based on the shared app_config.
     Supports 'minio' and 's3' backends.
     """
     if app_config.STORAGE_BACKEND == "minio":
@@ -47,12 +70,14 @@ def get_s3_client():
             endpoint_url=app_config.MINIO_ENDPOINT_URL,
             aws_access_key_id=app_config.MINIO_ACCESS_KEY,
             aws_secret_access_key=app_config.MINIO_SECRET_KEY,
-            config=Config(signature_version="s3v4", s3={"addressing_style": "path"}),
+            config=_client_config(
+                signature_version="s3v4", s3={"addressing_style": "path"}
+            ),
             use_ssl=use_ssl,
             verify=verify_ssl,
         )
     elif app_config.STORAGE_BACKEND == "s3":
-        return boto3.client("s3")
+        return boto3.client("s3", config=_client_config())
     else:
         raise ValueError(  # This should be caught by the dependency.
             f"Unsupported STORAGE_BACKEND: '{app_config.STORAGE_BACKEND}' in shared app_config. "
@@ -60,6 +85,32 @@ def get_s3_client():
         )
 
 
+def get_s3_client():
+    """
+    Returns the process-wide S3 client, creating it on first use.
+
+    The client is configured from the shared app_config, with a connection pool of
+    S3_MAX_POOL_CONNECTIONS and adaptive retries, and is safe to share between threads.
+    A configuration error is raised on every call until the client can be created.
+
+    Raises:
+        ValueError: If the storage backend is unsupported or its configuration is incomplete.
+    """
+    global _s3_client
+    if _s3_client is None:
+        with _s3_client_lock:
+            if _s3_client is None:
+                _s3_client = _create_s3_client()
+    return _s3_client
+
+
+def reset_s3_client_cache():
+    """Drops the process-wide S3 client, so the next get_s3_client call creates a new one."""
+    global _s3_client
+    with _s3_client_lock:
+        _s3_client = None
+
+
 def s3_object_exists(s3_client, bucket_name: str, object_key: str) -> bool:
     """
     Checks if an object exists in an S3 bucket.
@@ -117,3 +168,42 @@ def get_s3_parquet_to_df_if_exists(
             )
             return None
     return None
+
+
+def get_s3_parquet_num_rows(s3_client, bucket_name: str, object_key: str) -> int:
+    """
+    Reads the row count of a Parquet object from its footer, without downloading the data.
+
+    The end of the object is read with a ranged GET; a footer larger than that read
+    takes a second ranged GET.
+
+    Args:
+        s3_client: Initialized Boto3 S3 client.
+        bucket_name: Name of the S3 bucket.
+        object_key: Key of the Parquet object.
+
+    Returns:
+        int: Number of rows in the object.
+
+    Raises:
+        ClientError: If the object cannot be read, e.g. because it does not exist.
+        ValueError: If the object is not a Parquet file.
+    """
+    response = s3_client.get_object(
+        Bucket=bucket_name,
+        Key=object_key,
+        Range=f"bytes=-{_PARQUET_FOOTER_READ_BYTES}",
+    )
+    tail = response["Body"].read()
+    # A Parquet file ends with its footer, the footer length (4 bytes, little endian) and 'PAR1'.
+    if len(tail) < 8 or tail[-4:] != b"PAR1":
+        raise ValueError(f"s3://{bucket_name}/{object_key} is not a Parquet file.")
+    footer_length = struct.unpack("<I", tail[-8:-4])[0]
+    if footer_length + 8 > len(tail):
+        response = s3_client.get_object(
+            Bucket=bucket_name, Key=object_key, Range=f"bytes=-{footer_length + 8}"
+        )
+        tail = response["Body"].read()
+    # The reader only needs the footer and the leading magic bytes.
+    footer = b"PAR1" + tail[-(footer_length + 8) :]
+    return pq.read_metadata(pa.BufferReader(footer)).num_rows